@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# this_file: benchmarks/bench_records.py
+"""Measure log records per second with the stock and lean record factories.
+
+Usage::
+
+    python benchmarks/bench_records.py [--records N] [--format FMT]
+
+Each run logs N debug records through the root handler that
+:func:`ezgooey.logging.init` installs (with its :class:`EzFormatter`) and
+discards the output, so the numbers reflect record creation and formatting
+rather than I/O.
+"""
+
+import argparse
+import io
+import logging as std_logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ezgooey.logging as ez_logging  # noqa: E402
+
+
+class NullStream(io.TextIOBase):
+    def write(self, data: str) -> int:
+        return len(data)
+
+
+def run(records: int, fmt: str, lean: bool) -> float:
+    """Return records per second for one configuration."""
+    ez_logging.init(level=std_logging.DEBUG, format=fmt, lean=lean)
+    std_logging.getLogger().handlers[0].setStream(NullStream())
+    log = ez_logging.logger("bench")
+    start = time.perf_counter()
+    for i in range(records):
+        log.debug("record %d of %d", i, records)
+    return records / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--format", default="%(levelname)s%(message)s")
+    args = parser.parse_args()
+    stock = run(args.records, args.format, lean=False)
+    lean = run(args.records, args.format, lean=True)
+    print(f"format: {args.format!r}, {args.records} records")
+    print(f"stock: {stock:12,.0f} records/s")
+    print(f"lean:  {lean:12,.0f} records/s  ({lean / stock:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
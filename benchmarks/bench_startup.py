@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# this_file: benchmarks/bench_startup.py
+"""Measure import and startup time and peak RSS of ezgooey's modules.
+
+Usage::
+
+    python benchmarks/bench_startup.py [--repeat N] [--output results.json]
+        [--baseline old.json [--tolerance 0.25]] [--thresholds limits.json]
+
+Every scenario runs in fresh subprocesses against a copy of the package, in
+two variants:
+
+* ``cold`` — no bytecode cache for ezgooey (``PYTHONDONTWRITEBYTECODE``
+  on a copy without ``__pycache__``), so its modules are compiled on import.
+* ``warm`` — bytecode cached by a priming run.
+
+Scenarios cover a bare interpreter, ``import logging``, importing
+``ezgooey``, ``ezgooey.ez`` and ``ezgooey.logging`` in CLI mode, the
+``@ezgooey`` path in GUI mode with a stub ``gooey`` module (so wxPython is
+never needed), and building and parsing parsers of 10, 1 000 and 10 000
+arguments in both modes.
+
+Per variant the JSON results hold the median and minimum wall time in ms,
+the peak RSS in KiB reported by the child, which of the modules in
+``TRACKED_MODULES`` the child had loaded and, from one extra
+``-X importtime`` run, the cumulative import time in µs of each ezgooey
+module (and of ``gooey`` and ``logging``). With ``--baseline`` (a previous
+``--output`` file; wall times and RSS may grow by ``--tolerance``) or
+``--thresholds`` (limits such as ``startup_thresholds.json``) the script
+exits with status 1 when a metric exceeds its limit.
+
+Threshold files map scenario names to metrics. Besides the measured
+metrics they accept ``warm_ms_over_python`` / ``warm_rss_kib_over_python``
+(the cost on top of the bare interpreter in the same run, which varies
+far less between machines than absolute times), the same
+``*_over_logging`` metrics on top of ``import logging``, and
+``absent_modules``, a list of modules the scenario must not load, such as
+``gooey`` in CLI mode.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STUB_GOOEY = '''\
+import argparse
+
+
+class GooeyParser(argparse.ArgumentParser):
+    def add_argument(self, *args, widget=None, gooey_options=None, **kwargs):
+        return super().add_argument(*args, **kwargs)
+
+
+def Gooey(*args, **kwargs):
+    if args and callable(args[0]):
+        return args[0]
+    return lambda func: func
+'''
+
+PARSER = """\
+from ezgooey.ez import ArgumentParser, ezgooey
+
+@ezgooey(program_name="bench")
+def get_parser():
+    parser = ArgumentParser(prog="bench")
+    for i in range({n}):
+        parser.add_argument(
+            "--arg%d" % i, widget="TextField", gooey_options={{}}, help="arg"
+        )
+    return parser
+
+get_parser().parse_args([])
+"""
+
+GUI_DECORATOR = """\
+from ezgooey.ez import ezgooey
+ezgooey(program_name="bench")(lambda: None)()
+"""
+
+# Modules whose presence after a scenario is recorded; loading one of
+# them where it should stay lazy is a regression however fast the run is.
+TRACKED_MODULES = (
+    "gooey",
+    "wx",
+    "ezgooey.ez",
+    "ezgooey.logging",
+    "ezgooey.cache",
+    "importlib.metadata",
+)
+
+# Scenarios that others are measured against: ``*_over_python`` and
+# ``*_over_logging`` metrics subtract their values from the same run.
+REFERENCES = {"python": "python", "logging": "import logging"}
+
+# Printed by every child after the measured code: the peak RSS
+# (ru_maxrss is KiB on Linux and bytes on macOS), then the loaded tracked
+# modules.
+RSS_REPORT = f"""
+import sys as _sys
+try:
+    import resource
+except ImportError:
+    print(-1)
+else:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(rss // 1024 if _sys.platform == "darwin" else rss)
+print(",".join(m for m in {TRACKED_MODULES!r} if m in _sys.modules) or "-")
+"""
+
+SCENARIOS: List[Tuple[str, str, str]] = [
+    ("python", "cli", "pass"),
+    ("import logging", "cli", "import logging"),
+    ("import ezgooey", "cli", "import ezgooey"),
+    ("import ezgooey.ez", "cli", "import ezgooey.ez"),
+    ("import ezgooey.logging", "cli", "import ezgooey.logging"),
+    ("gui decorator", "gui", GUI_DECORATOR),
+] + [
+    (f"parser {n} args ({mode})", mode, PARSER.format(n=n))
+    for mode in ("cli", "gui")
+    for n in (10, 1000, 10000)
+]
+
+IMPORTTIME_MODULES = ("ezgooey", "ezgooey.ez", "ezgooey.logging", "gooey", "logging")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+\d+\s+\|\s+(\d+)\s+\|\s+(\S+)\s*$")
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Return the cumulative ``-X importtime`` µs of the modules we track."""
+    result = {}
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and match.group(2) in IMPORTTIME_MODULES:
+            result[match.group(2)] = int(match.group(1))
+    return result
+
+
+def prepare(workdir: str) -> Dict[str, str]:
+    """Copy the package and write the gooey stub; return PYTHONPATHs by variant."""
+    paths = {}
+    for variant in ("cold", "warm"):
+        path = os.path.join(workdir, variant)
+        shutil.copytree(
+            os.path.join(ROOT, "ezgooey"),
+            os.path.join(path, "ezgooey"),
+            ignore=shutil.ignore_patterns("__pycache__"),
+        )
+        paths[variant] = path
+    stub = os.path.join(workdir, "stub")
+    os.makedirs(stub)
+    with open(os.path.join(stub, "gooey.py"), "w", encoding="utf-8") as f:
+        f.write(STUB_GOOEY)
+    paths["stub"] = stub
+    return paths
+
+
+def child_env(paths: Dict[str, str], variant: str, mode: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.pop("PYTHONSTARTUP", None)
+    pythonpath = [paths[variant]]
+    if mode == "gui":
+        pythonpath.append(paths["stub"])
+    env["PYTHONPATH"] = os.pathsep.join(pythonpath)
+    env["EZGOOEY_MODE"] = mode
+    if variant == "cold":
+        env["PYTHONDONTWRITEBYTECODE"] = "1"
+    else:
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def run_once(
+    code: str, env: Dict[str, str], importtime: bool = False
+) -> Tuple[float, int, List[str], str]:
+    """Run ``code`` in a child.
+
+    Returns:
+        Wall time in ms, peak RSS in KiB, the loaded tracked modules and
+        the child's stderr.
+    """
+    args = [sys.executable]
+    if importtime:
+        args += ["-X", "importtime"]
+    args += ["-c", code + RSS_REPORT]
+    start = time.perf_counter()
+    result = subprocess.run(
+        args, env=env, cwd=tempfile.gettempdir(), capture_output=True, text=True
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode:
+        raise RuntimeError(f"benchmark child failed:\n{result.stderr}")
+    rss, modules = result.stdout.split()[-2:]
+    loaded = [] if modules == "-" else modules.split(",")
+    return elapsed, int(rss), loaded, result.stderr
+
+
+def measure(
+    code: str, env: Dict[str, str], variant: str, repeat: int
+) -> Dict[str, Any]:
+    if variant == "warm":
+        run_once(code, env)  # populate the bytecode cache
+    walls, rss = [], []
+    loaded: List[str] = []
+    for _ in range(repeat):
+        wall, peak, loaded, _stderr = run_once(code, env)
+        walls.append(wall)
+        rss.append(peak)
+    _wall, _peak, _loaded, stderr = run_once(code, env, importtime=True)
+    return {
+        "median_ms": round(statistics.median(walls), 2),
+        "min_ms": round(min(walls), 2),
+        "rss_kib": max(rss),
+        "modules": loaded,
+        "import_us": parse_importtime(stderr),
+    }
+
+
+def run(repeat: int, only: Optional[str] = None) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="ezgooey-bench-") as workdir:
+        paths = prepare(workdir)
+        for name, mode, code in SCENARIOS:
+            # References always run: the *_over_* metrics need them.
+            if only and only not in name and name not in REFERENCES.values():
+                continue
+            results[name] = {
+                variant: measure(code, child_env(paths, variant, mode), variant, repeat)
+                for variant in ("cold", "warm")
+            }
+            print(f"{name}: {results[name]['warm']['median_ms']} ms", file=sys.stderr)
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def flatten(results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Return ``{scenario: {"warm_ms": …, "cold_rss_kib": …, …}}``.
+
+    ``*_over_python`` and ``*_over_logging`` metrics subtract the value of
+    the bare interpreter and of ``import logging`` (see ``REFERENCES``) and
+    ``modules`` lists the tracked modules loaded in any variant.
+    """
+    flat = {}
+    for name, variants in results.items():
+        metrics: Dict[str, Any] = {}
+        loaded = set()
+        for variant, data in variants.items():
+            metrics[f"{variant}_ms"] = data["median_ms"]
+            metrics[f"{variant}_rss_kib"] = data["rss_kib"]
+            for label, reference in REFERENCES.items():
+                base = results.get(reference, {}).get(variant)
+                if base is None:
+                    continue
+                metrics[f"{variant}_ms_over_{label}"] = round(
+                    data["median_ms"] - base["median_ms"], 2
+                )
+                metrics[f"{variant}_rss_kib_over_{label}"] = (
+                    data["rss_kib"] - base["rss_kib"]
+                )
+            for module, us in data["import_us"].items():
+                metrics[f"{variant}_import_us[{module}]"] = us
+            loaded.update(data.get("modules", ()))
+        metrics["modules"] = sorted(loaded)
+        flat[name] = metrics
+    return flat
+
+
+def check(results: Dict[str, Any], limits: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Return a message for every metric that exceeds its limit."""
+    measured = flatten(results)
+    failures = []
+    for name, metrics in limits.items():
+        if name not in measured:
+            continue
+        for metric, limit in metrics.items():
+            if metric == "absent_modules":
+                for module in limit:
+                    if module in measured[name]["modules"]:
+                        failures.append(f"{name}: loaded {module}")
+                continue
+            value = measured[name].get(metric)
+            if value is not None and value > limit:
+                failures.append(f"{name}: {metric} = {value} > {limit:.2f}")
+    return failures
+
+
+def baseline_limits(path: str, tolerance: float) -> Dict[str, Dict[str, float]]:
+    """Allow ``tolerance`` over a previous run's wall times and peak RSS.
+
+    Per-module import times and the small ``*_over_*`` differences are too
+    noisy to compare relatively without false alarms; limit them with
+    ``--thresholds`` instead. Modules the baseline did not load must stay
+    unloaded.
+    """
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    limits: Dict[str, Dict[str, Any]] = {}
+    for name, metrics in flatten(baseline).items():
+        limits[name] = {
+            metric: value * (1 + tolerance)
+            for metric, value in metrics.items()
+            if metric != "modules"
+            and "_import_us[" not in metric
+            and "_over_" not in metric
+        }
+        limits[name]["absent_modules"] = [
+            m for m in TRACKED_MODULES if m not in metrics["modules"]
+        ]
+    return limits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per variant")
+    parser.add_argument("--only", help="run scenarios whose name contains this")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown against --baseline (default 0.25)",
+    )
+    parser.add_argument("--thresholds", help="JSON file of absolute limits")
+    args = parser.parse_args()
+
+    data = run(args.repeat, args.only)
+    text = json.dumps(data, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    failures = []
+    if args.baseline:
+        limits = baseline_limits(args.baseline, args.tolerance)
+        failures += check(data["results"], limits)
+    if args.thresholds:
+        with open(args.thresholds, encoding="utf-8") as f:
+            failures += check(data["results"], json.load(f))
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
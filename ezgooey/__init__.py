@@ -6,26 +6,50 @@ ezgooey
 Copyright (c) 2020 Adam Twardoch <adam+github@twardoch.com>
 MIT license. Python 3.8+
 
-See `ezgooey.ez` and `ezgooey.logging` for details.
+See `ezgooey.ez`, `ezgooey.logging`, `ezgooey.cache`, `ezgooey.spec`,
+`ezgooey.completion`, `ezgooey.batch` and `ezgooey.daemon` for details.
 """
 
-# Version resolution order:
-#   1. hatch-vcs generated _version.py (present after `hatch build` or `pip install`)
-#   2. root-level version.py git-tag helper
-#   3. VERSION.txt
-#   4. Hard-coded fallback
-try:
-    from ezgooey._version import __version__
-except ImportError:
-    try:
-        import os
-        import sys
+__all__ = [
+    "ez",
+    "logging",
+    "cache",
+    "spec",
+    "completion",
+    "batch",
+    "daemon",
+    "__version__",
+]
+
+
+def __getattr__(name: str) -> str:
+    """Resolve ``__version__`` on first access (PEP 562).
 
-        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        from version import get_version  # type: ignore[import]
+    Resolution order:
+      1. hatch-vcs generated _version.py (present after `hatch build` or `pip install`)
+      2. root-level version.py git-tag helper
+      3. VERSION.txt
+      4. Hard-coded fallback
+
+    Step 2 runs ``git``, so it is deferred until the version is actually
+    needed instead of slowing down every ``import ezgooey.…``.
+    """
+    if name != "__version__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        from ezgooey._version import __version__
+    except ImportError:
+        try:
+            import os
+            import sys
 
-        __version__ = get_version()
-    except Exception:
-        __version__ = "2.7.5"
+            sys.path.insert(
+                0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            )
+            from version import get_version  # type: ignore[import]
 
-__all__ = ["ez", "logging", "__version__"]
+            __version__ = get_version()
+        except Exception:
+            __version__ = "2.7.5"
+    globals()["__version__"] = __version__
+    return __version__
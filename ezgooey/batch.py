@@ -0,0 +1,540 @@
+#!/usr/bin/env python
+# this_file: ezgooey/batch.py
+"""
+ezgooey.batch
+-------------
+
+Copyright (c) 2020 Adam Twardoch <adam+github@twardoch.com>
+MIT license. Python 3.8+
+
+Run an ezgooey app over many argument sets in one process.
+
+Calling a tool thousands of times from a shell loop pays interpreter
+startup, imports and parser construction on every call. A batch builds
+the parser once (per worker process) and calls the app's main function
+for each argument set:
+
+```bash
+ezgooey-batch myapp.cli:main --parser myapp.cli:get_parser jobs.jsonl \\
+    --jobs 8 --executor process --results status.jsonl
+```
+
+```python
+from ezgooey.batch import run_batch, read_items
+
+results = run_batch(main, read_items('jobs.csv'), builder=get_parser, jobs=4)
+```
+
+With a ``builder`` (the ``@ezgooey``-decorated ``get_parser``) every
+item is parsed by the one parser and ``main`` receives the
+:class:`argparse.Namespace`; without one ``main`` receives the item's
+argument list. Each item ends with an exit status: the int ``main``
+returns (``None`` is 0), the code of a ``SystemExit`` it raises
+(argparse usage errors are 2), or 1 for any other exception.
+
+``jobs > 1`` runs items in a :mod:`concurrent.futures` thread or process
+pool. Each item's stdout and stderr are then captured and written as one
+block, in input order (``ordered=True``) or as items finish. Output that
+bypasses ``sys.stdout``/``sys.stderr``, such as logging handlers that
+kept a reference to the original stream, is not captured. Process pools
+need ``main`` and ``builder`` to be importable module-level functions.
+
+Item files (see :func:`read_items`) are JSONL, CSV or argfiles; batches
+run in CLI mode, so Gooey is never started.
+"""
+
+__all__ = ["BatchResult", "read_items", "run_batch", "main"]
+
+import argparse
+import concurrent.futures
+import contextlib
+import csv
+import io
+import json
+import os
+import shlex
+import sys
+import threading
+import time
+import traceback
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+)
+
+EXECUTORS = ("thread", "process")
+FORMATS = ("jsonl", "csv", "args")
+
+# CSV column holding positional arguments (split like a shell would).
+ARGS_COLUMN = "args"
+
+
+class BatchResult:
+    """Outcome of one batch item.
+
+    Attributes:
+        index: Position of the item in the input.
+        argv: The item's argument list.
+        status: Exit status; 0 means success.
+        seconds: Wall time of the item.
+        stdout: Captured standard output (empty when not captured).
+        stderr: Captured standard error, including the traceback of an
+            exception raised by ``main``.
+    """
+
+    __slots__ = ("index", "argv", "status", "seconds", "stdout", "stderr")
+
+    def __init__(
+        self,
+        index: int,
+        argv: List[str],
+        status: int,
+        seconds: float,
+        stdout: str = "",
+        stderr: str = "",
+    ) -> None:
+        self.index = index
+        self.argv = argv
+        self.status = status
+        self.seconds = seconds
+        self.stdout = stdout
+        self.stderr = stderr
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the result as a JSON-compatible dict (without output)."""
+        return {
+            "index": self.index,
+            "argv": self.argv,
+            "status": self.status,
+            "seconds": round(self.seconds, 6),
+        }
+
+    def __repr__(self) -> str:
+        return f"BatchResult(index={self.index}, status={self.status})"
+
+
+def _option(name: str) -> str:
+    return name if name[:1] == "-" else "--" + name.replace("_", "-")
+
+
+def _mapping_argv(row: Dict[str, Any]) -> List[str]:
+    """Turn ``{"count": 3, "verbose": true, "args": "a b"}`` into argv.
+
+    Keys become long options (kept as-is if they start with ``-``);
+    ``true`` gives a bare flag, ``false``/``null``/empty values are
+    skipped, lists repeat the option, and ``args`` holds positionals.
+    """
+    argv: List[str] = []
+    for key, value in row.items():
+        if key == ARGS_COLUMN or value is None or value is False or value == "":
+            continue
+        if value is True:
+            argv.append(_option(key))
+        elif isinstance(value, list):
+            for item in value:
+                argv += [_option(key), str(item)]
+        else:
+            argv += [_option(key), str(value)]
+    positional = row.get(ARGS_COLUMN)
+    if isinstance(positional, str):
+        argv += shlex.split(positional)
+    elif isinstance(positional, list):
+        argv += [str(item) for item in positional]
+    return argv
+
+
+def _jsonl_items(stream: TextIO, name: str) -> Iterator[List[str]]:
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        item = json.loads(line)
+        if isinstance(item, list):
+            yield [str(arg) for arg in item]
+        elif isinstance(item, str):
+            yield shlex.split(item)
+        elif isinstance(item, dict):
+            yield _mapping_argv(item)
+        else:
+            raise ValueError(f"{name}:{number}: expected a list, string or object")
+
+
+def _csv_items(stream: TextIO) -> Iterator[List[str]]:
+    for row in csv.DictReader(stream):
+        yield _mapping_argv({k: v for k, v in row.items() if k is not None})
+
+
+def _argfile_items(stream: TextIO) -> Iterator[List[str]]:
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield shlex.split(line)
+
+
+def read_items(
+    source: Any, format: Optional[str] = None
+) -> Iterator[List[str]]:
+    """Read argument sets from a file, ``"-"`` (stdin) or an open stream.
+
+    Formats:
+
+    * ``jsonl``: one JSON value per line: a list of arguments, a command
+      line string, or an object of option names to values (see below).
+    * ``csv``: a header row of option names, one item per row. Empty
+      cells are skipped.
+    * ``args``: one shell-quoted command line per line; blank lines and
+      ``#`` comments are ignored.
+
+    In objects and CSV rows a name such as ``count`` or ``out_dir``
+    becomes ``--count`` / ``--out-dir`` (names starting with ``-`` are
+    used as they are), ``true`` makes a bare flag, lists repeat the
+    option and the ``args`` column holds positional arguments.
+
+    Args:
+        source: Path, ``"-"`` or a text stream.
+        format: One of :data:`FORMATS`; by default taken from the file
+            extension (``.jsonl``/``.json``, ``.csv``, anything else is an
+            argfile).
+
+    Returns:
+        An iterator of argument lists, read lazily.
+
+    Raises:
+        ValueError: If ``format`` is unknown.
+    """
+    name = getattr(source, "name", source) if not isinstance(source, str) else source
+    if format is None:
+        ext = os.path.splitext(str(name))[1].lower()
+        format = {".jsonl": "jsonl", ".json": "jsonl", ".csv": "csv"}.get(ext, "args")
+    if format not in FORMATS:
+        raise ValueError(f"unknown item format {format!r} (expected one of {FORMATS})")
+    return _read_items(source, format, str(name))
+
+
+def _read_items(source: Any, format: str, name: str) -> Iterator[List[str]]:
+    with contextlib.ExitStack() as stack:
+        if source == "-":
+            stream: TextIO = sys.stdin
+        elif isinstance(source, (str, os.PathLike)):
+            stream = stack.enter_context(open(source, encoding="utf-8", newline=""))
+        else:
+            stream = source
+        if format == "jsonl":
+            yield from _jsonl_items(stream, name)
+        elif format == "csv":
+            yield from _csv_items(stream)
+        else:
+            yield from _argfile_items(stream)
+
+
+def _exit_status(code: Any, stderr: TextIO) -> int:
+    """Map a ``SystemExit`` code to a status the way the interpreter does."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return int(code)  # sys.exit(True) exits with 1, not "True"
+    print(code, file=stderr)
+    return 1
+
+
+class _Runner:
+    """Runs single items against one parser."""
+
+    def __init__(
+        self,
+        main: Callable[[Any], Any],
+        builder: Optional[Callable[[], argparse.ArgumentParser]],
+    ) -> None:
+        self.main = main
+        self.parser = builder() if builder is not None else None
+
+    def run(
+        self, index: int, argv: List[str], stdout: TextIO, stderr: TextIO
+    ) -> BatchResult:
+        start = time.perf_counter()
+        try:
+            if self.parser is not None:
+                status = self.main(self.parser.parse_args(argv))
+            else:
+                status = self.main(argv)
+            status = _exit_status(status, stderr)
+        except SystemExit as e:
+            status = _exit_status(e.code, stderr)
+        except Exception:
+            traceback.print_exc(file=stderr)
+            status = 1
+        return BatchResult(index, argv, status, time.perf_counter() - start)
+
+
+class _ThreadStream(io.TextIOBase):
+    """``sys.stdout``/``sys.stderr`` stand-in routing writes per thread.
+
+    Threads running a batch item write into that item's buffer; all other
+    threads write through to the original stream.
+    """
+
+    def __init__(self, target: TextIO, local: threading.local, attr: str) -> None:
+        self._target = target
+        self._local = local
+        self._attr = attr
+
+    def _stream(self) -> TextIO:
+        return getattr(self._local, self._attr, None) or self._target
+
+    def write(self, s: str) -> int:
+        return self._stream().write(s)
+
+    def flush(self) -> None:
+        self._stream().flush()
+
+    def writable(self) -> bool:
+        return True
+
+    @property
+    def encoding(self) -> str:  # type: ignore[override]
+        return getattr(self._target, "encoding", "utf-8")
+
+
+def _captured(
+    runner: _Runner, index: int, argv: List[str], local: threading.local
+) -> BatchResult:
+    out, err = io.StringIO(), io.StringIO()
+    local.stdout, local.stderr = out, err
+    try:
+        result = runner.run(index, argv, out, err)
+    finally:
+        local.stdout = local.stderr = None
+    result.stdout, result.stderr = out.getvalue(), err.getvalue()
+    return result
+
+
+# Per-process runner of a process pool, created by _init_worker.
+_worker_runner: Optional[_Runner] = None
+
+
+def _worker_target(obj: Any) -> Any:
+    """Return ``obj`` in a form a worker process can unpickle.
+
+    Functions of scripts loaded by ``script.py:function`` targets live in
+    a module that exists only in this process; ``spawn`` and
+    ``forkserver`` workers get their target string and load it again.
+    """
+    from ezgooey.completion import _SCRIPT_MODULE
+
+    if getattr(obj, "__module__", None) == _SCRIPT_MODULE:
+        return f"{sys.modules[_SCRIPT_MODULE].__file__}:{obj.__qualname__}"
+    return obj
+
+
+def _init_worker(main: Any, builder: Any) -> None:
+    global _worker_runner
+    os.environ["EZGOOEY_MODE"] = "cli"
+    if isinstance(main, str) or isinstance(builder, str):
+        from ezgooey.completion import _import_target
+
+        if isinstance(main, str):
+            main = _import_target(main)
+        if isinstance(builder, str):
+            builder = _import_target(builder)
+    _worker_runner = _Runner(main, builder)
+
+
+def _run_in_worker(index: int, argv: List[str]) -> BatchResult:
+    assert _worker_runner is not None
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        result = _worker_runner.run(index, argv, out, err)
+    result.stdout, result.stderr = out.getvalue(), err.getvalue()
+    return result
+
+
+def run_batch(
+    main: Callable[[Any], Any],
+    items: Iterable[Sequence[str]],
+    builder: Optional[Callable[[], argparse.ArgumentParser]] = None,
+    jobs: int = 1,
+    executor: str = "thread",
+    ordered: bool = True,
+    on_result: Optional[Callable[[BatchResult], None]] = None,
+) -> List[BatchResult]:
+    """Run ``main`` once per argument set.
+
+    Args:
+        main: The app's entry point. Called with the parsed namespace when
+            ``builder`` is given, otherwise with the argument list.
+        items: Argument lists, e.g. from :func:`read_items`.
+        builder: Parser builder, called once per process.
+        jobs: Number of items run at the same time; 1 runs them in this
+            thread with output going straight to the console.
+        executor: ``"thread"`` or ``"process"`` pool for ``jobs > 1``.
+        ordered: Write captured output (and call ``on_result``) in input
+            order rather than in completion order.
+        on_result: Called with each :class:`BatchResult` as it is
+            reported, e.g. to stream a status file.
+
+    Returns:
+        The results in input order.
+
+    Raises:
+        ValueError: If ``executor`` is unknown.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"unknown executor {executor!r} (expected one of {EXECUTORS})")
+    results: List[BatchResult] = []
+
+    def report(result: BatchResult) -> None:
+        if result.stdout:
+            sys.stdout.write(result.stdout)
+            sys.stdout.flush()
+        if result.stderr:
+            sys.stderr.write(result.stderr)
+            sys.stderr.flush()
+        if on_result is not None:
+            on_result(result)
+        results.append(result)
+
+    if jobs <= 1:
+        runner = _Runner(main, builder)
+        for index, argv in enumerate(items):
+            report(runner.run(index, list(argv), sys.stdout, sys.stderr))
+        return results
+
+    local = threading.local()
+    stdout, stderr = sys.stdout, sys.stderr
+    pool: concurrent.futures.Executor
+    if executor == "process":
+        pool = concurrent.futures.ProcessPoolExecutor(
+            jobs,
+            initializer=_init_worker,
+            initargs=(_worker_target(main), _worker_target(builder)),
+        )
+    else:
+        runner = _Runner(main, builder)
+        pool = concurrent.futures.ThreadPoolExecutor(jobs)
+        sys.stdout = _ThreadStream(stdout, local, "stdout")  # type: ignore[assignment]
+        sys.stderr = _ThreadStream(stderr, local, "stderr")  # type: ignore[assignment]
+    try:
+        with pool:
+            pending: Dict[int, BatchResult] = {}
+            next_index = 0
+            futures: Set[concurrent.futures.Future[BatchResult]] = set()
+            window = jobs * 2
+            for index, argv in enumerate(items):
+                # Submit at most `window` items ahead of the next result to
+                # report (in ordered mode) or in flight (unordered), so long
+                # inputs are streamed and a slow item holds back a bounded
+                # number of finished results.
+                while futures and (
+                    index - next_index if ordered else len(futures)
+                ) >= window:
+                    done, futures = concurrent.futures.wait(
+                        futures, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    next_index = _drain(done, pending, next_index, ordered, report)
+                if executor == "process":
+                    future = pool.submit(_run_in_worker, index, list(argv))
+                else:
+                    future = pool.submit(_captured, runner, index, list(argv), local)
+                futures.add(future)
+            for future in concurrent.futures.as_completed(futures):
+                next_index = _drain({future}, pending, next_index, ordered, report)
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+    results.sort(key=lambda result: result.index)
+    return results
+
+
+def _drain(
+    done: Iterable["concurrent.futures.Future[BatchResult]"],
+    pending: Dict[int, BatchResult],
+    next_index: int,
+    ordered: bool,
+    report: Callable[[BatchResult], None],
+) -> int:
+    """Report finished results; in ordered mode only up to the first gap."""
+    for future in done:
+        result = future.result()
+        if not ordered:
+            report(result)
+            continue
+        pending[result.index] = result
+    while next_index in pending:
+        report(pending.pop(next_index))
+        next_index += 1
+    return next_index
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Entry point of ``ezgooey-batch`` / ``python -m ezgooey.batch``."""
+    parser = argparse.ArgumentParser(
+        prog="ezgooey-batch",
+        description="Run an ezgooey app once per argument set in one process.",
+    )
+    parser.add_argument(
+        "main", help="app entry point as module:function or script.py:function"
+    )
+    parser.add_argument(
+        "items", help="JSONL, CSV or argfile of argument sets ('-' for stdin)"
+    )
+    parser.add_argument(
+        "--parser",
+        metavar="BUILDER",
+        help="parser builder as module:function; main then gets the namespace",
+    )
+    parser.add_argument(
+        "--format", choices=FORMATS, help="item format (default: by extension)"
+    )
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="items run at once")
+    parser.add_argument("--executor", choices=EXECUTORS, default="thread")
+    parser.add_argument(
+        "--unordered", action="store_true", help="write output as items finish"
+    )
+    parser.add_argument(
+        "--results", help="write per-item status as JSONL to this file"
+    )
+    args = parser.parse_args(argv)
+
+    from ezgooey.completion import _import_target
+
+    try:
+        app_main = _import_target(args.main)
+        builder = _import_target(args.parser) if args.parser else None
+    except (ImportError, AttributeError, ValueError) as e:
+        parser.error(str(e))
+
+    with contextlib.ExitStack() as stack:
+        on_result = None
+        if args.results:
+            status_file = stack.enter_context(
+                open(args.results, "w", encoding="utf-8")
+            )
+
+            def on_result(result: BatchResult) -> None:
+                status_file.write(json.dumps(result.as_dict()) + "\n")
+
+        results = run_batch(
+            app_main,
+            read_items(args.items, args.format),
+            builder=builder,
+            jobs=args.jobs,
+            executor=args.executor,
+            ordered=not args.unordered,
+            on_result=on_result,
+        )
+    failed = sum(1 for result in results if result.status)
+    if failed:
+        total = len(results)
+        print(f"ezgooey-batch: {failed} of {total} items failed", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
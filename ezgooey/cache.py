@@ -0,0 +1,449 @@
+#!/usr/bin/env python
+# this_file: ezgooey/cache.py
+"""
+ezgooey.cache
+-------------
+
+Copyright (c) 2020 Adam Twardoch <adam+github@twardoch.com>
+MIT license. Python 3.8+
+
+On-disk cache of constructed argparse parsers.
+
+Building a parser with thousands of options and many subcommands can take
+longer than the rest of a short CLI run. With ``@ezgooey(cache=True)`` (or
+:func:`cached_parser` directly) the finished parser, including its
+actions, groups and subparsers, is pickled into the user cache directory
+after the first run and loaded on later runs without calling the builder.
+
+```python
+from ezgooey.ez import ArgumentParser, ezgooey
+
+@ezgooey(cache=True)
+def get_parser():
+    parser = ArgumentParser(prog='appname')
+    ...
+    return parser
+```
+
+The cache key is a hash of the builder's code object, the modification
+time of its module file, the ezgooey version and the Python version, so
+editing the builder invalidates the entry. Anything else the builder
+reads (other modules, configuration files, the environment) is *not*
+part of the key; only cache builders whose result depends on their own
+code alone. Types, actions and defaults must be importable by name
+(module-level functions and classes, no lambdas); when the parser cannot
+be pickled it is simply not cached. An entry that fails to load is
+deleted and the builder runs instead.
+
+Rendered ``--help`` and usage text of large parsers is cached here too
+(see :func:`cached_help`): :class:`~ezgooey.ez.FlexArgumentParser` serves
+it from the cache, keyed by a fingerprint of the parser definition and
+the terminal width, instead of reflowing thousands of options on every
+``--help`` or usage error.
+"""
+
+__all__ = [
+    "cached_parser",
+    "cached_help",
+    "cache_dir",
+    "cache_key",
+    "load_parser",
+    "parser_fingerprint",
+    "save_parser",
+]
+
+import argparse
+import functools
+import hashlib
+import io
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from types import CodeType
+from typing import Any, Callable, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Environment variables: ``EZGOOEY_CACHE_DIR`` moves the cache,
+# ``EZGOOEY_NO_CACHE=1`` turns it off without editing the code.
+CACHE_DIR_ENV = "EZGOOEY_CACHE_DIR"
+NO_CACHE_ENV = "EZGOOEY_NO_CACHE"
+
+# ArgumentParser.__init__ registers a local ``identity`` function as the
+# default type converter. It cannot be pickled by reference, so it is
+# written as a persistent ID and replaced by _identity on load. argparse
+# also tests ``default is SUPPRESS``, so that string must come back as the
+# very same object rather than an equal copy.
+_IDENTITY_PID = "argparse.identity"
+_SUPPRESS_PID = "argparse.SUPPRESS"
+
+
+def _identity(string: str) -> str:
+    return string
+
+
+def cache_dir() -> str:
+    """Return the directory parser caches are stored in.
+
+    ``EZGOOEY_CACHE_DIR`` if set, otherwise the platform's user cache
+    directory: ``%LOCALAPPDATA%\\ezgooey\\Cache`` on Windows,
+    ``~/Library/Caches/ezgooey`` on macOS and ``$XDG_CACHE_HOME/ezgooey``
+    (default ``~/.cache/ezgooey``) elsewhere.
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return override
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        return os.path.join(base, "ezgooey", "Cache")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/ezgooey")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "ezgooey")
+
+
+def _ezgooey_version() -> str:
+    """Return the installed ezgooey version without running git.
+
+    Source checkouts have no generated ``_version.py``; there the
+    modification time of this file stands in for the version.
+    """
+    try:
+        from ezgooey._version import __version__  # type: ignore[import]
+    except ImportError:
+        return f"dev-{os.stat(__file__).st_mtime_ns}"
+    return str(__version__)
+
+
+def _hash_code(code: CodeType, digest: Any) -> None:
+    """Feed a code object into ``digest`` in a run-independent way.
+
+    ``marshal.dumps`` is not usable here: its output depends on reference
+    counts and, for sets of strings, on the hash seed.
+    """
+    digest.update(code.co_code)
+    for names in (code.co_names, code.co_varnames, code.co_freevars, code.co_cellvars):
+        digest.update("\0".join(names).encode("utf-8", "surrogateescape") + b"\1")
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _hash_code(const, digest)
+            continue
+        if isinstance(const, frozenset):
+            text = repr(sorted(map(repr, const)))
+        else:
+            text = repr(const)
+        digest.update(text.encode("utf-8", "surrogateescape") + b"\1")
+
+
+def cache_key(builder: Callable[..., Any]) -> str:
+    """Return the hex digest identifying the parser ``builder`` produces.
+
+    Args:
+        builder: The parser-building function.
+
+    Returns:
+        SHA-256 of the builder's qualified name and code object, its module
+        file's modification time, the ezgooey version and the Python
+        version.
+
+    Raises:
+        OSError: If the builder's module file cannot be found.
+    """
+    code = builder.__code__
+    digest = hashlib.sha256()
+    for part in (
+        f"{builder.__module__}.{builder.__qualname__}",
+        str(os.stat(code.co_filename).st_mtime_ns),
+        _ezgooey_version(),
+        sys.version,
+    ):
+        digest.update(part.encode("utf-8", "surrogateescape") + b"\0")
+    _hash_code(code, digest)
+    return digest.hexdigest()
+
+
+def _safe_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "._-" else "_" for c in name)
+
+
+def _cache_prefix(builder: Callable[..., Any]) -> str:
+    return _safe_name(f"{builder.__module__}.{builder.__qualname__}") + "."
+
+
+def _cache_path(builder: Callable[..., Any], key: str) -> str:
+    return os.path.join(cache_dir(), f"{_cache_prefix(builder)}{key[:32]}.pickle")
+
+
+class _Pickler(pickle.Pickler):
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        if obj is argparse.SUPPRESS:
+            return _SUPPRESS_PID
+        if (
+            type(obj) is type(_identity)
+            and obj.__qualname__ == "ArgumentParser.__init__.<locals>.identity"
+        ):
+            return _IDENTITY_PID
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def persistent_load(self, pid: Any) -> Any:
+        if pid == _IDENTITY_PID:
+            return _identity
+        if pid == _SUPPRESS_PID:
+            return argparse.SUPPRESS
+        raise pickle.UnpicklingError(f"unknown persistent id {pid!r}")
+
+
+def _write_atomic(path: str, data: bytes) -> bool:
+    """Write ``data`` to ``path`` via a temporary file; return success."""
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        return False
+    return True
+
+
+def save_parser(parser: argparse.ArgumentParser, path: str) -> bool:
+    """Pickle ``parser`` to ``path`` atomically.
+
+    Args:
+        parser: The finished parser.
+        path: Destination file; its directory is created if needed.
+
+    Returns:
+        ``True`` if the parser was written, ``False`` if it cannot be
+        pickled or the file cannot be written.
+    """
+    buffer = io.BytesIO()
+    try:
+        _Pickler(buffer, pickle.HIGHEST_PROTOCOL).dump(parser)
+    except Exception:
+        return False
+    return _write_atomic(path, buffer.getvalue())
+
+
+def load_parser(path: str) -> argparse.ArgumentParser:
+    """Load a parser written by :func:`save_parser`.
+
+    Only load files you wrote yourself: like any pickle, a cache file can
+    run arbitrary code when loaded.
+
+    Raises:
+        OSError: If the file cannot be read.
+        Exception: Any error raised while unpickling, or :class:`TypeError`
+            if the file does not hold a parser.
+    """
+    with open(path, "rb") as f:
+        parser = _Unpickler(f).load()
+    if not isinstance(parser, argparse.ArgumentParser):
+        raise TypeError(f"{path} does not contain an ArgumentParser")
+    return parser
+
+
+def _is_fingerprint(text: str) -> bool:
+    return len(text) == 32 and all(c in "0123456789abcdef" for c in text)
+
+
+def _remove_stale(directory: str, prefix: str, keep: str) -> None:
+    """Delete entries of ``prefix`` plus a fingerprint, unless they start with ``keep``.
+
+    Called after a save so that edits do not pile up files.
+    """
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return
+    for name in names:
+        # The fingerprint must follow the prefix directly: a nested
+        # builder's entries (``mod.get_parser._locals_.x.``) share it.
+        if (
+            name.startswith(prefix)
+            and not name.startswith(keep)
+            and _is_fingerprint(name[len(prefix) :].partition(".")[0])
+        ):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+def _load_or_build(path: str, build: Callable[[], Any], prefix: str = "") -> Any:
+    """Return the parser cached at ``path``, or call ``build`` and cache it.
+
+    An entry that fails to load is deleted. When ``prefix`` is given, other
+    entries starting with it are removed after a successful save.
+    """
+    if os.path.exists(path):
+        try:
+            return load_parser(path)
+        except Exception:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    parser = build()
+    if isinstance(parser, argparse.ArgumentParser) and save_parser(parser, path):
+        if prefix:
+            _remove_stale(os.path.dirname(path), prefix, os.path.basename(path))
+    return parser
+
+
+def cached_parser(builder: F) -> F:
+    """Cache the parser returned by ``builder`` on disk.
+
+    The decorated function loads the cached parser when a valid entry
+    exists and otherwise calls ``builder`` and stores its result. The
+    builder is always called when it is given arguments, when it returns
+    something other than an :class:`argparse.ArgumentParser`, or when
+    ``EZGOOEY_NO_CACHE=1`` is set. See the module docstring for what the
+    cache key covers.
+
+    Args:
+        builder: Function that builds and returns a parser. It must not
+            have other side effects, since cached runs skip it.
+
+    Returns:
+        The caching wrapper.
+    """
+
+    @functools.wraps(builder)
+    def cached_builder(*args: Any, **kwargs: Any) -> Any:
+        if args or kwargs or os.environ.get(NO_CACHE_ENV) == "1":
+            return builder(*args, **kwargs)
+        try:
+            path = _cache_path(builder, cache_key(builder))
+        except (OSError, AttributeError, ValueError):
+            return builder()
+        return _load_or_build(path, builder, _cache_prefix(builder))
+
+    return cached_builder  # type: ignore[return-value]
+
+
+def _qualified_name(obj: Any) -> str:
+    qualname = getattr(obj, "__qualname__", None)
+    if qualname is None:
+        return repr(obj)
+    return f"{getattr(obj, '__module__', '')}.{qualname}"
+
+
+def _action_parts(action: argparse.Action) -> List[str]:
+    choices = action.choices
+    if isinstance(choices, dict):
+        choices = list(choices)
+    parts = [
+        _qualified_name(type(action)),
+        "\x1f".join(action.option_strings),
+        repr(action.dest),
+        repr(action.nargs),
+        repr(action.const),
+        repr(action.default),
+        _qualified_name(action.type) if action.type is not None else "",
+        repr(choices),
+        repr(action.required),
+        repr(action.help),
+        repr(action.metavar),
+    ]
+    for choice in getattr(action, "_choices_actions", ()):
+        parts += [repr(choice.dest), repr(choice.metavar), repr(choice.help)]
+    return parts
+
+
+def parser_fingerprint(parser: argparse.ArgumentParser) -> str:
+    """Return a hash of everything that shapes ``parser``'s help and usage.
+
+    Covers the parser's own attributes, every action, group and mutually
+    exclusive group, the formatter class and the Python version (argparse
+    output differs between releases). Subparsers are separate parsers
+    with fingerprints of their own; only their names and help lines are
+    part of the parent's. Computing it is a single pass over the actions,
+    much cheaper than formatting them.
+    """
+    index = {id(action): i for i, action in enumerate(parser._actions)}
+    parts = [
+        _qualified_name(type(parser)),
+        _qualified_name(parser.formatter_class),
+        repr(parser.prog),
+        repr(parser.usage),
+        repr(parser.description),
+        repr(parser.epilog),
+        parser.prefix_chars,
+        sys.version,
+    ]
+    for action in parser._actions:
+        parts += _action_parts(action)
+    for group in parser._action_groups:
+        parts += ["G", repr(group.title), repr(group.description)]
+        parts += [str(index.get(id(a), -1)) for a in group._group_actions]
+    for mutex in parser._mutually_exclusive_groups:
+        parts += ["M", repr(mutex.required)]
+        parts += [str(index.get(id(a), -1)) for a in mutex._group_actions]
+    data = "\x1e".join(parts).encode("utf-8", "surrogateescape")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _help_prefix(parser: argparse.ArgumentParser) -> str:
+    """Return the stale-entry prefix of ``parser``'s help cache entries.
+
+    Besides ``prog`` it hashes where the parser comes from: the running
+    program and, for :class:`~ezgooey.ez.FlexArgumentParser`, the function
+    that built it. Different parsers that share a ``prog`` (often just
+    ``sys.argv[0]``) then keep separate entries instead of evicting each
+    other, while an edited parser still replaces its own.
+    """
+    main = sys.modules.get("__main__")
+    origin = "\0".join(
+        (
+            str(getattr(main, "__file__", None) or sys.argv[0]),
+            getattr(parser, "_created_by", ""),
+            _qualified_name(type(parser)),
+            str(parser.prog),
+        )
+    )
+    digest = hashlib.sha256(origin.encode("utf-8", "surrogateescape")).hexdigest()
+    return f"{_safe_name(str(parser.prog))}.{digest[:8]}."
+
+
+def cached_help(
+    parser: argparse.ArgumentParser, kind: str, render: Callable[[], str]
+) -> str:
+    """Return ``parser``'s rendered help or usage, rendering it at most once.
+
+    The text is stored in the ``help`` subdirectory of :func:`cache_dir`
+    per parser fingerprint (see :func:`parser_fingerprint`) and terminal
+    width, so a changed parser or a resized terminal renders afresh. A new
+    entry replaces older ones of the same parser (same ``prog``, program
+    and building function).
+    ``EZGOOEY_NO_CACHE=1`` turns the cache off.
+
+    Args:
+        parser: The parser whose text is requested.
+        kind: ``"help"`` or ``"usage"``.
+        render: Renders the text, e.g. the stock ``format_help``.
+
+    Returns:
+        The help or usage text.
+    """
+    if os.environ.get(NO_CACHE_ENV) == "1":
+        return render()
+    width = shutil.get_terminal_size().columns
+    directory = os.path.join(cache_dir(), "help")
+    prefix = _help_prefix(parser)
+    keep = f"{prefix}{parser_fingerprint(parser)[:32]}."
+    path = os.path.join(directory, f"{keep}{width}.{kind}.txt")
+    try:
+        with open(path, encoding="utf-8", errors="surrogateescape") as f:
+            return f.read()
+    except OSError:
+        pass
+    text = render()
+    if _write_atomic(path, text.encode("utf-8", "surrogateescape")):
+        _remove_stale(directory, prefix, keep)
+    return text
@@ -0,0 +1,482 @@
+#!/usr/bin/env python
+# this_file: ezgooey/completion.py
+"""
+ezgooey.completion
+------------------
+
+Copyright (c) 2020 Adam Twardoch <adam+github@twardoch.com>
+MIT license. Python 3.8+
+
+Static shell completion scripts for ezgooey apps.
+
+Completion hooks in the style of argcomplete run the app on every Tab
+press, which for an ezgooey app means importing it (and possibly Gooey
+and wxPython) each time. This module instead walks the parser once and
+writes a bash, zsh or fish script that completes options, subcommands,
+``choices`` and files or directories without running any Python:
+
+```bash
+ezgooey-completion myapp.cli:get_parser --prog myapp --shell bash \\
+    > ~/.local/share/bash-completion/completions/myapp
+ezgooey-completion myapp.cli:get_parser --prog myapp --shell zsh > ~/.zfunc/_myapp
+ezgooey-completion myapp.cli:get_parser --prog myapp --shell fish \\
+    > ~/.config/fish/completions/myapp.fish
+```
+
+(or ``python -m ezgooey.completion …``). The target is
+``module:function`` or ``path/to/script.py:function``; the function is
+the ``@ezgooey``-decorated parser builder, imported and called once in
+CLI mode. File hints come from ``widget='FileChooser'``,
+``'MultiFileChooser'`` and ``'FileSaver'`` or an
+:class:`argparse.FileType` ``type``; ``widget='DirChooser'`` and
+``'MultiDirChooser'`` complete directories. Regenerate the script when
+the parser changes.
+"""
+
+__all__ = ["completion_script", "resolve_parser", "main", "SHELLS"]
+
+import argparse
+import importlib
+import importlib.util
+import os
+import re
+import shlex
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+SHELLS = ("bash", "zsh", "fish")
+
+FILE_WIDGETS = frozenset(("FileChooser", "MultiFileChooser", "FileSaver"))
+DIR_WIDGETS = frozenset(("DirChooser", "MultiDirChooser"))
+
+# Value hints of options and positionals.
+FILE = "file"
+DIR = "dir"
+
+
+class _Option:
+    __slots__ = ("strings", "takes_value", "choices", "hint", "help")
+
+    def __init__(
+        self,
+        strings: List[str],
+        takes_value: bool,
+        choices: List[str],
+        hint: Optional[str],
+        help: str,
+    ) -> None:
+        self.strings = strings
+        self.takes_value = takes_value
+        self.choices = choices
+        self.hint = hint
+        self.help = help
+
+
+class _Node:
+    """One parser of the tree: the root or a subcommand."""
+
+    __slots__ = ("id", "options", "words", "hints", "commands")
+
+    def __init__(self, node_id: int) -> None:
+        self.id = node_id
+        self.options: List[_Option] = []
+        # Positional candidates: choices, and file or directory hints.
+        self.words: List[str] = []
+        self.hints: List[str] = []
+        # Subcommand name (aliases included) -> (node, help).
+        self.commands: Dict[str, Any] = {}
+
+
+def _hint(action: argparse.Action) -> Optional[str]:
+    widget = getattr(action, "widget", None)
+    if widget in DIR_WIDGETS:
+        return DIR
+    if widget in FILE_WIDGETS or isinstance(action.type, argparse.FileType):
+        return FILE
+    return None
+
+
+def _help_text(action: argparse.Action, prog: str) -> str:
+    text = action.help or ""
+    if "%" in text:
+        try:
+            text = text % dict(vars(action), prog=prog)
+        except (KeyError, TypeError, ValueError):
+            pass
+    return " ".join(text.split())
+
+
+def _walk(parser: argparse.ArgumentParser, nodes: List[_Node]) -> _Node:
+    """Add ``parser`` and its subparsers to ``nodes``; return its node."""
+    node = _Node(len(nodes))
+    nodes.append(node)
+    for action in parser._actions:
+        if action.help == argparse.SUPPRESS:
+            continue
+        if isinstance(action, argparse._SubParsersAction):
+            # Help lines are recorded under the primary name only; aliases
+            # map to the same parser and share its help.
+            helps = {
+                id(action.choices[a.dest]): _help_text(a, parser.prog)
+                for a in action._choices_actions
+                if a.dest in action.choices
+            }
+            seen: Dict[int, _Node] = {}
+            for name, subparser in action.choices.items():
+                key = id(subparser)
+                if key not in seen:
+                    seen[key] = _walk(subparser, nodes)
+                node.commands[name] = (seen[key], helps.get(key, ""))
+            continue
+        choices = [str(c) for c in action.choices or ()]
+        if action.option_strings:
+            node.options.append(
+                _Option(
+                    list(action.option_strings),
+                    action.nargs != 0,
+                    choices,
+                    _hint(action),
+                    _help_text(action, parser.prog),
+                )
+            )
+        else:
+            node.words += choices
+            hint = _hint(action)
+            if hint and hint not in node.hints:
+                node.hints.append(hint)
+    return node
+
+
+def _function_name(prog: str) -> str:
+    return "_ezgooey_" + re.sub(r"\W", "_", prog)
+
+
+def _q(word: str) -> str:
+    return shlex.quote(word)
+
+
+def _words(words: Sequence[str]) -> str:
+    return _q(" ".join(words))
+
+
+def _option_pattern(chars: str) -> str:
+    # A leading "-" is literal inside a bracket expression.
+    return "[" + "".join(sorted(set(chars), key=lambda c: c != "-")) + "]*"
+
+
+def _case_labels(node: _Node, words: Sequence[str]) -> str:
+    return "|".join(f"{node.id}:{_q(w)}" for w in words)
+
+
+def _bash(nodes: List[_Node], prog: str, prefix_chars: str) -> str:
+    func = _function_name(prog)
+    lines = [
+        f"# bash completion for {prog}, generated by ezgooey.completion",
+        f"{func}() {{",
+        "    local cur prev word node=0 i",
+        '    cur="${COMP_WORDS[COMP_CWORD]}"',
+        '    prev="${COMP_WORDS[COMP_CWORD-1]}"',
+        "    for ((i = 1; i < COMP_CWORD; i++)); do",
+        '        word="${COMP_WORDS[i]}"',
+        '        case "$node:$word" in',
+    ]
+    for node in nodes:
+        for sub in {id(s): s for s, _help in node.commands.values()}.values():
+            names = [n for n, (s, _h) in node.commands.items() if s is sub]
+            lines.append(f"            {_case_labels(node, names)}) node={sub.id} ;;")
+        valued = [s for o in node.options if o.takes_value for s in o.strings]
+        if valued:
+            lines.append(f"            {_case_labels(node, valued)}) ((i++)) ;;")
+    lines += ["        esac", "    done", '    case "$node:$prev" in']
+    for node in nodes:
+        for option in node.options:
+            if not option.takes_value:
+                continue
+            if option.choices:
+                action = f'COMPREPLY=($(compgen -W {_words(option.choices)} -- "$cur"))'
+            elif option.hint == DIR:
+                action = 'COMPREPLY=($(compgen -d -- "$cur"))'
+            elif option.hint == FILE:
+                action = 'COMPREPLY=($(compgen -f -- "$cur"))'
+            else:
+                action = "COMPREPLY=()"
+            lines.append(
+                f"        {_case_labels(node, option.strings)}) {action}; return ;;"
+            )
+    lines += [
+        "    esac",
+        f"    if [[ $cur == {_option_pattern(prefix_chars)} ]]; then",
+        '        case "$node" in',
+    ]
+    for node in nodes:
+        strings = [s for o in node.options for s in o.strings]
+        if strings:
+            lines.append(
+                f'            {node.id}) COMPREPLY=($(compgen -W {_words(strings)}'
+                ' -- "$cur")) ;;'
+            )
+    lines += ["        esac", "        return", "    fi", '    case "$node" in']
+    for node in nodes:
+        words = list(node.commands) + node.words
+        parts = []
+        if words:
+            parts.append(f'COMPREPLY=($(compgen -W {_words(words)} -- "$cur"))')
+        if DIR in node.hints:
+            parts.append('COMPREPLY+=($(compgen -d -- "$cur"))')
+        if FILE in node.hints:
+            parts.append('COMPREPLY+=($(compgen -f -- "$cur"))')
+        if parts:
+            lines.append(f"        {node.id}) {'; '.join(parts)} ;;")
+    lines += ["    esac", "}", f"complete -o default -F {func} {_q(prog)}", ""]
+    return "\n".join(lines)
+
+
+def _zsh_describe(name: str, help: str) -> str:
+    name = name.replace(":", "\\:")
+    return _q(f"{name}:{help}" if help else name)
+
+
+def _zsh(nodes: List[_Node], prog: str, prefix_chars: str) -> str:
+    func = _function_name(prog)
+    lines = [
+        f"#compdef {prog}",
+        f"# zsh completion for {prog}, generated by ezgooey.completion",
+        "",
+        f"{func}() {{",
+        "    local node=0 i word",
+        "    local cur=${words[CURRENT]} prev=${words[CURRENT-1]}",
+        "    local -a opts cmds",
+        "    for (( i = 2; i < CURRENT; i++ )); do",
+        "        word=${words[i]}",
+        '        case "$node:$word" in',
+    ]
+    for node in nodes:
+        for sub in {id(s): s for s, _help in node.commands.values()}.values():
+            names = [n for n, (s, _h) in node.commands.items() if s is sub]
+            lines.append(f"            {_case_labels(node, names)}) node={sub.id} ;;")
+        valued = [s for o in node.options if o.takes_value for s in o.strings]
+        if valued:
+            lines.append(f"            {_case_labels(node, valued)}) (( i++ )) ;;")
+    lines += ["        esac", "    done", '    case "$node:$prev" in']
+    for node in nodes:
+        for option in node.options:
+            if not option.takes_value:
+                continue
+            if option.choices:
+                action = "compadd -- " + " ".join(_q(c) for c in option.choices)
+            elif option.hint == DIR:
+                action = "_files -/"
+            elif option.hint == FILE:
+                action = "_files"
+            else:
+                action = "_message value"
+            lines.append(
+                f"        {_case_labels(node, option.strings)}) {action}; return ;;"
+            )
+    lines += [
+        "    esac",
+        f"    if [[ $cur == {_option_pattern(prefix_chars)} ]]; then",
+        '        case "$node" in',
+    ]
+    for node in nodes:
+        specs = [_zsh_describe(s, o.help) for o in node.options for s in o.strings]
+        if specs:
+            lines.append(f"            {node.id}) opts=({' '.join(specs)}) ;;")
+    lines += [
+        "        esac",
+        "        _describe -t options option opts",
+        "        return",
+        "    fi",
+        '    case "$node" in',
+    ]
+    for node in nodes:
+        parts = []
+        if node.commands:
+            specs = [_zsh_describe(n, h) for n, (_s, h) in node.commands.items()]
+            parts.append(f"cmds=({' '.join(specs)})")
+            parts.append("_describe -t commands command cmds")
+        if node.words:
+            parts.append("compadd -- " + " ".join(_q(w) for w in node.words))
+        if DIR in node.hints:
+            parts.append("_files -/")
+        if FILE in node.hints:
+            parts.append("_files")
+        if parts:
+            lines.append(f"        {node.id}) {'; '.join(parts)} ;;")
+    lines += ["    esac", "}", "", f"compdef {func} {_q(prog)}", ""]
+    return "\n".join(lines)
+
+
+def _fish(nodes: List[_Node], prog: str, prefix_chars: str) -> str:
+    func = _function_name(prog)
+    cmd = _q(prog)
+    lines = [
+        f"# fish completion for {prog}, generated by ezgooey.completion",
+        "",
+        f"function {func}_node",
+        "    set -l node 0",
+        "    set -l skip 0",
+        "    for word in (commandline -opc)[2..-1]",
+        "        if test $skip = 1",
+        "            set skip 0",
+        "            continue",
+        "        end",
+        '        switch "$node:$word"',
+    ]
+    for node in nodes:
+        for sub in {id(s): s for s, _help in node.commands.values()}.values():
+            names = [n for n, (s, _h) in node.commands.items() if s is sub]
+            labels = " ".join(_q(f"{node.id}:{n}") for n in names)
+            lines.append(f"            case {labels}")
+            lines.append(f"                set node {sub.id}")
+        valued = [s for o in node.options if o.takes_value for s in o.strings]
+        if valued:
+            labels = " ".join(_q(f"{node.id}:{s}") for s in valued)
+            lines += [f"            case {labels}", "                set skip 1"]
+    lines += ["        end", "    end", '    test "$node" = "$argv[1]"', "end", ""]
+    lines.append(f"complete -c {cmd} -f")
+    for node in nodes:
+        condition = f"-n {_q(f'{func}_node {node.id}')}"
+        for option in node.options:
+            flags = []
+            for string in option.strings:
+                if len(string) == 2 and string[0] in prefix_chars:
+                    flags.append(f"-s {_q(string[1])}")
+                elif string[:2] == "--":
+                    flags.append(f"-l {_q(string[2:])}")
+                else:
+                    flags.append(f"-o {_q(string[1:])}")
+            if option.takes_value and option.choices:
+                flags.append(f"-xa {_words(option.choices)}")
+            elif option.takes_value and option.hint == DIR:
+                flags.append("-xa '(__fish_complete_directories (commandline -ct))'")
+            elif option.takes_value and option.hint == FILE:
+                flags.append("-rF")
+            elif option.takes_value:
+                flags.append("-x")
+            if option.help:
+                flags.append(f"-d {_q(option.help)}")
+            lines.append(f"complete -c {cmd} {condition} {' '.join(flags)}")
+        for name, (_sub, help) in node.commands.items():
+            desc = f" -d {_q(help)}" if help else ""
+            lines.append(f"complete -c {cmd} {condition} -a {_q(name)}{desc}")
+        if node.words:
+            lines.append(f"complete -c {cmd} {condition} -a {_words(node.words)}")
+        if DIR in node.hints:
+            lines.append(
+                f"complete -c {cmd} {condition}"
+                " -a '(__fish_complete_directories (commandline -ct))'"
+            )
+        if FILE in node.hints:
+            lines.append(f"complete -c {cmd} {condition} -F")
+    lines.append("")
+    return "\n".join(lines)
+
+
+_GENERATORS = {"bash": _bash, "zsh": _zsh, "fish": _fish}
+
+
+def completion_script(
+    parser: argparse.ArgumentParser, shell: str = "bash", prog: Optional[str] = None
+) -> str:
+    """Return a static completion script for ``parser``.
+
+    Args:
+        parser: The app's parser, including its subparsers.
+        shell: ``"bash"``, ``"zsh"`` or ``"fish"``.
+        prog: Command name to complete (default ``parser.prog``).
+
+    Returns:
+        The script text.
+
+    Raises:
+        ValueError: If ``shell`` is not supported.
+    """
+    if shell not in _GENERATORS:
+        raise ValueError(f"unknown shell {shell!r} (expected one of {SHELLS})")
+    nodes: List[_Node] = []
+    _walk(parser, nodes)
+    return _GENERATORS[shell](nodes, prog or parser.prog, parser.prefix_chars)
+
+
+# Module name of scripts loaded by _import_target. Other processes cannot
+# import it, so their functions are passed around by target string.
+_SCRIPT_MODULE = "_ezgooey_app"
+
+
+def _import_target(target: str) -> Any:
+    """Return the object named by ``module:attr`` or ``script.py:attr``.
+
+    ``EZGOOEY_MODE`` is set to ``cli`` first, so ``@ezgooey`` is a
+    pass-through and Gooey is not imported. A script is loaded under a
+    name other than ``__main__``, so its ``if __name__ == '__main__':``
+    block does not run.
+
+    Raises:
+        ValueError: If ``target`` has no ``:``.
+    """
+    module_name, sep, attr = target.rpartition(":")
+    if not sep or not module_name or not attr:
+        raise ValueError(f"expected 'module:function', got {target!r}")
+    os.environ["EZGOOEY_MODE"] = "cli"
+    if module_name.endswith(".py") or os.sep in module_name:
+        path = os.path.abspath(module_name)
+        sys.path.insert(0, os.path.dirname(path))
+        spec = importlib.util.spec_from_file_location(_SCRIPT_MODULE, path)
+        if spec is None or spec.loader is None:
+            raise ValueError(f"cannot load {module_name!r}")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    else:
+        sys.path.insert(0, os.getcwd())
+        module = importlib.import_module(module_name)
+    obj: Any = module
+    for part in attr.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def resolve_parser(target: str) -> argparse.ArgumentParser:
+    """Import ``module:function`` or ``script.py:function`` and build the parser.
+
+    The function is called in CLI mode (see :func:`_import_target`);
+    ``function`` may also name a parser object.
+
+    Raises:
+        ValueError: If ``target`` has no ``:`` or does not produce a parser.
+    """
+    obj = _import_target(target)
+    parser = obj() if callable(obj) else obj
+    if not isinstance(parser, argparse.ArgumentParser):
+        raise ValueError(f"{target} returned {type(parser).__name__}, not a parser")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Entry point of ``ezgooey-completion`` / ``python -m ezgooey.completion``."""
+    parser = argparse.ArgumentParser(
+        prog="ezgooey-completion",
+        description="Write a static shell completion script for an ezgooey app.",
+    )
+    parser.add_argument(
+        "target", help="parser builder as module:function or script.py:function"
+    )
+    parser.add_argument("--shell", choices=SHELLS, default="bash")
+    parser.add_argument("--prog", help="command name to complete (default: its prog)")
+    parser.add_argument("-o", "--output", help="write to this file instead of stdout")
+    args = parser.parse_args(argv)
+    try:
+        app_parser = resolve_parser(args.target)
+    except (ImportError, AttributeError, ValueError) as e:
+        parser.error(str(e))
+    script = completion_script(app_parser, args.shell, args.prog)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(script)
+    else:
+        sys.stdout.write(script)
+
+
+if __name__ == "__main__":
+    main()
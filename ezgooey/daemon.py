@@ -0,0 +1,646 @@
+#!/usr/bin/env python
+# this_file: ezgooey/daemon.py
+"""
+ezgooey.daemon
+--------------
+
+Copyright (c) 2020 Adam Twardoch <adam+github@twardoch.com>
+MIT license. Python 3.8+, POSIX only.
+
+Warm server mode, in the style of nailgun or emacsclient.
+
+A short CLI run of an ezgooey app spends most of its time starting
+Python and importing the app. With this opt-in mode a resident server
+keeps the app imported and its parser built, and a small client forwards
+each invocation to it over a Unix domain socket:
+
+```bash
+ezgooey-daemon run myapp.cli:main --parser myapp.cli:get_parser -- in.txt -v
+```
+
+The first ``run`` starts the server in the background; later runs
+connect to it. The client sends its argv, working directory and
+environment and passes its stdin, stdout and stderr file descriptors
+over the socket, so the app reads and writes the caller's terminal or
+pipes directly. The client then waits for the exit status and exits
+with it, and forwards ``SIGINT``, ``SIGTERM`` and ``SIGHUP`` to the
+process handling its request.
+
+Every request runs in a child forked from the server, so state the app
+changes (globals, ``sys.argv``, the environment, open files) never leaks
+into the next request. ``main`` and ``--parser`` are the same as for
+:mod:`ezgooey.batch`: with a parser builder, ``main`` gets the parsed
+namespace, otherwise the argument list.
+
+The server exits after ``--idle-timeout`` seconds without requests
+(default 600; 0 keeps it running) or on ``ezgooey-daemon stop``. It also
+watches the source files of the app's top-level package and re-executes
+itself, keeping the listening socket open, when one of them changes;
+``--no-reload`` turns that off.
+
+The socket lives in ``$XDG_RUNTIME_DIR/ezgooey`` (or a private
+``ezgooey-<uid>`` directory in the temp dir), which only the user can
+access; ``--socket`` picks another path. A server started by ``run``
+writes its output, such as the traceback of an app that fails to import,
+to a ``.log`` file next to the socket.
+"""
+
+__all__ = ["run_client", "serve", "socket_path_for", "log_path_for", "stop", "main"]
+
+import array
+import binascii
+import json
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+DEFAULT_IDLE_TIMEOUT = 600.0
+
+# Seconds between source checks and idle-timeout checks of the server.
+POLL_INTERVAL = 1.0
+
+# Seconds a starting client waits for a new server's socket.
+START_TIMEOUT = 10.0
+
+# Listening socket and pending connection handed over when the server
+# re-executes itself after a source change.
+_FD_ENV = "EZGOOEY_DAEMON_FD"
+_PENDING_ENV = "EZGOOEY_DAEMON_PENDING"
+
+_FORWARDED_SIGNALS = (signal.SIGINT, signal.SIGTERM, signal.SIGHUP)
+
+
+def _check_platform() -> None:
+    if not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"):
+        raise OSError("ezgooey.daemon needs a POSIX system (fork and Unix sockets)")
+
+
+def _runtime_dir() -> str:
+    """Return (creating it) a directory only the current user can enter."""
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base and os.path.isdir(base):
+        path = os.path.join(base, "ezgooey")
+    else:
+        tmp = os.environ.get("TMPDIR") or "/tmp"
+        path = os.path.join(tmp, f"ezgooey-{os.getuid()}")
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.stat(path)
+    if info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{path} must be owned by you and private (mode 700)")
+    return path
+
+
+def _absolute_target(target: str) -> str:
+    """Return ``target`` with a ``script.py`` part made absolute.
+
+    Same-named scripts in different directories are different apps, so
+    they must not share a socket.
+    """
+    module_name, sep, attr = target.rpartition(":")
+    if sep and (module_name.endswith(".py") or os.sep in module_name):
+        return f"{os.path.abspath(module_name)}:{attr}"
+    return target
+
+
+def socket_path_for(main: str, parser: Optional[str] = None) -> str:
+    """Return the default socket path of the server for these targets."""
+    main = _absolute_target(main)
+    parser = _absolute_target(parser) if parser else None
+    name = main.rpartition(":")[0].rpartition("/")[2] or "app"
+    name = "".join(c if c.isalnum() or c in "._-" else "_" for c in name)[:40]
+    crc = binascii.crc32(f"{main}\0{parser or ''}".encode())
+    return os.path.join(_runtime_dir(), f"{name}-{crc:08x}.sock")
+
+
+def _send_fds(sock: socket.socket, fds: Sequence[int]) -> None:
+    sock.sendmsg(
+        [b"F"], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds))]
+    )
+
+
+def _recv_fds(sock: socket.socket, count: int) -> List[int]:
+    size = socket.CMSG_LEN(count * array.array("i").itemsize)
+    _data, ancdata, _flags, _addr = sock.recvmsg(1, size)
+    fds = array.array("i")
+    for level, kind, data in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(data[: len(data) - (len(data) % fds.itemsize)])
+    return list(fds)
+
+
+def _read_line(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """Read one JSON line, byte by byte so nothing after it is consumed."""
+    data = bytearray()
+    while not data.endswith(b"\n"):
+        chunk = sock.recv(1)
+        if not chunk:
+            return None
+        data += chunk
+    return json.loads(data.decode("utf-8"))  # type: ignore[no-any-return]
+
+
+def _write_line(sock: socket.socket, message: Dict[str, Any]) -> None:
+    sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+# ---------------------------------------------------------------- server
+
+
+def _watch_roots(targets: Sequence[Any]) -> List[str]:
+    """Return the package directories or module files of the targets."""
+    roots = []
+    for obj in targets:
+        module = sys.modules.get(getattr(obj, "__module__", "") or "")
+        if module is None:
+            continue
+        top = sys.modules.get(module.__name__.partition(".")[0], module)
+        path = getattr(top, "__path__", None)
+        if path:
+            roots.extend(os.path.abspath(p) for p in path)
+        elif getattr(top, "__file__", None):
+            roots.append(os.path.abspath(top.__file__))  # type: ignore[arg-type]
+    return roots
+
+
+def _source_snapshot(roots: Sequence[str]) -> Dict[str, int]:
+    """Return the mtimes of loaded modules under ``roots``."""
+    snapshot = {}
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if not path:
+            continue
+        path = os.path.abspath(path)
+        if any(path == root or path.startswith(root + os.sep) for root in roots):
+            try:
+                snapshot[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                pass
+    return snapshot
+
+
+def _changed(snapshot: Dict[str, int]) -> bool:
+    for path, mtime in snapshot.items():
+        try:
+            if os.stat(path).st_mtime_ns != mtime:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+def _bind(path: str) -> Optional[socket.socket]:
+    """Listen on ``path``; return ``None`` if another server already does."""
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        listener.bind(path)
+    except OSError:
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)  # stale socket of a server that died
+            listener.bind(path)
+        else:
+            listener.close()
+            return None
+        finally:
+            probe.close()
+    os.chmod(path, 0o600)
+    listener.listen(64)
+    return listener
+
+
+def _reopen_stdio() -> None:
+    """Rebuild ``sys.std*`` over fds 0-2 with the caller's buffering."""
+    for fd, name, mode in ((0, "stdin", "r"), (1, "stdout", "w"), (2, "stderr", "w")):
+        interactive = os.isatty(fd)
+        stream = open(  # noqa: SIM115
+            fd,
+            mode,
+            buffering=1 if interactive and mode == "w" else -1,
+            errors="backslashreplace" if fd == 2 else None,
+            closefd=False,
+        )
+        setattr(sys, name, stream)
+
+
+def _handle(
+    conn: socket.socket, header: Dict[str, Any], fds: List[int], runner: Any
+) -> int:
+    """Run one request in the forked child; return its exit status."""
+    for sig in _FORWARDED_SIGNALS:
+        signal.signal(sig, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    _write_line(conn, {"pid": os.getpid()})
+    for old in (sys.stdout, sys.stderr):
+        try:
+            old.flush()
+        except (OSError, ValueError):
+            pass
+    for target, fd in zip((0, 1, 2), fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    _reopen_stdio()
+    os.chdir(header.get("cwd") or "/")
+    os.environ.clear()
+    os.environ.update(header.get("env") or {})
+    argv = [str(arg) for arg in header.get("argv") or []]
+    sys.argv = [str(header.get("prog") or sys.argv[0])] + argv
+    try:
+        status = runner.run(0, argv, sys.stdout, sys.stderr).status
+    except KeyboardInterrupt:
+        status = 130
+    return int(status)
+
+
+def _finish_child() -> None:
+    """Do the interpreter's exit work that ``os._exit`` would skip.
+
+    Runs ``atexit`` handlers (timing reports, async log listeners,
+    buffered streams), shuts logging down so file sinks are flushed and
+    closed, and flushes stdout and stderr, as a direct run would at exit.
+    """
+    import atexit
+    import logging
+
+    atexit._run_exitfuncs()
+    logging.shutdown()
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except (OSError, ValueError):
+            pass
+
+
+def _serve_connection(
+    conn: socket.socket, runner: Any, children: Dict[int, socket.socket]
+) -> bool:
+    """Read a request and fork a child for it; return ``False`` on stop."""
+    conn.settimeout(5.0)
+    try:
+        fds = _recv_fds(conn, 3)
+        header = _read_line(conn) or {}
+    except (OSError, ValueError):
+        conn.close()
+        return True
+    command = header.get("command", "run")
+    if command != "run" or len(fds) != 3:
+        for fd in fds:
+            os.close(fd)
+        if command == "ping":
+            _write_line(conn, {"pid": os.getpid()})
+        conn.close()
+        return command != "stop"
+    conn.settimeout(None)
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            status = _handle(conn, header, fds, runner)
+            _finish_child()
+            _write_line(conn, {"status": status})
+        finally:
+            os._exit(status & 0xFF)
+    for fd in fds:
+        os.close(fd)
+    children[pid] = conn
+    return True
+
+
+def _reap(children: Dict[int, socket.socket]) -> None:
+    while children:
+        try:
+            pid, _status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            children.clear()
+            return
+        if pid == 0:
+            return
+        conn = children.pop(pid, None)
+        if conn is not None:
+            conn.close()
+
+
+def serve(
+    main: str,
+    parser: Optional[str] = None,
+    socket_path: Optional[str] = None,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    reload: bool = True,
+) -> None:
+    """Run the server until it is idle, stopped or re-executed.
+
+    Args:
+        main: App entry point as ``module:function`` or
+            ``script.py:function``.
+        parser: Parser builder in the same form; ``main`` then receives
+            the parsed namespace.
+        socket_path: Socket to listen on (default
+            :func:`socket_path_for`).
+        idle_timeout: Seconds without requests after which the server
+            exits; 0 disables the timeout.
+        reload: Re-execute the server when a source file of the app
+            changes.
+    """
+    _check_platform()
+    from ezgooey.batch import _Runner
+    from ezgooey.completion import _import_target
+
+    main = _absolute_target(main)
+    parser = _absolute_target(parser) if parser else None
+    path = socket_path or socket_path_for(main, parser)
+    inherited = os.environ.pop(_FD_ENV, None)
+    pending_fd = os.environ.pop(_PENDING_ENV, None)
+    # Load the app before listening, so a target that fails to import
+    # never leaves a socket behind that accepts connections.
+    app_main = _import_target(main)
+    builder = _import_target(parser) if parser else None
+    runner = _Runner(app_main, builder)
+    snapshot = _source_snapshot(_watch_roots([app_main, builder])) if reload else {}
+
+    if inherited is not None:
+        listener = socket.socket(fileno=int(inherited))
+    else:
+        bound = _bind(path)
+        if bound is None:
+            return  # another server is already listening
+        listener = bound
+    listener.set_inheritable(False)
+    socket_inode = os.stat(path).st_ino
+
+    def reexec(conn: Optional[socket.socket]) -> None:
+        listener.set_inheritable(True)
+        env = dict(os.environ, **{_FD_ENV: str(listener.fileno())})
+        if conn is not None:
+            conn.set_inheritable(True)
+            env[_PENDING_ENV] = str(conn.fileno())
+        args = [sys.executable, "-m", "ezgooey.daemon", "serve", main]
+        if parser:
+            args += ["--parser", parser]
+        args += ["--socket", path, "--idle-timeout", str(idle_timeout)]
+        os.execve(sys.executable, args, env)
+
+    def terminate(signum: int, frame: Any) -> None:
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, terminate)
+    signal.signal(signal.SIGHUP, terminate)
+    children: Dict[int, socket.socket] = {}
+    last_request = time.monotonic()
+    running = True
+    try:
+        if pending_fd is not None:
+            running = _serve_connection(
+                socket.socket(fileno=int(pending_fd)), runner, children
+            )
+        while running:
+            _reap(children)
+            ready, _, _ = select.select([listener], [], [], POLL_INTERVAL)
+            if ready:
+                try:
+                    conn, _addr = listener.accept()
+                except OSError:
+                    continue
+                last_request = time.monotonic()
+                if snapshot and _changed(snapshot):
+                    reexec(conn)
+                running = _serve_connection(conn, runner, children)
+                continue
+            if snapshot and _changed(snapshot):
+                reexec(None)
+            idle = time.monotonic() - last_request
+            if idle_timeout and not children and idle >= idle_timeout:
+                break
+    finally:
+        # Only the server that owns the socket file removes it.
+        try:
+            if os.stat(path).st_ino == socket_inode:
+                os.unlink(path)
+        except OSError:
+            pass
+        listener.close()
+
+
+# ---------------------------------------------------------------- client
+
+
+def _connect(path: str) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def log_path_for(socket_path: str) -> str:
+    """Return the file that a server started by a client writes its output to."""
+    return os.path.splitext(socket_path)[0] + ".log"
+
+
+def _server_failed(socket_path: str, reason: object) -> ConnectionError:
+    log = log_path_for(socket_path)
+    hint = f"; see {log}" if os.path.isfile(log) and os.path.getsize(log) else ""
+    return ConnectionError(f"the ezgooey server at {socket_path} {reason}{hint}")
+
+
+def _start_server(args: List[str], path: str) -> socket.socket:
+    """Start a detached server and return a connection to it.
+
+    The server's stdout and stderr go to :func:`log_path_for`, so an app
+    that fails to import leaves its traceback there.
+
+    Raises:
+        ConnectionError: If the server cannot be started, exits or does
+            not listen within :data:`START_TIMEOUT` seconds.
+    """
+    import subprocess
+
+    command = [sys.executable, "-m", "ezgooey.daemon", "serve", *args]
+    try:
+        with open(log_path_for(path), "wb") as log:
+            server = subprocess.Popen(
+                command + ["--socket", path],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=log,
+                start_new_session=True,
+                close_fds=True,
+            )
+    except OSError as e:
+        raise ConnectionError(f"cannot start the ezgooey server: {e}") from e
+    deadline = time.monotonic() + START_TIMEOUT
+    while True:
+        try:
+            return _connect(path)
+        except OSError as e:
+            status = server.poll()
+            if status is not None:
+                # Lost a start-up race to another server, or failed.
+                try:
+                    return _connect(path)
+                except OSError:
+                    pass
+                raise _server_failed(path, f"exited with status {status}") from e
+            if time.monotonic() > deadline:
+                raise _server_failed(path, "did not start") from e
+            time.sleep(0.02)
+
+
+def run_client(
+    argv: Sequence[str],
+    socket_path: str,
+    start: Optional[List[str]] = None,
+    prog: Optional[str] = None,
+) -> int:
+    """Forward one invocation to the server and return its exit status.
+
+    Args:
+        argv: Arguments for the app.
+        socket_path: The server's socket.
+        start: ``serve`` arguments (``[main, "--parser", builder, …]``)
+            used to start a server when none is listening; without them a
+            missing server raises :class:`ConnectionError`.
+        prog: Program name the app sees as ``sys.argv[0]``.
+
+    Returns:
+        The app's exit status.
+
+    Raises:
+        ConnectionError: If no server is listening and ``start`` is not
+            given, or the server cannot be started or fails the request.
+    """
+    _check_platform()
+    try:
+        sock = _connect(socket_path)
+    except OSError as e:
+        if start is None:
+            raise ConnectionError(f"no ezgooey server at {socket_path}: {e}") from e
+        sock = _start_server(start, socket_path)
+    with sock:
+        header = {
+            "command": "run",
+            "argv": list(argv),
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+            "prog": prog,
+        }
+        try:
+            _send_fds(sock, [0, 1, 2])
+            _write_line(sock, header)
+            hello = _read_line(sock)
+        except OSError as e:
+            raise _server_failed(socket_path, f"failed: {e}") from e
+        if not hello:
+            raise _server_failed(socket_path, "closed the connection")
+        pid = int(hello["pid"])
+
+        def forward(signum: int, frame: Any) -> None:
+            try:
+                os.kill(pid, signum)
+            except OSError:
+                pass
+
+        for sig in _FORWARDED_SIGNALS:
+            signal.signal(sig, forward)
+        reply = _read_line(sock)
+    if not reply or "status" not in reply:
+        print("ezgooey-daemon: the server ended the request", file=sys.stderr)
+        return 1
+    return int(reply["status"])
+
+
+def _command(socket_path: str, command: str) -> bool:
+    try:
+        sock = _connect(socket_path)
+    except OSError:
+        return False
+    with sock:
+        _send_fds(sock, [])
+        _write_line(sock, {"command": command})
+        if command == "stop":
+            sock.recv(1)  # the server closes the connection once it stops
+        else:
+            return _read_line(sock) is not None
+    return True
+
+
+def stop(socket_path: str) -> bool:
+    """Ask the server at ``socket_path`` to exit; ``False`` if none runs."""
+    return _command(socket_path, "stop")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Entry point of ``ezgooey-daemon`` / ``python -m ezgooey.daemon``."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="ezgooey-daemon",
+        description="Keep an ezgooey app loaded and run it through a Unix socket.",
+        epilog="Arguments for the app follow -- after the run options.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help in (
+        ("run", "run the app through the server, starting it if needed"),
+        ("serve", "run the server in the foreground"),
+        ("stop", "stop the server"),
+        ("status", "exit with 0 if the server is running"),
+    ):
+        sub = commands.add_parser(name, help=help)
+        sub.add_argument("main", help="app entry point as module:function")
+        sub.add_argument("--parser", metavar="BUILDER", help="parser builder")
+        sub.add_argument("--socket", help="socket path (default: per app)")
+        if name == "run":
+            sub.add_argument(
+                "--no-start", action="store_true", help="fail if no server runs"
+            )
+            sub.add_argument("--prog", help="program name the app sees")
+        if name == "serve":
+            sub.add_argument(
+                "--idle-timeout",
+                type=float,
+                default=DEFAULT_IDLE_TIMEOUT,
+                help="exit after this many idle seconds, 0 for never",
+            )
+            sub.add_argument(
+                "--no-reload", action="store_true", help="ignore source changes"
+            )
+    argv = list(sys.argv[1:] if argv is None else argv)
+    app_args: List[str] = []
+    if argv[:1] == ["run"] and "--" in argv:
+        split = argv.index("--")
+        argv, app_args = argv[:split], argv[split + 1 :]
+    args = parser.parse_args(argv)
+    args.main = _absolute_target(args.main)
+    if args.parser:
+        args.parser = _absolute_target(args.parser)
+    try:
+        path = args.socket or socket_path_for(args.main, args.parser)
+    except OSError as e:
+        parser.error(str(e))
+
+    if args.command == "serve":
+        serve(args.main, args.parser, path, args.idle_timeout, not args.no_reload)
+        return
+    if args.command == "stop":
+        sys.exit(0 if stop(path) else 1)
+    if args.command == "status":
+        sys.exit(0 if _command(path, "ping") else 1)
+    start = None
+    if not args.no_start:
+        start = [args.main] + (["--parser", args.parser] if args.parser else [])
+    try:
+        status = run_client(app_args, path, start, args.prog)
+    except ConnectionError as e:
+        print(f"ezgooey-daemon: {e}", file=sys.stderr)
+        status = 1
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -33,20 +33,116 @@ def get_parser():
 
 __version__ = "1.2.0"
 
+__all__ = [
+    "ArgumentParser",
+    "ezgooey",
+    "detect_mode",
+    "MODE",
+    "FlexArgumentParser",
+    "patch_argparse",
+    "unpatch_argparse",
+    "flex_add_argument",
+    "flex_add_argument_group",
+    "flex_add_mutually_exclusive_group",
+    # Re-exported for code that relied on ``from ezgooey.ez import *``
+    # bringing these modules into scope before ``__all__`` existed.
+    "argparse",
+    "sys",
+]
+
 import argparse
+import os
 import sys
-from typing import Any, Callable, TypeVar
-
-try:
-    import gooey
-except ImportError:
-    gooey = None
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Any, Callable, List, Mapping, Optional, TypeVar
 
 F = TypeVar("F", bound=Callable[..., Any])
 
-# Monkey-patch argparse to silently drop Gooey-specific kwargs
-# (``widget`` and ``gooey_options``) so the same parser code works in both
-# CLI mode (no Gooey) and GUI mode (Gooey present).
+# Environment variable that forces the mode: ``gui``, ``cli`` or ``auto``.
+MODE_ENV = "EZGOOEY_MODE"
+GUI = "gui"
+CLI = "cli"
+
+# Gooey (and through it wxPython) is expensive to import, so it is never
+# imported at module level.  The mode is decided first from cheap signals
+# (argv, environment, display availability) and Gooey is only loaded once
+# GUI mode actually needs it.
+
+
+def _is_headless(environ: Mapping[str, str]) -> bool:
+    """Return ``True`` if there is no display a GUI could be shown on.
+
+    macOS and Windows always have a display available to desktop
+    processes; other POSIX systems need an X11 or Wayland display.
+
+    Args:
+        environ: The environment to inspect.
+
+    Returns:
+        ``True`` when no display server is reachable.
+    """
+    if sys.platform == "darwin" or os.name == "nt":
+        return False
+    return not (environ.get("DISPLAY") or environ.get("WAYLAND_DISPLAY"))
+
+
+def detect_mode(
+    argv: Optional[List[str]] = None, environ: Optional[Mapping[str, str]] = None
+) -> str:
+    """Decide whether the app runs as GUI or CLI without importing Gooey.
+
+    The checks run in order of increasing cost:
+
+    1. ``EZGOOEY_MODE=cli`` forces CLI mode, ``EZGOOEY_MODE=gui`` skips
+       the argv and display checks.
+    2. Any command-line argument selects CLI mode.
+    3. A headless session (no ``DISPLAY``/``WAYLAND_DISPLAY``) selects CLI.
+    4. Gooey must be installed; this is a finder lookup, not an import.
+
+    Args:
+        argv: Command line to inspect (default ``sys.argv``).
+        environ: Environment to inspect (default ``os.environ``).
+
+    Returns:
+        :data:`GUI` or :data:`CLI`.
+    """
+    argv = sys.argv if argv is None else argv
+    environ = os.environ if environ is None else environ
+    forced = environ.get(MODE_ENV, "").strip().lower()
+    if forced == CLI:
+        return CLI
+    if forced != GUI:
+        if len(argv) > 1 or _is_headless(environ):
+            return CLI
+    if find_spec("gooey") is None:
+        return CLI
+    return GUI
+
+
+@lru_cache(maxsize=None)
+def _load_gooey() -> Any:
+    """Import Gooey on first use and cache the result.
+
+    Returns:
+        The ``gooey`` module, or ``None`` if it cannot be imported.
+    """
+    try:
+        import gooey
+    except ImportError:
+        return None
+    return gooey
+
+
+# Gooey-specific kwargs (``widget`` and ``gooey_options``) are silently
+# dropped in CLI mode so the same parser code works in both modes. Only
+# parsers created through ezgooey's ArgumentParser do this; patching
+# argparse itself for every parser in the process is opt-in (see
+# patch_argparse()).
+
+# Environment variable that applies patch_argparse() on import when set
+# to ``1``, for legacy code that passes Gooey kwargs to argparse directly.
+PATCH_ENV = "EZGOOEY_PATCH_ARGPARSE"
 
 
 def flex_add_argument(f: Callable[..., Any]) -> Callable[..., Any]:
@@ -111,23 +207,160 @@ def flex_add_mutually_exclusive_group(f: Callable[..., Any]) -> Callable[..., An
     return f_decorated
 
 
-argparse._ActionsContainer.add_argument = flex_add_argument(  # type: ignore[method-assign]
-    argparse.ArgumentParser.add_argument
-)
+_STOCK_METHODS = {
+    name: getattr(argparse._ActionsContainer, name)
+    for name in ("add_argument", "add_argument_group", "add_mutually_exclusive_group")
+}
+
 
-argparse._ActionsContainer.add_argument_group = flex_add_argument_group(  # type: ignore[method-assign]
-    argparse.ArgumentParser.add_argument_group
-)
+def patch_argparse() -> None:
+    """Make every argparse parser in the process accept Gooey kwargs.
 
-argparse._ActionsContainer.add_mutually_exclusive_group = (  # type: ignore[method-assign]
-    flex_add_mutually_exclusive_group(
-        argparse.ArgumentParser.add_mutually_exclusive_group
+    Importing ezgooey used to do this unconditionally: the
+    ``argparse._ActionsContainer`` methods are replaced by the ``flex_*``
+    wrappers, so parsers created with plain :class:`argparse.ArgumentParser`
+    also drop ``widget`` and ``gooey_options``. Every parser in the process,
+    including those of third-party libraries, then pays for the wrapper.
+    Prefer ezgooey's :data:`ArgumentParser`. Calling this more than once
+    has no effect.
+    """
+    container = argparse._ActionsContainer
+    if container.add_argument is not _STOCK_METHODS["add_argument"]:
+        return
+    container.add_argument = flex_add_argument(  # type: ignore[method-assign]
+        _STOCK_METHODS["add_argument"]
+    )
+    container.add_argument_group = flex_add_argument_group(  # type: ignore[method-assign]
+        _STOCK_METHODS["add_argument_group"]
     )
-)
+    container.add_mutually_exclusive_group = (  # type: ignore[method-assign]
+        flex_add_mutually_exclusive_group(
+            _STOCK_METHODS["add_mutually_exclusive_group"]
+        )
+    )
+
+
+def unpatch_argparse() -> None:
+    """Undo :func:`patch_argparse`."""
+    for name, method in _STOCK_METHODS.items():
+        setattr(argparse._ActionsContainer, name, method)
 
-if gooey is None or len(sys.argv) > 1:
-    # CLI mode: use standard argparse; the @ezgooey decorator is a no-op.
-    ArgumentParser = argparse.ArgumentParser  # type: ignore[misc,assignment]
+
+class _FlexContainer:
+    """Mixin for argparse containers that drop Gooey-specific kwargs.
+
+    Groups created by the container are switched to the matching flex
+    class, so ``widget`` and ``gooey_options`` work on them too. The
+    widget name is kept as the action's ``widget`` attribute, which
+    :mod:`ezgooey.completion` uses for file and directory hints.
+    """
+
+    def add_argument(self, *args: Any, **kwargs: Any) -> argparse.Action:
+        widget = kwargs.pop("widget", None)
+        kwargs.pop("gooey_options", None)
+        action = super().add_argument(*args, **kwargs)  # type: ignore[misc]
+        if widget is not None:
+            action.widget = widget  # type: ignore[attr-defined]
+        return action
+
+    def add_argument_group(self, *args: Any, **kwargs: Any) -> Any:
+        kwargs.pop("widget", None)
+        kwargs.pop("gooey_options", None)
+        group = super().add_argument_group(*args, **kwargs)  # type: ignore[misc]
+        group.__class__ = _FlexArgumentGroup
+        return group
+
+    def add_mutually_exclusive_group(self, **kwargs: Any) -> Any:
+        kwargs.pop("widget", None)
+        kwargs.pop("gooey_options", None)
+        group = super().add_mutually_exclusive_group(**kwargs)  # type: ignore[misc]
+        group.__class__ = _FlexMutuallyExclusiveGroup
+        return group
+
+
+class _FlexArgumentGroup(_FlexContainer, argparse._ArgumentGroup):
+    pass
+
+
+class _FlexMutuallyExclusiveGroup(_FlexContainer, argparse._MutuallyExclusiveGroup):
+    pass
+
+
+def _creation_site() -> str:
+    """Return ``module:function`` of the app code creating a parser.
+
+    Frames of argparse and ezgooey are skipped, so subparsers and parsers
+    built by :mod:`ezgooey.spec` count as created by the app's builder.
+    """
+    frame: Any = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module != "argparse" and not module.startswith("ezgooey."):
+            if module == "__main__":
+                module = frame.f_globals.get("__file__", module)
+            return f"{module}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return ""
+
+
+class FlexArgumentParser(_FlexContainer, argparse.ArgumentParser):
+    """:class:`argparse.ArgumentParser` that accepts Gooey-only kwargs.
+
+    ``widget`` and ``gooey_options`` are dropped from ``add_argument``,
+    ``add_argument_group`` and ``add_mutually_exclusive_group`` calls on
+    the parser, its groups and (through ``add_subparsers``) its
+    subparsers. This is ezgooey's ``ArgumentParser`` in CLI mode; other
+    parsers in the process are not affected.
+
+    Parsers with at least :attr:`help_cache_min_actions` actions render
+    their help and usage once per definition and terminal width and then
+    serve them from the user cache (see :func:`ezgooey.cache.cached_help`).
+    Set the attribute to ``None`` to always render afresh.
+    """
+
+    help_cache_min_actions: Optional[int] = 200
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Keeps help cache entries of same-named parsers apart.
+        self._created_by = _creation_site()
+
+    def _render(self, kind: str, render: Callable[[], str]) -> str:
+        threshold = self.help_cache_min_actions
+        if threshold is None or len(self._actions) < threshold:
+            return render()
+        from ezgooey.cache import cached_help
+
+        return cached_help(self, kind, render)
+
+    def format_help(self) -> str:
+        return self._render("help", super().format_help)
+
+    def format_usage(self) -> str:
+        return self._render("usage", super().format_usage)
+
+
+if os.environ.get(PATCH_ENV) == "1":
+    patch_argparse()
+
+
+def _passthrough(*args: Any) -> Any:
+    """Return the decorated function, or a decorator that returns it."""
+    if args:
+        return args[0]
+
+    def decorator_ezgooey(func: F) -> F:
+        return func
+
+    return decorator_ezgooey
+
+
+MODE = detect_mode()
+
+if MODE == CLI:
+    # CLI mode: use argparse (through FlexArgumentParser); the @ezgooey
+    # decorator is a no-op. Gooey is never imported on this path.
+    ArgumentParser = FlexArgumentParser
 
     def ezgooey(*args: Any, **kwargs: Any) -> Any:  # type: ignore[misc]
         """No-op decorator used in CLI mode (Gooey unavailable or args given).
@@ -136,32 +369,39 @@ if gooey is None or len(sys.argv) > 1:
         returned unchanged.  When called as ``@ezgooey(...)`` (with keyword
         arguments) a pass-through decorator is returned.
 
+        ``@ezgooey(cache=True)`` instead caches the parser the function
+        returns on disk (see :func:`ezgooey.cache.cached_parser`).
+
         Args:
             *args: Positional arguments — the first positional argument is
                 treated as the decorated function when the decorator is used
                 without parentheses.
-            **kwargs: Keyword arguments (ignored in CLI mode).
+            **kwargs: Keyword arguments (ignored in CLI mode, except
+                ``cache``).
 
         Returns:
             The decorated function, or a pass-through decorator.
         """
-        if args:
-            return args[0]
-
-        def decorator_ezgooey(func: F) -> F:
-            return func
+        if kwargs.get("cache"):
+            from ezgooey.cache import cached_parser
 
-        return decorator_ezgooey
+            return cached_parser(args[0]) if args else cached_parser
+        return _passthrough(*args)
 
 else:
-    # GUI mode: delegate to Gooey.
-    ArgumentParser = gooey.GooeyParser  # type: ignore[misc,assignment]
 
     def ezgooey(*args: Any, **kwargs: Any) -> Any:  # type: ignore[misc]
         """Decorator that activates Gooey GUI mode.
 
-        Forwards all arguments to :func:`gooey.Gooey`.  Use as
-        ``@ezgooey`` or ``@ezgooey(program_name='…', …)``.
+        Imports Gooey on first use and forwards all arguments to
+        :func:`gooey.Gooey`.  Use as ``@ezgooey`` or
+        ``@ezgooey(program_name='…', …)``.  If Gooey turns out not to be
+        importable, the decorator degrades to the CLI pass-through.
+
+        Unless given, ``progress_regex`` defaults to
+        :data:`ezgooey.logging.PROGRESS_REGEX`, which matches the lines
+        written by ``ezgooey.logging.logger(…).progress()``. The
+        ``cache`` option only applies in CLI mode and is dropped here.
 
         Args:
             *args: Positional arguments forwarded to ``gooey.Gooey``.
@@ -170,4 +410,28 @@ else:
         Returns:
             A Gooey-wrapped decorator.
         """
+        kwargs.pop("cache", None)
+        gooey = _load_gooey()
+        if gooey is None:
+            return _passthrough(*args)
+        from ezgooey.logging import PROGRESS_REGEX
+
+        kwargs.setdefault("progress_regex", PROGRESS_REGEX)
         return gooey.Gooey(*args, **kwargs)
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve GUI-mode names lazily (PEP 562).
+
+    In GUI mode ``ArgumentParser`` is :class:`gooey.GooeyParser`, which is
+    only importable once Gooey is loaded; ``gooey`` gives access to the
+    module itself (``None`` when it is not installed).
+    """
+    if name == "gooey":
+        return _load_gooey()
+    if name == "ArgumentParser":
+        gooey = _load_gooey()
+        if gooey is None:
+            return FlexArgumentParser
+        return gooey.GooeyParser
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
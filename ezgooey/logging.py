@@ -57,13 +57,114 @@ log.success('success') # Only with adv
 
 __version__ = "1.2.0"
 
+import atexit
+import collections
+import contextlib
+import functools
+import io
+import logging as _std_logging
+import math
+import os
+import queue
+import re
 import sys
+import threading
+import time
+from collections.abc import Mapping
+from contextvars import ContextVar, Token
 from logging import *
-
-from colored import attr, fg, stylize
+from typing import (
+    IO,
+    Any,
+    Callable,
+    ContextManager,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 SUCCESS = 25
 
+# Flush policies for BufferedStream
+FLUSH_ALWAYS = "always"
+FLUSH_LINE = "line"
+FLUSH_BYTES = "bytes"
+FLUSH_INTERVAL = "interval"
+FLUSH_POLICIES = (FLUSH_ALWAYS, FLUSH_LINE, FLUSH_BYTES, FLUSH_INTERVAL)
+
+# Progress lines written by ``logger().progress()`` look like
+# ``progress: 42% (420/1000) message``; ``@ezgooey`` passes this regex to
+# Gooey by default so its progress bar follows them.
+PROGRESS_REGEX = r"progress: (\d+)%"
+PROGRESS_MIN_INTERVAL = 0.1
+PROGRESS_MIN_DELTA = 1
+
+# Special ``format`` value for init() that selects JsonFormatter
+FORMAT_JSONL = "jsonl"
+
+# Overflow policies for AsyncQueueHandler
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_OLDEST = "drop-oldest"
+OVERFLOW_DROP_NEWEST = "drop-newest"
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST)
+
+# Back-pressure policies for NonBlockingWriter
+BACKPRESSURE_BLOCK = "block"
+BACKPRESSURE_DROP_DEBUG = "drop-debug"
+BACKPRESSURE_SPILL = "spill"
+BACKPRESSURE_POLICIES = (
+    BACKPRESSURE_BLOCK,
+    BACKPRESSURE_DROP_DEBUG,
+    BACKPRESSURE_SPILL,
+)
+
+# ANSI codes for the colors and attributes ezgooey uses, so the ``colored``
+# package is only needed (and imported) for names missing from this table.
+ANSI_CODES = {
+    "grey_30": "\x1b[38;5;239m",
+    "dark_orange": "\x1b[38;5;208m",
+    "red": "\x1b[38;5;1m",
+    "light_red": "\x1b[38;5;9m",
+    "green": "\x1b[38;5;2m",
+    "bold": "\x1b[1m",
+    "reset": "\x1b[0m",
+}
+
+# Environment variable that overrides color detection in init():
+# ``always``, ``never`` or ``auto`` (the default).
+COLOR_ENV = "EZGOOEY_COLOR"
+COLOR_ALWAYS = "always"
+COLOR_NEVER = "never"
+COLOR_AUTO = "auto"
+
+# Gooey runs the script again with this flag and shows its output in a
+# rich-text console that renders ANSI colors.
+GOOEY_CHILD_FLAG = "--ignore-gooey"
+
+# Level prefixes rendered by EzFormatter in place of ``%(levelname)s``,
+# and the colored styles applied to them on terminals.
+LEVEL_PREFIXES = {
+    DEBUG: "# [DEBUG] ",
+    INFO: "",
+    WARNING: "# [WARNING] ",
+    ERROR: "# [ERROR] ",
+    CRITICAL: "# [FAILURE] ",
+    SUCCESS: "# [SUCCESS] ",
+}
+LEVEL_STYLES = {
+    DEBUG: ("grey_30",),
+    WARNING: ("dark_orange",),
+    ERROR: ("red",),
+    CRITICAL: ("light_red", "bold"),
+    SUCCESS: ("green", "bold"),
+}
+
 # Set up color logger
 
 
@@ -83,47 +184,2198 @@ class Unbuffered:
         return getattr(self.stream, attr)
 
 
-def init(level: int = INFO, format: str = "%(levelname)s%(message)s") -> None:
-    """Initialize colored logging compatible with Gooey's rich-text console.
+class EzFormatter(Formatter):
+    """Formatter that renders ``%(levelname)s`` as ezgooey's level prefix.
+
+    Instead of renaming levels process-wide with :func:`addLevelName`, the
+    prefix for each level (``"# [WARNING] "``, colored or plain) is baked
+    into a per-level template when the level is first seen. For the common
+    formats whose only field besides the prefix is ``%(message)s``, the
+    template is plain string concatenation with no ``%``-formatting at all.
 
-    Sets up the root logger with color-coded level names and unbuffered stdout.
-    Safe to call multiple times; subsequent calls update the log level even after
-    the first call has already installed handlers (working around the standard
-    ``basicConfig`` one-shot behaviour).
+    Only ``%``-style format strings are supported.
 
     Args:
-        level: Root logging level (default ``logging.INFO``).
-        format: Log format string (default suppresses the level prefix for INFO).
+        fmt: Log format string (default ``"%(levelname)s%(message)s"``).
+        datefmt: Date format passed to :meth:`Formatter.formatTime`.
+        color: If ``True`` (default), prefixes carry ANSI color codes; use
+            ``False`` for files and other non-terminal sinks.
+    """
+
+    def __init__(
+        self,
+        fmt: str = "%(levelname)s%(message)s",
+        datefmt: Optional[str] = None,
+        color: bool = True,
+    ) -> None:
+        super().__init__(fmt, datefmt)
+        self.color = color
+        self._templates: Dict[int, Callable[[LogRecord], str]] = {}
+
+    def prefix(self, levelno: int, levelname: str) -> str:
+        """Return the rendered prefix for a level."""
+        prefix = LEVEL_PREFIXES.get(levelno)
+        if prefix is None:
+            return f"# [{levelname}] "
+        style = LEVEL_STYLES.get(levelno)
+        if not self.color or not style:
+            return prefix
+        return "".join(map(ansi, style)) + prefix + ANSI_CODES["reset"]
+
+    def _compile(self, record: LogRecord) -> Callable[[LogRecord], str]:
+        prefix = self.prefix(record.levelno, record.levelname)
+        fmt = self._fmt.replace("%(levelname)s", prefix.replace("%", "%%"))
+        head, sep, tail = fmt.partition("%(message)s")
+        if sep and "%" not in head and "%" not in tail:
+            head, tail = head.replace("%%", "%"), tail.replace("%%", "%")
+
+            def template(record: LogRecord) -> str:
+                return head + record.message + tail
+
+        else:
+
+            def template(record: LogRecord) -> str:
+                return fmt % record.__dict__
+
+        self._templates[record.levelno] = template
+        return template
+
+    def formatMessage(self, record: LogRecord) -> str:
+        template = self._templates.get(record.levelno)
+        if template is None:
+            template = self._compile(record)
+        return template(record)
+
+
+def detect_color(
+    stream: Optional[IO[str]] = None,
+    argv: Optional[List[str]] = None,
+    environ: Optional[Mapping[str, str]] = None,
+) -> bool:
+    """Decide whether log output to ``stream`` should carry ANSI colors.
+
+    The checks run in order:
+
+    1. ``EZGOOEY_COLOR=always`` or ``EZGOOEY_COLOR=never`` decides.
+    2. A non-empty ``NO_COLOR`` (see https://no-color.org) disables colors.
+    3. A script started by Gooey (``--ignore-gooey`` in argv) writes to
+       Gooey's rich-text console, which renders colors.
+    4. Otherwise colors are used only if ``stream`` is a terminal and
+       ``TERM`` is not ``dumb``; pipes and files get plain output.
+
+    Args:
+        stream: The stream the log handler writes to (default
+            ``sys.stderr``).
+        argv: Command line to inspect (default ``sys.argv``).
+        environ: Environment to inspect (default ``os.environ``).
+
+    Returns:
+        ``True`` if colored prefixes should be rendered.
+    """
+    environ = os.environ if environ is None else environ
+    forced = environ.get(COLOR_ENV, "").strip().lower()
+    if forced == COLOR_ALWAYS:
+        return True
+    if forced == COLOR_NEVER or environ.get("NO_COLOR"):
+        return False
+    if GOOEY_CHILD_FLAG in (sys.argv if argv is None else argv):
+        return True
+    if environ.get("TERM") == "dumb":
+        return False
+    stream = sys.stderr if stream is None else stream
+    try:
+        return bool(stream.isatty())
+    except (AttributeError, ValueError):
+        return False
+
+
+# Attributes every LogRecord has, plus the ``_monotonic`` stamp that
+# EzLogger adds; anything else on a record came from ``extra=`` and is
+# emitted as an additional JSONL field.
+_RECORD_ATTRS = frozenset(
+    LogRecord("", 0, "", 0, "", None, None).__dict__.keys()
+    | {"message", "asctime", "_monotonic"}
+)
+
+# Shifts ``record.created`` (wall clock) onto the time.monotonic() clock
+# for records that carry no ``_monotonic`` stamp.
+_MONOTONIC_OFFSET = time.monotonic() - time.time()
+
+
+class JsonFormatter(Formatter):
+    """Formatter that renders each record as one compact JSON object.
+
+    Every line carries ``t`` (a :func:`time.monotonic` timestamp),
+    ``level``, ``name`` and ``msg``, followed by any ``extra=`` fields in
+    sorted order and, for exceptions, ``exc``. No format string is applied;
+    the message arguments are interpolated and the dict is serialized by a
+    prebuilt :class:`json.JSONEncoder`. Values that are not
+    JSON-serializable are written as their ``repr()``.
+
+    The timestamp is the :func:`time.monotonic` reading an
+    :class:`EzLogger` takes when it creates the record, so every handler
+    that formats a record writes the same ``t``. Records of other loggers
+    have no such reading; their ``record.created`` is shifted onto the
+    monotonic clock by the offset measured at import, which is off by any
+    later step of the system clock.
+
+    Use :func:`read_jsonl` to parse the output.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        import json
+
+        self._encode = json.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":"), default=repr
+        ).encode
+
+    def format(self, record: LogRecord) -> str:
+        t = record.__dict__.get("_monotonic")
+        if t is None:
+            t = record.created + _MONOTONIC_OFFSET
+        data = {
+            "t": t,
+            "level": record.levelname,
+            "name": record.name,
+            "msg": record.getMessage(),
+        }
+        extra = record.__dict__.keys() - _RECORD_ATTRS
+        if extra:
+            for key in sorted(extra):
+                data[key] = record.__dict__[key]
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+        return self._encode(data)
+
+
+def read_jsonl(
+    source: Union[str, IO[str], Iterable[str]]
+) -> Iterator[Dict[str, Any]]:
+    """Lazily parse the records written by :class:`JsonFormatter`.
+
+    Lines that are blank or do not start with ``{`` (such as plain
+    ``print()`` output interleaved with the log) are skipped.
+
+    Args:
+        source: A file path (``.gz`` files are decompressed), or an open
+            text stream or any other iterable of lines.
+
+    Yields:
+        One dict per record.
+    """
+    import json
+
+    if isinstance(source, str):
+        if source.endswith(".gz"):
+            import gzip
+
+            with gzip.open(source, "rt", encoding="utf-8") as f:
+                yield from read_jsonl(f)
+            return
+        with open(source, encoding="utf-8") as f:
+            yield from read_jsonl(f)
+        return
+    decode = json.JSONDecoder().decode
+    for line in source:
+        line = line.strip()
+        if line.startswith("{"):
+            yield decode(line)
+
+
+# Format fields grouped by what it costs LeanRecord to compute them.
+_CALLER_FIELDS = frozenset({"pathname", "filename", "module", "lineno", "funcName"})
+_TIME_FIELDS = frozenset({"asctime", "msecs", "relativeCreated"})
+_THREAD_FIELDS = frozenset({"thread", "threadName"})
+_PROCESS_FIELDS = frozenset({"process", "processName"})
+_SRCFILE = _std_logging._srcfile  # type: ignore[attr-defined]
+
+# Values of the fields a LeanRecord skips. They are set on each instance,
+# because %-style formatting reads ``record.__dict__``, not the class.
+_PLACEHOLDERS: Dict[str, Any] = {
+    "pathname": "(unknown file)",
+    "filename": "(unknown file)",
+    "module": "Unknown module",
+    "lineno": 0,
+    "funcName": None,
+    "msecs": 0.0,
+    "relativeCreated": 0.0,
+    "thread": None,
+    "threadName": None,
+    "process": None,
+    "processName": None,
+}
+if "taskName" in _RECORD_ATTRS:  # Python 3.12+
+    _PLACEHOLDERS["taskName"] = None
+
+
+class LeanRecord(LogRecord):
+    """Log record that only computes the fields the active format uses.
+
+    :class:`LogRecord` fills in the caller's file and function, thread and
+    process names and several derived timestamps for every record. This
+    class always sets the fields handlers and formatters rely on (name,
+    level, message arguments, exception and ``created``) and computes the
+    optional groups only when :meth:`configure` enabled them; skipped
+    fields hold placeholder values (``"(unknown file)"``, ``0``,
+    ``None``), so other formats that use them still render.
+
+    Records keep their instance ``__dict__``: formatters interpolate
+    ``record.__dict__`` and ``extra=`` adds arbitrary attributes, so a
+    ``__slots__`` layout would break them.
+    """
+
+    with_caller = True
+    with_times = True
+    with_thread = True
+    with_process = True
+
+    def __init__(
+        self,
+        name: str,
+        level: int,
+        pathname: str,
+        lineno: int,
+        msg: object,
+        args: Any,
+        exc_info: Any,
+        func: Optional[str] = None,
+        sinfo: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.__dict__.update(_PLACEHOLDERS)
+        self.name = name
+        self.msg = msg
+        if args and len(args) == 1 and isinstance(args[0], Mapping) and args[0]:
+            args = args[0]
+        self.args = args
+        self.levelname = getLevelName(level)
+        self.levelno = level
+        self.exc_info = exc_info
+        self.exc_text = None
+        self.stack_info = sinfo
+        self.created = created = time.time()
+        if self.with_caller:
+            self.pathname = pathname
+            self.lineno = lineno
+            self.funcName = func
+            try:
+                self.filename = os.path.basename(pathname)
+                self.module = os.path.splitext(self.filename)[0]
+            except (TypeError, ValueError, AttributeError):
+                self.filename = pathname
+        if self.with_times:
+            self.msecs = int((created - int(created)) * 1000) + 0.0
+            self.relativeCreated = (
+                created - _std_logging._startTime  # type: ignore[attr-defined]
+            ) * 1000
+        if self.with_thread:
+            self.thread = threading.get_ident()
+            self.threadName = threading.current_thread().name
+        if self.with_process:
+            self.process = os.getpid()
+            mp = sys.modules.get("multiprocessing")
+            self.processName = "MainProcess"
+            if mp is not None:
+                try:
+                    self.processName = mp.current_process().name
+                except Exception:
+                    pass
+
+    @classmethod
+    def configure(cls, fmt: str) -> None:
+        """Enable exactly the field groups that ``fmt`` references.
+
+        When no caller field is referenced, the standard library's
+        ``findCaller`` stack walk is switched off as well (this affects
+        every logger in the process; ``stack_info=True`` is then ignored).
+        """
+        fields = set(re.findall(r"%\((\w+)\)", fmt))
+        cls.with_caller = bool(fields & _CALLER_FIELDS)
+        cls.with_times = bool(fields & _TIME_FIELDS)
+        cls.with_thread = bool(fields & _THREAD_FIELDS)
+        cls.with_process = bool(fields & _PROCESS_FIELDS)
+        _std_logging._srcfile = (  # type: ignore[attr-defined]
+            _SRCFILE if cls.with_caller else None
+        )
+
+
+def ansi(name: str) -> str:
+    """Return the ANSI escape sequence for a color or attribute name.
+
+    Names from :data:`ANSI_CODES` are served directly. Any other name is
+    looked up in the optional ``colored`` package, imported on first use,
+    and cached in the table.
+
+    Args:
+        name: A ``colored`` color name (``"dark_orange"``) or attribute
+            (``"bold"``).
+
+    Returns:
+        The escape sequence.
+
+    Raises:
+        ValueError: If the name is unknown and ``colored`` is not installed.
+    """
+    code = ANSI_CODES.get(name)
+    if code is not None:
+        return code
+    try:
+        from colored import attr, fg
+    except ImportError:
+        raise ValueError(
+            f"Unknown color {name!r}; install 'colored' for the full palette"
+        ) from None
+    try:
+        code = fg(name)
+    except Exception:
+        code = attr(name)
+    ANSI_CODES[name] = code
+    return code
+
+
+class BufferedStream:
+    """Text stream wrapper that batches writes according to a flush policy.
+
+    Text is encoded once and appended to an in-memory byte buffer, which is
+    written straight to the underlying binary ``stream.buffer`` (or, for
+    streams without one, back to the text stream) when the policy says so:
+
+    * ``"always"`` — after every write, like :class:`Unbuffered`.
+    * ``"line"`` — when a write contains a newline.
+    * ``"bytes"`` — when ``buffer_size`` bytes are pending.
+    * ``"interval"`` — every ``flush_interval`` seconds, from a background
+      thread.
+
+    With every policy, pending data is also written once ``buffer_size``
+    bytes accumulate, on :meth:`flush` and at interpreter exit.
+
+    Args:
+        stream: The text stream to wrap, usually ``sys.stdout``.
+        policy: One of :data:`FLUSH_POLICIES` (default ``"line"``).
+        buffer_size: Byte threshold that forces a flush (default 64 KiB).
+        flush_interval: Seconds between flushes for the ``"interval"``
+            policy (default 0.1).
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        policy: str = FLUSH_LINE,
+        buffer_size: int = 65536,
+        flush_interval: float = 0.1,
+    ) -> None:
+        if policy not in FLUSH_POLICIES:
+            raise ValueError(
+                f"Unknown flush policy {policy!r}; expected one of {FLUSH_POLICIES}"
+            )
+        self.stream = stream
+        self.policy = policy
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.encoding = getattr(stream, "encoding", None) or "utf-8"
+        self.errors = getattr(stream, "errors", None) or "strict"
+        self._raw = getattr(stream, "buffer", None)
+        self._pending = bytearray()
+        self._lock = threading.Lock()
+        self._stop: Optional[threading.Event] = None
+        # Anything already queued in the text layer must go out before we
+        # start writing bytes underneath it.
+        stream.flush()
+        atexit.register(self.close)
+        if policy == FLUSH_INTERVAL:
+            self._stop = threading.Event()
+            threading.Thread(
+                target=self._flush_periodically, name="ezgooey-flusher", daemon=True
+            ).start()
+
+    def write(self, data: str) -> int:
+        encoded = data.encode(self.encoding, self.errors)
+        with self._lock:
+            self._pending += encoded
+            if (
+                self.policy == FLUSH_ALWAYS
+                or len(self._pending) >= self.buffer_size
+                or (self.policy == FLUSH_LINE and "\n" in data)
+            ):
+                self._write_pending()
+        return len(data)
+
+    def writelines(self, datas: Iterable[str]) -> None:
+        for data in datas:
+            self.write(data)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write_pending()
+
+    def close(self) -> None:
+        """Flush pending data and stop the background flusher.
+
+        The wrapped stream itself is left open.
+        """
+        atexit.unregister(self.close)
+        if self._stop is not None:
+            self._stop.set()
+        try:
+            self.flush()
+        except (OSError, ValueError):
+            # The underlying stream is already gone (e.g. closed at exit).
+            pass
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+        data = bytes(self._pending)
+        self._pending.clear()
+        if self._raw is not None:
+            self._raw.write(data)
+            self._raw.flush()
+        else:
+            self.stream.write(data.decode(self.encoding, self.errors))
+            self.stream.flush()
+
+    def _flush_periodically(self) -> None:
+        assert self._stop is not None
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except (OSError, ValueError):
+                return
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.stream, attr)
+
+
+class NonBlockingWriter:
+    """Text stream wrapper that writes from a background thread.
+
+    Writes are encoded and queued in memory, and a daemon thread writes
+    them to ``stream.buffer`` (or the text stream) in batches, so a stalled
+    consumer (a paused Gooey window, a full pipe) does not stall the
+    caller. At most ``budget`` bytes are held in memory; beyond that the
+    ``policy`` applies (the batch being written does not count):
+
+    * ``"block"`` — the caller waits until the thread has caught up.
+    * ``"drop-debug"`` — queued records below INFO are discarded to make
+      room and new ones are refused; other writes wait as with ``"block"``.
+    * ``"spill"`` — writes are appended to an anonymous temporary file,
+      which the thread drains in order once memory is written out.
+
+    Plain :meth:`write` calls (``print()`` output) count as INFO; handlers
+    pass the record level with :meth:`write_record`. The counters
+    ``written``, ``dropped``, ``spilled`` and ``blocked`` count writes and
+    are returned by :meth:`stats`. Everything queued or spilled is written
+    on :meth:`flush`, :meth:`close` and at interpreter exit.
+
+    Args:
+        stream: The text stream to wrap.
+        budget: Bytes held in memory before the policy applies (default
+            1 MiB).
+        policy: One of :data:`BACKPRESSURE_POLICIES` (default ``"block"``).
+    """
+
+    def __init__(
+        self, stream: TextIO, budget: int = 1 << 20, policy: str = BACKPRESSURE_BLOCK
+    ) -> None:
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(
+                f"Unknown back-pressure policy {policy!r}; "
+                f"expected one of {BACKPRESSURE_POLICIES}"
+            )
+        self.stream = stream
+        self.budget = budget
+        self.policy = policy
+        self.encoding = getattr(stream, "encoding", None) or "utf-8"
+        self.errors = getattr(stream, "errors", None) or "strict"
+        self._raw = getattr(stream, "buffer", None)
+        self.written = self.dropped = self.spilled = self.blocked = 0
+        self._chunks: Deque[Tuple[bytes, int]] = collections.deque()
+        self._size = 0
+        self._spill: Optional[IO[bytes]] = None
+        self._spill_read = self._spill_write = self._spill_count = 0
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        stream.flush()
+        self._thread = threading.Thread(
+            target=self._run, name="ezgooey-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, data: str) -> int:
+        self.write_record(data, INFO)
+        return len(data)
+
+    def writelines(self, datas: Iterable[str]) -> None:
+        for data in datas:
+            self.write(data)
+
+    def write_record(self, data: str, levelno: int) -> None:
+        """Queue ``data``, applying the back-pressure policy for ``levelno``."""
+        encoded = data.encode(self.encoding, self.errors)
+        with self._cond:
+            if self._closed:
+                self._write(encoded)
+                return
+            if self._spill_write or not self._fits(len(encoded)):
+                if self.policy == BACKPRESSURE_SPILL:
+                    self._spill_chunk(encoded)
+                    return
+                if self.policy == BACKPRESSURE_DROP_DEBUG:
+                    if levelno < INFO:
+                        self.dropped += 1
+                        return
+                    self._drop_debug()
+                if not self._fits(len(encoded)):
+                    self.blocked += 1
+                    self._cond.wait_for(
+                        lambda: self._closed or self._fits(len(encoded))
+                    )
+            self._chunks.append((encoded, levelno))
+            self._size += len(encoded)
+            self._cond.notify_all()
+
+    def _fits(self, size: int) -> bool:
+        # A single oversized write is accepted once memory is empty.
+        return not self._size or self._size + size <= self.budget
+
+    def _drop_debug(self) -> None:
+        kept = collections.deque(c for c in self._chunks if c[1] >= INFO)
+        dropped = len(self._chunks) - len(kept)
+        if dropped:
+            self.dropped += dropped
+            self._chunks = kept
+            self._size = sum(len(c[0]) for c in kept)
+
+    def _spill_chunk(self, data: bytes) -> None:
+        if self._spill is None:
+            import tempfile
+
+            self._spill = tempfile.TemporaryFile()
+        self._spill.seek(self._spill_write)
+        self._spill.write(data)
+        self._spill_write += len(data)
+        self._spill_count += 1
+        self.spilled += 1
+        self._cond.notify_all()
+
+    def _next_batch(self) -> Optional[Tuple[bytes, int]]:
+        """Take the next batch to write, or ``None`` once closed and empty."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._chunks or self._spill_write or self._closed
+            )
+            if self._chunks:
+                batch = b"".join(chunk for chunk, _ in self._chunks)
+                count = len(self._chunks)
+                self._chunks.clear()
+                self._size = 0
+                self._cond.notify_all()
+            elif self._spill_write:
+                assert self._spill is not None
+                self._spill.seek(self._spill_read)
+                batch = self._spill.read(self.budget)
+                self._spill_read += len(batch)
+                count = 0
+                if self._spill_read >= self._spill_write:
+                    count = self._spill_count
+                    self._spill.seek(0)
+                    self._spill.truncate()
+                    self._spill_read = self._spill_write = self._spill_count = 0
+            else:
+                return None
+            self._busy = True
+            return batch, count
+
+    def _run(self) -> None:
+        while True:
+            item = self._next_batch()
+            if item is None:
+                return
+            batch, count = item
+            try:
+                self._write(batch)
+            except (OSError, ValueError):
+                # The consumer is gone; count what is lost and stop writing.
+                with self._cond:
+                    self.dropped += count + len(self._chunks) + self._spill_count
+                    self._chunks.clear()
+                    self._spill_read = self._spill_write = self._spill_count = 0
+                    self._size = 0
+                    self._closed = True
+                    self._busy = False
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self.written += count
+                self._busy = False
+                self._cond.notify_all()
+
+    def _write(self, data: bytes) -> None:
+        if self._raw is not None:
+            self._raw.write(data)
+            self._raw.flush()
+        else:
+            self.stream.write(data.decode(self.encoding, self.errors))
+            self.stream.flush()
+
+    def flush(self) -> None:
+        """Wait until everything queued or spilled has been written."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._closed
+                or not (self._chunks or self._spill_write or self._busy)
+            )
+
+    def close(self) -> None:
+        """Write everything pending and stop the thread.
+
+        The wrapped stream itself is left open.
+        """
+        atexit.unregister(self.close)
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self._spill is not None:
+            self._spill.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the ``written``, ``dropped``, ``spilled`` and ``blocked`` counts."""
+        with self._cond:
+            return {
+                "written": self.written,
+                "dropped": self.dropped,
+                "spilled": self.spilled,
+                "blocked": self.blocked,
+            }
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.stream, attr)
+
+
+class NonBlockingHandler(StreamHandler):
+    """Stream handler that writes through a :class:`NonBlockingWriter`.
+
+    The record level is passed on, so the ``"drop-debug"`` policy can tell
+    which lines to discard. Closing the handler drains and stops the writer.
+
+    Args:
+        stream: Text stream to write to (default ``sys.stderr``).
+        budget: See :class:`NonBlockingWriter`.
+        policy: See :class:`NonBlockingWriter`.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        budget: int = 1 << 20,
+        policy: str = BACKPRESSURE_BLOCK,
+    ) -> None:
+        writer = NonBlockingWriter(
+            sys.stderr if stream is None else stream, budget, policy
+        )
+        super().__init__(writer)  # type: ignore[arg-type]
+        self.writer = writer
+
+    def emit(self, record: LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+            self.writer.write_record(msg, record.levelno)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+    def close(self) -> None:
+        self.writer.close()
+        super().close()
+
+
+_writers: List[NonBlockingWriter] = []
+
+
+def writer_stats() -> Dict[str, int]:
+    """Return the counters of the writers installed by ``init(backpressure=...)``.
+
+    The counts of the stdout writer and the console handler's writer are
+    added up; see :meth:`NonBlockingWriter.stats`.
+    """
+    totals = {"written": 0, "dropped": 0, "spilled": 0, "blocked": 0}
+    for writer in _writers:
+        for key, value in writer.stats().items():
+            totals[key] += value
+    return totals
+
+
+def _install_stdout(
+    policy: str,
+    buffer_size: int,
+    flush_interval: float,
+    backpressure: Optional[str] = None,
+    budget: int = 1 << 20,
+) -> None:
+    """Replace ``sys.stdout`` with a :class:`BufferedStream`.
+
+    With ``backpressure``, a :class:`NonBlockingWriter` is used instead.
+    Wrappers installed by earlier :func:`init` calls (including legacy
+    :class:`Unbuffered` ones) are unwrapped first, so repeated calls never
+    nest wrappers.
+    """
+    stream = sys.stdout
+    while isinstance(stream, (Unbuffered, BufferedStream, NonBlockingWriter)):
+        if isinstance(stream, (BufferedStream, NonBlockingWriter)):
+            stream.close()
+        if stream in _writers:
+            _writers.remove(stream)  # type: ignore[arg-type]
+        stream = stream.stream
+    if backpressure is None:
+        sys.stdout = BufferedStream(stream, policy, buffer_size, flush_interval)
+    else:
+        writer = NonBlockingWriter(stream, budget, backpressure)
+        _writers.append(writer)
+        sys.stdout = writer  # type: ignore[assignment]
+
+
+class Sink:
+    """Destination for records rendered by a :class:`FanoutHandler`.
+
+    Sinks receive each record already formatted and encoded, so a record
+    written to several sinks with the same format is rendered only once.
+    Subclasses implement :meth:`write`, :meth:`flush` and :meth:`close`.
+
+    Args:
+        format: Format string for this sink, or ``"jsonl"`` (default: the
+            format passed to :func:`init`).
+        color: Whether level prefixes carry ANSI colors (default ``False``).
+    """
+
+    encoding = "utf-8"
+
+    def __init__(self, format: Optional[str] = None, color: Optional[bool] = None):
+        self.format = format
+        self.color = color
+
+    def write(self, data: bytes) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+class StreamSink(Sink):
+    """Sink that writes each record to a console stream and flushes it.
+
+    Bytes go straight to ``stream.buffer`` when the stream has one.
+    ``color=None`` (the default) lets :func:`detect_color` decide.
+
+    Args:
+        stream: Text stream to write to (default ``sys.stderr``).
+        format: See :class:`Sink`.
+        color: See :class:`Sink`.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        format: Optional[str] = None,
+        color: Optional[bool] = None,
+    ) -> None:
+        stream = sys.stderr if stream is None else stream
+        super().__init__(format, detect_color(stream) if color is None else color)
+        self.stream = stream
+        self.encoding = getattr(stream, "encoding", None) or "utf-8"
+        # Ezgooey's own wrappers batch and encode by themselves.
+        self._raw = (
+            None
+            if isinstance(stream, (BufferedStream, NonBlockingWriter))
+            else getattr(stream, "buffer", None)
+        )
+        if self._raw is not None:
+            stream.flush()
+
+    def write(self, data: bytes) -> None:
+        if self._raw is not None:
+            self._raw.write(data)
+            self._raw.flush()
+        else:
+            self.stream.write(data.decode(self.encoding, "replace"))
+            self.stream.flush()
+
+
+class FileSink(Sink):
+    """Sink that appends records to a file through a large write buffer.
+
+    Unlike :class:`Unbuffered`, nothing is flushed per record: data reaches
+    the file when ``buffer_size`` bytes have accumulated, on :meth:`flush`
+    and when logging shuts down at exit.
+
+    Args:
+        path: File to append to.
+        buffer_size: Size of the write buffer in bytes (default 1 MiB).
+        format: See :class:`Sink`.
+        color: See :class:`Sink`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        buffer_size: int = 1 << 20,
+        format: Optional[str] = None,
+        color: Optional[bool] = None,
+    ) -> None:
+        super().__init__(format, color)
+        self.path = os.fspath(path)
+        self.buffer_size = buffer_size
+        self._file = self._open()
+
+    def _open(self) -> IO[bytes]:
+        return open(self.path, "ab", buffering=self.buffer_size)
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+
+    def flush(self) -> None:
+        if not self._file.closed:
+            self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class RotatingFileSink(FileSink):
+    """:class:`FileSink` that rolls the file over when it grows too large.
+
+    Before a write would take the file past ``max_bytes``, it is renamed to
+    ``path.1`` (shifting older backups up to ``path.<backup_count>``) and a
+    new file is started, like :class:`logging.handlers.RotatingFileHandler`.
+
+    Args:
+        path: File to append to.
+        max_bytes: Size at which the file is rolled over.
+        backup_count: Number of old files to keep (default 5).
+        buffer_size: See :class:`FileSink`.
+        format: See :class:`Sink`.
+        color: See :class:`Sink`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int,
+        backup_count: int = 5,
+        buffer_size: int = 1 << 20,
+        format: Optional[str] = None,
+        color: Optional[bool] = None,
+    ) -> None:
+        super().__init__(path, buffer_size, format, color)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._size = self._file.tell()
+
+    def write(self, data: bytes) -> None:
+        if self._size and self._size + len(data) > self.max_bytes:
+            self._rollover()
+        self._file.write(data)
+        self._size += len(data)
+
+    def _rollover(self) -> None:
+        self._file.close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{i}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = self._open()
+        self._size = 0
+
+
+class GzipFileSink(FileSink):
+    """:class:`FileSink` that compresses records into a gzip stream.
+
+    Records are buffered before they reach the compressor, so it works on
+    large blocks. Each run appends a new gzip member, which ``gzip`` and
+    :func:`read_jsonl` read as one stream; data still buffered when the
+    process is killed is lost.
+
+    Args:
+        path: ``.gz`` file to append to.
+        compresslevel: zlib compression level (default 6).
+        buffer_size: See :class:`FileSink`.
+        format: See :class:`Sink`.
+        color: See :class:`Sink`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compresslevel: int = 6,
+        buffer_size: int = 1 << 20,
+        format: Optional[str] = None,
+        color: Optional[bool] = None,
+    ) -> None:
+        self.compresslevel = compresslevel
+        super().__init__(path, buffer_size, format, color)
+
+    def _open(self) -> IO[bytes]:
+        import gzip
+
+        raw = gzip.GzipFile(self.path, "ab", self.compresslevel)
+        return io.BufferedWriter(raw, self.buffer_size)  # type: ignore[arg-type]
+
+    def flush(self) -> None:
+        # Flushing the compressor would end a deflate block per call, so only
+        # the buffer is handed over; close() finishes the gzip member.
+        if not self._file.closed:
+            self._file.flush()
+
+
+def _as_sink(sink: Union[Sink, str]) -> Sink:
+    if isinstance(sink, Sink):
+        return sink
+    if os.fspath(sink).endswith(".gz"):
+        return GzipFileSink(sink)
+    return FileSink(sink)
+
+
+class FanoutHandler(Handler):
+    """Handler that formats each record once per format for several sinks.
+
+    Sinks sharing a format, color setting and encoding share one formatter,
+    so a record is rendered and encoded once for all of them. Closing the
+    handler (which :func:`logging.shutdown` does at exit) closes the sinks.
+
+    Args:
+        sinks: :class:`Sink` instances; a path string is shorthand for a
+            :class:`FileSink`, or a :class:`GzipFileSink` if it ends with
+            ``.gz``.
+        format: Format for sinks that do not set one.
+    """
+
+    def __init__(
+        self,
+        sinks: Iterable[Union[Sink, str]],
+        format: str = "%(levelname)s%(message)s",
+    ) -> None:
+        super().__init__()
+        self.sinks = [_as_sink(sink) for sink in sinks]
+        groups: Dict[Any, List[Sink]] = {}
+        for sink in self.sinks:
+            fmt = sink.format or format
+            key = (fmt, bool(sink.color) and fmt != FORMAT_JSONL, sink.encoding)
+            groups.setdefault(key, []).append(sink)
+        self._groups = [
+            (
+                JsonFormatter()
+                if fmt == FORMAT_JSONL
+                else EzFormatter(fmt, color=color),
+                encoding,
+                group,
+            )
+            for (fmt, color, encoding), group in groups.items()
+        ]
+
+    def emit(self, record: LogRecord) -> None:
+        try:
+            for formatter, encoding, sinks in self._groups:
+                data = (formatter.format(record) + "\n").encode(
+                    encoding, "backslashreplace"
+                )
+                for sink in sinks:
+                    sink.write(data)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        with self.lock:  # type: ignore[union-attr]
+            for sink in self.sinks:
+                sink.flush()
+
+    def close(self) -> None:
+        with self.lock:  # type: ignore[union-attr]
+            for sink in self.sinks:
+                try:
+                    sink.close()
+                except (OSError, ValueError):
+                    pass
+        super().close()
+
+
+class AsyncQueueHandler(Handler):
+    """Queue handler with a bounded queue and an explicit overflow policy.
+
+    Works like :class:`logging.handlers.QueueHandler`, without importing
+    that module (which pulls in sockets and pickle). Only the message is
+    interpolated on the caller's thread, so later changes to mutable
+    arguments cannot alter what gets logged; level prefixes, the format
+    string and the actual write are left to the :class:`AsyncListener`.
+
+    Args:
+        queue: The bounded :class:`queue.Queue` shared with the listener.
+        overflow: What to do when the queue is full, one of
+            :data:`OVERFLOW_POLICIES`: ``"block"`` waits for room,
+            ``"drop-oldest"`` discards the oldest queued record and
+            ``"drop-newest"`` discards the record being logged.
+    """
+
+    def __init__(self, queue: "queue.Queue[Any]", overflow: str = OVERFLOW_BLOCK):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy {overflow!r}; "
+                f"expected one of {OVERFLOW_POLICIES}"
+            )
+        super().__init__()
+        self.queue = queue
+        self.overflow = overflow
+        self.dropped = 0
+
+    def emit(self, record: LogRecord) -> None:
+        try:
+            self.enqueue(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+    def enqueue(self, record: LogRecord) -> None:
+        if self.overflow == OVERFLOW_BLOCK:
+            self.queue.put(record)
+            return
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                self.dropped += 1
+                if self.overflow == OVERFLOW_DROP_NEWEST:
+                    return
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+
+
+class AsyncListener:
+    """Background thread that writes queued records in batches.
+
+    Records are taken off the queue in batches of up to ``batch_size``;
+    ``None`` on the queue stops the thread (it survives pickling, so the
+    same listener serves :func:`start_process_logging`).
+    Plain :class:`StreamHandler` instances receive each batch as a single
+    joined write followed by one flush; other handlers handle records one
+    by one.
+
+    Args:
+        queue: The queue fed by an :class:`AsyncQueueHandler`.
+        handlers: The handlers that perform the actual output.
+        batch_size: Maximum number of records written per batch.
+    """
+
+    def __init__(
+        self,
+        queue: "queue.Queue[Any]",
+        handlers: List[Handler],
+        batch_size: int = 512,
+    ) -> None:
+        self.queue = queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="ezgooey-log-listener", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Write every queued record, then stop the thread."""
+        atexit.unregister(self.stop)
+        if self._thread is None:
+            return
+        self.queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        q = self.queue
+        while True:
+            batch = [q.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            records = [record for record in batch if record is not None]
+            if records:
+                self._dispatch(records)
+            if len(records) < len(batch):
+                return
+
+    def _dispatch(self, records: List[LogRecord]) -> None:
+        for handler in self.handlers:
+            if type(handler) is StreamHandler:
+                self._write_batch(handler, records)
+                continue
+            for record in records:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+    @staticmethod
+    def _write_batch(handler: StreamHandler, records: List[LogRecord]) -> None:
+        lines = []
+        for record in records:
+            if record.levelno < handler.level or not handler.filter(record):
+                continue
+            try:
+                lines.append(handler.format(record) + handler.terminator)
+            except Exception:
+                handler.handleError(record)
+        if not lines:
+            return
+        handler.acquire()
+        try:
+            handler.stream.write("".join(lines))
+            handler.flush()
+        except Exception:
+            handler.handleError(records[-1])
+        finally:
+            handler.release()
+
+
+class ProcessQueueHandler(AsyncQueueHandler):
+    """:class:`AsyncQueueHandler` for worker processes.
+
+    Besides interpolating the message, the traceback is rendered to text
+    and dropped from the record, so every record can be pickled onto a
+    :class:`multiprocessing.Queue`.
+    """
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        record = super().prepare(record)
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _plain_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _ProcessListener(AsyncListener):
+    """Listener that applies this process's logger levels to worker records."""
+
+    def _dispatch(self, records: List[LogRecord]) -> None:
+        records = [
+            record
+            for record in records
+            if getLogger(record.name).isEnabledFor(record.levelno)
+        ]
+        if records:
+            super()._dispatch(records)
+
+
+_plain_formatter = Formatter()
+_process_listener: Optional[AsyncListener] = None
+
+
+def start_process_logging(ctx: Any = None, maxsize: int = 0) -> Any:
+    """Collect the log records of worker processes in this process.
+
+    Creates a :class:`multiprocessing.Queue` and an :class:`AsyncListener`
+    thread that writes the records arriving on it through the current root
+    handlers, so all output is formatted and written by this one process.
+    Call it after :func:`init`, and pass the queue to :func:`worker_init`
+    in each worker. Records are filtered by this process's logger levels.
+    The listener is drained at exit or by :func:`stop_process_logging`.
+
+    Example::
+
+        q = logging.start_process_logging()
+        with ProcessPoolExecutor(initializer=logging.worker_init, initargs=(q,)) as ex:
+            ex.map(work, items)
+
+    Args:
+        ctx: A multiprocessing context (default: the default context).
+        maxsize: Maximum number of queued records (default unbounded).
+
+    Returns:
+        The queue to hand to the workers.
+    """
+    global _process_listener
+    stop_process_logging()
+    if ctx is None:
+        import multiprocessing
+
+        ctx = multiprocessing.get_context()
+    q = ctx.Queue(maxsize)
+    _process_listener = _ProcessListener(q, getLogger().handlers[:])
+    _process_listener.start()
+    return q
+
+
+def stop_process_logging() -> None:
+    """Write all records queued by workers, then stop the listener."""
+    global _process_listener
+    if _process_listener is not None:
+        _process_listener.stop()
+        _process_listener = None
+
+
+def worker_init(
+    queue: Any, level: int = NOTSET, overflow: str = OVERFLOW_BLOCK
+) -> None:
+    """Send this process's log records to the parent's listener.
+
+    Intended as the ``initializer`` of a :class:`multiprocessing.Pool` or
+    :class:`concurrent.futures.ProcessPoolExecutor`. Handlers inherited by
+    forking are removed and replaced with a :class:`ProcessQueueHandler`;
+    formatting and writing happen in the parent.
+
+    Args:
+        queue: The queue returned by :func:`start_process_logging`.
+        level: Root level in the worker. The default sends everything and
+            leaves filtering to the parent's levels; raise it to save
+            pickling records the parent would discard.
+        overflow: Policy for a full queue, one of :data:`OVERFLOW_POLICIES`.
+    """
+    root = getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(ProcessQueueHandler(queue, overflow))
+    root.setLevel(level)
+    addLevelName(SUCCESS, "SUCCESS")
+    _install_logger_class()
+
+
+class ThrottleFilter(Filter):
+    """Handler filter that collapses duplicates and rate-limits loggers.
+
+    Duplicate suppression: the first record with a given logger, level,
+    message and arguments passes; identical records within the next
+    ``window`` seconds are swallowed. When the message shows up again after
+    the window, or on :meth:`flush`, a single ``"… (repeated N more times)"``
+    summary record is emitted (with a ``repeated`` attribute holding N).
+
+    Rate limiting: each logger gets a token bucket refilled at ``rate``
+    records per second and holding at most ``burst`` tokens. Records that
+    find the bucket empty are dropped, and the next record that passes, or
+    :meth:`flush`, emits a warning counting the dropped ones.
+
+    The per-record cost is one hash plus one dict lookup for each enabled
+    check. Summaries are emitted straight to the handler the filter is
+    attached to, bypassing its filters.
+
+    Args:
+        handler: The handler to filter and to send summaries to.
+        window: Duplicate-suppression window in seconds, or ``None``.
+        rate: Records per second allowed per logger, or ``None``.
+        burst: Bucket size (default: one second's worth of ``rate``).
+        max_keys: Number of remembered messages above which expired entries
+            are pruned.
+    """
+
+    def __init__(
+        self,
+        handler: Handler,
+        window: Optional[float] = 1.0,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_keys: int = 10000,
+    ) -> None:
+        super().__init__()
+        self.handler = handler
+        self.window = window
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate or 1.0, 1.0)
+        self.max_keys = max_keys
+        self.suppressed = 0
+        self.rate_limited = 0
+        self._seen: Dict[Any, List[Any]] = {}
+        # Per logger: [tokens, last refill, dropped count, last dropped record]
+        self._buckets: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: LogRecord) -> bool:
+        now = time.monotonic()
+        summaries = []
+        with self._lock:
+            if self.window is not None and not self._first_in_window(
+                record, now, summaries
+            ):
+                return False
+            if self.rate is not None and not self._take_token(
+                record, now, summaries
+            ):
+                return False
+        for summary in summaries:
+            self._emit(summary)
+        return True
+
+    def _first_in_window(
+        self, record: LogRecord, now: float, summaries: List[LogRecord]
+    ) -> bool:
+        key: Any = (record.name, record.levelno, record.msg, record.args)
+        try:
+            entry = self._seen.get(key)
+        except TypeError:
+            # Unhashable arguments; fall back to the rendered message.
+            key = (record.name, record.levelno, record.getMessage())
+            entry = self._seen.get(key)
+        if entry is not None:
+            if now < entry[0]:
+                entry[1] += 1
+                entry[2] = record
+                self.suppressed += 1
+                return False
+            if entry[1]:
+                summaries.append(self._repeated(entry[2], entry[1]))
+        elif len(self._seen) >= self.max_keys:
+            self._prune(now, summaries)
+        self._seen[key] = [now + self.window, 0, record]
+        return True
+
+    def _take_token(
+        self, record: LogRecord, now: float, summaries: List[LogRecord]
+    ) -> bool:
+        assert self.rate is not None
+        bucket = self._buckets.get(record.name)
+        if bucket is None:
+            bucket = self._buckets[record.name] = [self.burst, now, 0, None]
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens < 1:
+            bucket[0] = tokens
+            bucket[2] += 1
+            bucket[3] = record
+            self.rate_limited += 1
+            return False
+        bucket[0] = tokens - 1
+        if bucket[2]:
+            summaries.append(self._dropped(record, int(bucket[2])))
+            bucket[2], bucket[3] = 0, None
+        return True
+
+    def _prune(self, now: float, summaries: List[LogRecord]) -> None:
+        for key, entry in list(self._seen.items()):
+            if now >= entry[0]:
+                if entry[1]:
+                    summaries.append(self._repeated(entry[2], entry[1]))
+                del self._seen[key]
+
+    @staticmethod
+    def _repeated(record: LogRecord, count: int) -> LogRecord:
+        summary = makeLogRecord(record.__dict__)
+        summary.msg = "%s (repeated %d more times)"
+        summary.args = (record.getMessage(), count)
+        summary.exc_info = summary.exc_text = None
+        summary.repeated = count
+        return summary
+
+    @staticmethod
+    def _dropped(record: LogRecord, count: int) -> LogRecord:
+        summary = makeLogRecord(record.__dict__)
+        summary.levelno, summary.levelname = WARNING, getLevelName(WARNING)
+        summary.msg = "%d records from %r dropped by rate limit"
+        summary.args = (count, record.name)
+        summary.exc_info = summary.exc_text = None
+        return summary
+
+    def _emit(self, summary: LogRecord) -> None:
+        self.handler.acquire()
+        try:
+            self.handler.emit(summary)
+        finally:
+            self.handler.release()
+
+    def flush(self) -> None:
+        """Emit summaries for pending duplicates and rate-limited records."""
+        with self._lock:
+            summaries = [
+                self._repeated(entry[2], entry[1])
+                for entry in self._seen.values()
+                if entry[1]
+            ]
+            self._seen.clear()
+            for bucket in self._buckets.values():
+                if bucket[2]:
+                    summaries.append(self._dropped(bucket[3], int(bucket[2])))
+                    bucket[2], bucket[3] = 0, None
+        for summary in summaries:
+            self._emit(summary)
+
+
+class RingBufferHandler(Handler):
+    """Handler that keeps the last ``capacity`` formatted records in memory.
+
+    Lines are stored in a slot list allocated up front and overwritten in
+    turn, so memory stays fixed however long the job runs. :meth:`dump`
+    writes them out on demand; :meth:`install_triggers` makes that happen
+    on an unhandled exception and on ``SIGUSR1``.
+
+    The handler can also sit in front of the live console: every
+    ``sample``-th record, and every record at ``forward_level`` or above, is
+    passed on to the ``targets``, which keeps Gooey's console short while
+    the full tail stays available in the ring.
+
+    Args:
+        capacity: Number of records kept.
+        targets: Handlers that receive the forwarded subset.
+        sample: Forward one in this many records below ``forward_level``
+            (default 1, i.e. all; 0 forwards none).
+        forward_level: Records at this level or above are always forwarded
+            (default ``WARNING``).
+        dump_path: File that :meth:`dump` appends to by default, instead of
+            ``sys.stderr``.
     """
-    sys.stdout = Unbuffered(sys.stdout)
 
+    def __init__(
+        self,
+        capacity: int = 5000,
+        targets: Optional[List[Handler]] = None,
+        sample: int = 1,
+        forward_level: int = WARNING,
+        dump_path: Optional[str] = None,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError(f"Ring buffer capacity must be at least 1, got {capacity}")
+        super().__init__()
+        self.capacity = capacity
+        self.targets = targets or []
+        self.sample = sample
+        self.forward_level = forward_level
+        self.dump_path = dump_path
+        self._slots: List[Any] = [None] * capacity
+        self._count = 0
+        self._previous_excepthook: Optional[Callable[..., Any]] = None
+        self._previous_signal: Any = None
+
+    def emit(self, record: LogRecord) -> None:
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        count = self._count
+        self._slots[count % self.capacity] = line
+        self._count = count + 1
+        if record.levelno >= self.forward_level or (
+            self.sample and count % self.sample == 0
+        ):
+            for target in self.targets:
+                if record.levelno >= target.level:
+                    target.handle(record)
+
+    def lines(self) -> List[str]:
+        """Return the buffered lines, oldest first."""
+        self.acquire()
+        try:
+            count, capacity = self._count, self.capacity
+            if count <= capacity:
+                return self._slots[:count]
+            start = count % capacity
+            return self._slots[start:] + self._slots[:start]
+        finally:
+            self.release()
+
+    def dump(self, target: Union[None, str, IO[str]] = None) -> None:
+        """Write the buffered lines to a path or stream.
+
+        Args:
+            target: A file path (appended to) or text stream; defaults to
+                ``dump_path`` or ``sys.stderr``.
+        """
+        target = target if target is not None else self.dump_path
+        lines = self.lines()
+        text = f"# --- last {len(lines)} log records ---\n"
+        text += "".join(line + "\n" for line in lines)
+        if target is None:
+            sys.stderr.write(text)
+            sys.stderr.flush()
+        elif isinstance(target, str):
+            with open(target, "a", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            target.write(text)
+            target.flush()
+
+    def install_triggers(self) -> None:
+        """Dump on unhandled exceptions and, where available, on SIGUSR1."""
+        if self._previous_excepthook is not None:
+            return
+        previous = self._previous_excepthook = sys.excepthook
+
+        def excepthook(*exc_info: Any) -> None:
+            try:
+                self.dump()
+            finally:
+                previous(*exc_info)
+
+        sys.excepthook = excepthook
+        import signal
+
+        if hasattr(signal, "SIGUSR1"):
+            try:
+                self._previous_signal = signal.signal(
+                    signal.SIGUSR1, lambda signum, frame: self.dump()
+                )
+            except ValueError:
+                # Not the main thread; signal handlers cannot be set here.
+                pass
+
+    def remove_triggers(self) -> None:
+        """Undo :meth:`install_triggers`."""
+        if self._previous_excepthook is None:
+            return
+        sys.excepthook = self._previous_excepthook
+        self._previous_excepthook = None
+        if self._previous_signal is not None:
+            import signal
+
+            signal.signal(signal.SIGUSR1, self._previous_signal)
+            self._previous_signal = None
+
+
+_ring: Optional[RingBufferHandler] = None
+
+
+def _install_ring(
+    capacity: Optional[int], sample: int, dump_path: Optional[str], format: str
+) -> None:
+    """Put a :class:`RingBufferHandler` in front of the root handlers."""
+    global _ring
+    if not capacity:
+        return
+    root = getLogger()
+    ring = RingBufferHandler(capacity, root.handlers[:], sample, dump_path=dump_path)
+    ring.setFormatter(
+        JsonFormatter() if format == FORMAT_JSONL else EzFormatter(format, color=False)
+    )
+    for handler in ring.targets:
+        root.removeHandler(handler)
+    root.addHandler(ring)
+    ring.install_triggers()
+    _ring = ring
+
+
+def _remove_ring() -> None:
+    """Remove the ring handler and give its targets back to the root logger."""
+    global _ring
+    if _ring is None:
+        return
+    root = getLogger()
+    root.removeHandler(_ring)
+    _ring.remove_triggers()
+    for handler in _ring.targets:
+        root.addHandler(handler)
+    _ring = None
+
+
+_async_listener: Optional[AsyncListener] = None
+
+
+def _start_async(queue_size: int, overflow: str) -> None:
+    """Move the root handlers behind an :class:`AsyncQueueHandler`."""
+    global _async_listener
+    root = getLogger()
+    q: queue.Queue[Any] = queue.Queue(queue_size)
+    queue_handler = AsyncQueueHandler(q, overflow)
+    listener = AsyncListener(q, root.handlers[:])
+    for handler in listener.handlers:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    listener.start()
+    _async_listener = listener
+
+
+def _stop_async() -> None:
+    """Drain the async listener and restore its handlers on the root logger."""
+    global _async_listener
+    if _async_listener is None:
+        return
+    root = getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, AsyncQueueHandler):
+            root.removeHandler(handler)
+    _async_listener.stop()
+    for handler in _async_listener.handlers:
+        root.addHandler(handler)
+    _async_listener = None
+
+
+_root_handler: Optional[Handler] = None
+
+
+def _install_root_handler(
+    level: int,
+    format: str,
+    color: Optional[bool],
+    sinks: Optional[Iterable[Union[Sink, str]]] = None,
+    backpressure: Optional[str] = None,
+    budget: int = 1 << 20,
+) -> None:
+    """Configure the root logger and give ezgooey's handler an EzFormatter.
+
+    Like :func:`basicConfig`, a handler is only created when the root logger
+    has none; handlers configured by the application are left untouched.
+    With ``color=None`` the colored or plain formatter is chosen once, here,
+    by :func:`detect_color` for the handler's stream.
+
+    With ``sinks``, ezgooey's handler is a :class:`FanoutHandler` instead,
+    added even when the application has handlers of its own. With
+    ``backpressure``, a newly created handler is a
+    :class:`NonBlockingHandler`. A handler installed by an earlier call is
+    replaced when either option is given or was given before.
+    """
+    global _root_handler
+    root = getLogger()
+    if _root_handler in root.handlers and (
+        sinks is not None
+        or backpressure is not None
+        or isinstance(_root_handler, (FanoutHandler, NonBlockingHandler))
+    ):
+        root.removeHandler(_root_handler)
+        _root_handler.close()
+        if isinstance(_root_handler, NonBlockingHandler):
+            _writers.remove(_root_handler.writer)
+        _root_handler = None
+    if sinks is not None:
+        _root_handler = FanoutHandler(sinks, format)
+        root.addHandler(_root_handler)
+        root.setLevel(level)
+        return
+    had_handlers = bool(root.handlers)
+    if not had_handlers and backpressure is not None:
+        handler = NonBlockingHandler(None, budget, backpressure)
+        _writers.append(handler.writer)
+        root.addHandler(handler)
     basicConfig(
         level=level,
-        format=format,
+        format="%(message)s" if format == FORMAT_JSONL else format,
     )
     # basicConfig is a no-op when handlers already exist, so always force the
     # level on the root logger so repeated init() calls behave predictably.
-    getLogger().setLevel(level)
-    addLevelName(DEBUG, stylize("# [DEBUG] ", fg("grey_30")))
-    addLevelName(INFO, "")
-    addLevelName(WARNING, stylize("# [WARNING] ", fg("dark_orange")))
-    addLevelName(ERROR, stylize("# [ERROR] ", fg("red")))
-    addLevelName(CRITICAL, stylize("# [FAILURE] ", fg("light_red") + attr("bold")))
-    addLevelName(SUCCESS, stylize("# [SUCCESS] ", fg("green") + attr("bold")))
+    root.setLevel(level)
+    if not had_handlers:
+        _root_handler = root.handlers[0]
+    if _root_handler in root.handlers:
+        if format == FORMAT_JSONL:
+            _root_handler.setFormatter(JsonFormatter())
+        else:
+            if color is None:
+                color = detect_color(getattr(_root_handler, "stream", None))
+            _root_handler.setFormatter(EzFormatter(format, color=color))
+
+
+_throttles: List[ThrottleFilter] = []
+
+
+def _remove_throttles() -> None:
+    """Flush and detach the filters installed by :func:`_install_throttle`."""
+    for throttle in _throttles:
+        atexit.unregister(throttle.flush)
+        throttle.flush()
+        throttle.handler.removeFilter(throttle)
+    _throttles.clear()
+
+
+def _install_throttle(
+    window: Optional[float], rate: Optional[float], burst: Optional[float]
+) -> None:
+    """Attach a :class:`ThrottleFilter` to each root handler.
+
+    In async mode the only root handler is the :class:`AsyncQueueHandler`,
+    so duplicates are dropped before they are queued.
+    """
+    if window is None and rate is None:
+        return
+    for handler in getLogger().handlers:
+        throttle = ThrottleFilter(handler, window, rate, burst)
+        handler.addFilter(throttle)
+        atexit.register(throttle.flush)
+        _throttles.append(throttle)
+
+
+def _install_logger_class() -> None:
+    """Make :class:`EzLogger` the class of new and existing plain loggers.
+
+    Applications that registered their own logger class keep it.
+    """
+    if getLoggerClass() is Logger:
+        setLoggerClass(EzLogger)
+    for log in list(Logger.manager.loggerDict.values()):
+        if type(log) is Logger:
+            log.__class__ = EzLogger
+
+
+def _install_record_factory(lean: bool, format: str) -> None:
+    """Install :class:`LeanRecord` for ``format``, or restore the default.
+
+    ``format`` holds every text format in use; JSONL sinks contribute
+    nothing, since :class:`JsonFormatter` only reads the name, level and
+    message.
+    """
+    if lean:
+        LeanRecord.configure(format)
+        setLogRecordFactory(LeanRecord)
+    elif getLogRecordFactory() is LeanRecord:
+        setLogRecordFactory(LogRecord)
+        _std_logging._srcfile = _SRCFILE  # type: ignore[attr-defined]
+
+
+def init(
+    level: int = INFO,
+    format: str = "%(levelname)s%(message)s",
+    flush: str = FLUSH_LINE,
+    buffer_size: int = 65536,
+    flush_interval: float = 0.1,
+    async_: bool = False,
+    queue_size: int = 10000,
+    overflow: str = OVERFLOW_BLOCK,
+    dedup_window: Optional[float] = None,
+    rate_limit: Optional[float] = None,
+    rate_burst: Optional[float] = None,
+    lean: bool = False,
+    ring_size: Optional[int] = None,
+    ring_sample: int = 1,
+    ring_dump: Optional[str] = None,
+    color: Optional[bool] = None,
+    sinks: Optional[Iterable[Union[Sink, str]]] = None,
+    backpressure: Optional[str] = None,
+    write_budget: int = 1 << 20,
+) -> None:
+    """Initialize colored logging compatible with Gooey's rich-text console.
+
+    Sets up the root logger with an :class:`EzFormatter`, which renders
+    ``%(levelname)s`` as a color-coded prefix, makes :class:`EzLogger` the
+    logger class, and wraps stdout in a :class:`BufferedStream`. Safe to
+    call multiple times; subsequent calls update the log level even after
+    the first call has already installed handlers (working around the
+    standard ``basicConfig`` one-shot behaviour), and replace the stdout
+    wrapper instead of nesting a new one.
+
+    Args:
+        level: Root logging level (default ``logging.INFO``).
+        format: Log format string (default suppresses the level prefix for
+            INFO), or ``"jsonl"`` for one JSON object per record (see
+            :class:`JsonFormatter`).
+        flush: Stdout flush policy, one of :data:`FLUSH_POLICIES` (default
+            ``"line"``, which keeps Gooey's console responsive).
+        buffer_size: Bytes buffered before stdout is flushed regardless of
+            policy (default 64 KiB).
+        flush_interval: Seconds between flushes for the ``"interval"``
+            policy (default 0.1).
+        async_: If ``True``, the root handlers are moved behind an
+            :class:`AsyncQueueHandler` and records are formatted and written
+            in batches by an :class:`AsyncListener` thread, which is drained
+            at exit.
+        queue_size: Maximum number of queued records in async mode.
+        overflow: Async-mode policy for a full queue, one of
+            :data:`OVERFLOW_POLICIES` (default ``"block"``).
+        dedup_window: If set, identical records within this many seconds
+            are collapsed into "repeated N more times" summaries (see
+            :class:`ThrottleFilter`).
+        rate_limit: If set, each logger may emit at most this many records
+            per second on average.
+        rate_burst: Records a logger may emit at once before ``rate_limit``
+            applies (default: one second's worth).
+        lean: If ``True``, records are built by :class:`LeanRecord`, which
+            skips caller lookup, thread/process names and derived times
+            unless ``format`` references them. Other handlers then see
+            placeholder values for those fields.
+        ring_size: If set, a :class:`RingBufferHandler` keeping this many
+            records is put in front of the root handlers. It dumps them on
+            an unhandled exception or ``SIGUSR1``.
+        ring_sample: With ``ring_size``, forward only one in this many
+            records below WARNING to the console (default 1, all).
+        ring_dump: With ``ring_size``, append dumps to this file instead of
+            writing them to stderr.
+        color: Whether level prefixes carry ANSI colors. The default
+            ``None`` detects it once (see :func:`detect_color`): colors go
+            to terminals and Gooey's console, plain text to pipes and files.
+        sinks: If set, records are written by one :class:`FanoutHandler`
+            to these sinks (for example ``[StreamSink(), FileSink("app.log"),
+            GzipFileSink("app.jsonl.gz", format="jsonl")]``) instead of the
+            default stderr handler. Each record is formatted once per
+            distinct sink format.
+        backpressure: If set, stdout and the default console handler write
+            through :class:`NonBlockingWriter` threads, so a stalled
+            consumer does not stall the application, and this policy (one
+            of :data:`BACKPRESSURE_POLICIES`) decides what happens when
+            ``write_budget`` bytes are waiting. ``flush`` does not apply
+            then. See :func:`writer_stats` for the drop and spill counts.
+        write_budget: Bytes each writer may hold in memory (default 1 MiB).
+    """
+    fanout = None if sinks is None else [_as_sink(sink) for sink in sinks]
+    formats = [format] if fanout is None else [s.format or format for s in fanout]
+    record_format = " ".join(f for f in formats if f != FORMAT_JSONL)
+    _remove_throttles()
+    _stop_async()
+    _remove_ring()
+    _install_stdout(flush, buffer_size, flush_interval, backpressure, write_budget)
+
+    _install_root_handler(level, format, color, fanout, backpressure, write_budget)
+    addLevelName(SUCCESS, "SUCCESS")
+    _install_logger_class()
+    _install_record_factory(lean, record_format)
+    _install_ring(ring_size, ring_sample, ring_dump, format)
+    if async_:
+        _start_async(queue_size, overflow)
+    _install_throttle(dedup_window, rate_limit, rate_burst)
+
+
+class TimingStats:
+    """Aggregated durations recorded under one :meth:`EzLogger.timed` name.
+
+    Besides count, total, min and max, durations are counted in a sparse
+    log-scale histogram with four buckets per doubling, so percentiles are
+    accurate to about 10% in constant memory.
+    """
+
+    __slots__ = ("name", "count", "total", "min", "max", "_buckets")
+
+    BUCKETS_PER_OCTAVE = 4
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self._buckets: Dict[int, int] = {}
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        bucket = (
+            math.floor(math.log2(seconds) * self.BUCKETS_PER_OCTAVE)
+            if seconds > 0
+            else -(2**31)
+        )
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+
+    def percentile(self, p: float) -> float:
+        """Return the approximate ``p``-th percentile (0–100) in seconds."""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                break
+        value = 2 ** ((bucket + 0.5) / self.BUCKETS_PER_OCTAVE)
+        return min(max(value, self.min), self.max)
+
+
+_timings: Dict[str, TimingStats] = {}
+_timings_lock = threading.Lock()
+
+
+def _record_timing(name: str, seconds: float) -> None:
+    with _timings_lock:
+        stats = _timings.get(name)
+        if stats is None:
+            if not _timings:
+                # unregister first so reset_timings() cannot stack reports
+                atexit.unregister(log_timing_report)
+                atexit.register(log_timing_report)
+            stats = _timings[name] = TimingStats(name)
+        stats.add(seconds)
+
+
+def timing_stats() -> Dict[str, TimingStats]:
+    """Return the statistics recorded by ``timed()`` so far, by name."""
+    with _timings_lock:
+        return dict(_timings)
+
+
+def timing_report() -> str:
+    """Return the ``timed()`` statistics as a text table."""
+    rows = [("name", "count", "total", "min", "p50", "p95", "max")]
+    for stats in timing_stats().values():
+        rows.append(
+            (
+                stats.name,
+                str(stats.count),
+                *(
+                    f"{seconds:.3f}s"
+                    for seconds in (
+                        stats.total,
+                        stats.min,
+                        stats.percentile(50),
+                        stats.percentile(95),
+                        stats.max,
+                    )
+                ),
+            )
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(
+            cell.ljust(width) if i == 0 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in rows
+    )
+
+
+def log_timing_report(log: Optional[Logger] = None, level: int = INFO) -> None:
+    """Log :func:`timing_report` if anything was timed.
+
+    Runs automatically at exit once the first duration has been recorded,
+    so the table ends up in the console and in Gooey's output panel.
+
+    Args:
+        log: Logger to use (default: the root logger).
+        level: Level of the report record (default ``INFO``).
+    """
+    if not _timings:
+        return
+    (log or getLogger()).log(level, "timing summary:\n%s", timing_report())
+
+
+def reset_timings() -> None:
+    """Forget all recorded ``timed()`` statistics."""
+    with _timings_lock:
+        _timings.clear()
+
+
+class _Timer:
+    """Context manager and decorator returned by :meth:`EzLogger.timed`."""
+
+    __slots__ = ("log", "name", "level", "start")
+
+    def __init__(self, log: Logger, name: str, level: int) -> None:
+        self.log = log
+        self.name = name
+        self.level = level
+        self.start: Optional[float] = None
+
+    def __enter__(self) -> "_Timer":
+        if self.log.isEnabledFor(self.level):
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.start is None:
+            return
+        elapsed = time.perf_counter() - self.start
+        _record_timing(self.name, elapsed)
+        self.log._log(self.level, "%s took %.3fs", (self.name, elapsed))
+
+    def __call__(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        log, name, level = self.log, self.name, self.level
+
+        @functools.wraps(func)
+        def timed_func(*args: Any, **kwargs: Any) -> Any:
+            with _Timer(log, name, level):
+                return func(*args, **kwargs)
+
+        return timed_func
+
+
+# Fields added to every record logged through an EzLogger in the current
+# thread or asyncio task. Each bind() stores a new merged dict, so logging
+# itself never merges anything, and an empty context costs one get().
+_context: ContextVar[Dict[str, Any]] = ContextVar("ezgooey_context", default={})
+
+
+def _bind(fields: Dict[str, Any]) -> "Token[Dict[str, Any]]":
+    for key in fields:
+        if key in _RECORD_ATTRS:
+            raise KeyError(f"Attempt to overwrite {key!r} in LogRecord")
+    return _context.set({**_context.get(), **fields})
+
+
+def bind(**fields: Any) -> "Token[Dict[str, Any]]":
+    """Add ``fields`` to every record logged in the current context.
+
+    The fields become record attributes, so they appear in JSONL output and
+    are visible to filters and formatters. Records logged while a field is
+    not bound lack the attribute, so do not name bound fields in ``%``-style
+    format strings. The context is a :class:`contextvars.ContextVar`: each
+    thread starts empty, and asyncio tasks inherit the fields bound when
+    they were created without seeing later changes made by other tasks.
+
+    Args:
+        **fields: Names and values to bind.
+
+    Returns:
+        A token that :func:`unbind` uses to restore the previous fields.
+
+    Raises:
+        KeyError: If a name is a standard :class:`LogRecord` attribute.
+    """
+    return _bind(fields)
+
+
+def unbind(token: "Token[Dict[str, Any]]") -> None:
+    """Restore the fields that were bound before :func:`bind` returned ``token``."""
+    _context.reset(token)
+
+
+@contextlib.contextmanager
+def context(**fields: Any) -> Iterator[Dict[str, Any]]:
+    """Bind ``fields`` (see :func:`bind`) for the duration of a ``with`` block.
+
+    Example::
+
+        for path in paths:
+            with logging.context(file=path):
+                process(path)  # every record carries record.file
+    """
+    token = _bind(fields)
+    try:
+        yield _context.get()
+    finally:
+        _context.reset(token)
+
+
+def current_context() -> Dict[str, Any]:
+    """Return the fields bound in the current context."""
+    return dict(_context.get())
+
+
+class EzLogger(Logger):
+    """Logger class with ezgooey's ``success``, ``progress`` and ``timed``.
+
+    :func:`init` registers it with :func:`setLoggerClass`, so every logger
+    created afterwards (including through plain :func:`logging.getLogger`)
+    has these methods; :func:`logger` upgrades loggers created earlier.
+    Each method starts with the same cached :meth:`isEnabledFor` check as
+    :meth:`Logger.info`, so disabled calls cost almost nothing.
+
+    Records also carry the fields bound with :meth:`bind` or
+    :meth:`context`; this replaces :class:`LoggerAdapter` wrappers, which
+    copy a dict on every call and hide the methods above.
+
+    ``__slots__`` is empty so that existing :class:`Logger` instances can
+    be switched to this class in place.
+    """
+
+    __slots__ = ()
+
+    progress_min_interval = PROGRESS_MIN_INTERVAL
+    progress_min_delta = PROGRESS_MIN_DELTA
+    _progress_pct = -1
+    _progress_time = float("-inf")
+
+    def success(self, msg: object, *args: Any, **kwargs: Any) -> None:
+        """Log ``msg % args`` at the ``SUCCESS`` level."""
+        if self.isEnabledFor(SUCCESS):
+            self._log(SUCCESS, msg, args, **kwargs)
+
+    def progress(self, i: int, total: int, msg: Optional[str] = None) -> None:
+        """Log a throttled ``progress: 42% (i/total)`` line at INFO.
+
+        A line is logged when the percentage has advanced by at least
+        ``progress_min_delta`` points and at least ``progress_min_interval``
+        seconds have passed since the previous line; the first call of a
+        loop and the final ``i == total`` call are always logged. Most
+        throttled calls cost one integer division and a comparison; the
+        clock is only read once the percentage has moved far enough.
+
+        Lines match :data:`PROGRESS_REGEX`, so Gooey's progress bar follows
+        them.
+        """
+        if not self.isEnabledFor(INFO):
+            return
+        pct = i * 100 // total if total else 100
+        last = self._progress_pct
+        if last <= pct < last + self.progress_min_delta and i < total:
+            return
+        now = time.monotonic()
+        if last <= pct < 100 and now - self._progress_time < self.progress_min_interval:
+            return
+        self._progress_pct, self._progress_time = pct, now
+        if msg is None:
+            self._log(INFO, "progress: %d%% (%d/%d)", (pct, i, total))
+        else:
+            self._log(INFO, "progress: %d%% (%d/%d) %s", (pct, i, total, msg))
+
+    def timed(self, name: str, level: int = INFO) -> _Timer:
+        """Time a block (``with log.timed("load"):``) or a function.
+
+        Used as a decorator (``@log.timed("load")``), every call of the
+        function is timed. Each duration is logged as ``"load took 0.123s"``
+        and added to the statistics for ``name``, which are logged as a
+        table at exit (see :func:`timing_report`). Nothing is measured or
+        recorded while ``level`` is disabled for this logger.
+
+        Args:
+            name: Label for the timed block.
+            level: Level of the duration records (default ``INFO``).
+        """
+        return _Timer(self, name, level)
+
+    def bind(self, **fields: Any) -> "Token[Dict[str, Any]]":
+        """Bind ``fields`` to the current context; see :func:`bind`."""
+        return _bind(fields)
+
+    def context(self, **fields: Any) -> ContextManager[Dict[str, Any]]:
+        """Bind ``fields`` for a ``with`` block; see :func:`context`."""
+        return context(**fields)
+
+    def makeRecord(
+        self,
+        name: str,
+        level: int,
+        fn: str,
+        lno: int,
+        msg: object,
+        args: Any,
+        exc_info: Any,
+        func: Optional[str] = None,
+        extra: Optional[Mapping[str, object]] = None,
+        sinfo: Optional[str] = None,
+    ) -> LogRecord:
+        fields = _context.get()
+        if fields:
+            extra = {**fields, **extra} if extra else fields
+        record = super().makeRecord(
+            name, level, fn, lno, msg, args, exc_info, func, extra, sinfo
+        )
+        # JsonFormatter's ``t``; unlike ``created`` it ignores clock steps.
+        record._monotonic = time.monotonic()
+        return record
 
 
-def logger(name: str = "app") -> "Logger":
-    """Return a named logger augmented with a ``success()`` method.
+def logger(name: str = "app") -> EzLogger:
+    """Return a named :class:`EzLogger`.
 
     The returned logger behaves like a standard :class:`logging.Logger` but
-    gains a ``success(message)`` method that logs at the custom ``SUCCESS``
-    level (25), displayed in green when :func:`init` has been called.
+    has a ``success(message)`` method that logs at the custom ``SUCCESS``
+    level (25), displayed in green when :func:`init` has been called, a
+    throttled ``progress(i, total, msg=None)`` method whose lines match
+    :data:`PROGRESS_REGEX`, so Gooey's progress bar follows them, and a
+    ``timed(name)`` context manager. A plain :class:`Logger` created before
+    :func:`init` is switched to :class:`EzLogger` in place.
 
     Args:
         name: Logger name (default ``"app"``).
 
     Returns:
-        A :class:`logging.Logger` instance with an extra ``success`` attribute.
+        An :class:`EzLogger` instance.
 
     Example::
 
@@ -131,8 +2383,11 @@ def logger(name: str = "app") -> "Logger":
         logging.init()
         log = logging.logger("my_app")
         log.info("starting…")
+        for i, item in enumerate(items, 1):
+            log.progress(i, len(items))
         log.success("all done")
     """
     log = getLogger(name)
-    setattr(log, "success", lambda message, *args: log._log(SUCCESS, message, args))
-    return log
+    if type(log) is Logger:
+        log.__class__ = EzLogger
+    return log  # type: ignore[return-value]
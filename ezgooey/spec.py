@@ -0,0 +1,504 @@
+#!/usr/bin/env python
+# this_file: ezgooey/spec.py
+"""
+ezgooey.spec
+------------
+
+Copyright (c) 2020 Adam Twardoch <adam+github@twardoch.com>
+MIT license. Python 3.8+
+
+Declarative parser specs.
+
+Instead of a ``get_parser()`` function with hundreds of ``add_argument``
+calls, describe the parser as data — a dict, or a JSON or TOML file — and
+let :func:`parser_from_spec` build it with ezgooey's ``ArgumentParser``
+(``GooeyParser`` in GUI mode, :class:`~ezgooey.ez.FlexArgumentParser` in
+CLI mode, which drops ``widget`` and ``gooey_options``).
+
+```toml
+prog = "appname"
+description = "app description"
+
+[[arguments]]
+flags = ["-v", "--verbose"]
+action = "count"
+default = 0
+
+[[groups]]
+title = "Files"
+gooey_options = { columns = 1 }
+
+[[groups.arguments]]
+flags = "--input"
+type = "file"
+widget = "FileChooser"
+
+[subcommands]
+dest = "cmd"
+
+[[subcommands.commands]]
+name = "run"
+help = "run it"
+arguments = [{ flags = "targets", nargs = "+" }]
+```
+
+```python
+from ezgooey.ez import ezgooey
+from ezgooey.spec import parser_from_spec
+
+@ezgooey(program_name='appname')
+def get_parser():
+    return parser_from_spec('appname.toml', cache=True)
+```
+
+A spec level (the top level, and every subcommand) holds the
+``ArgumentParser`` / ``add_parser`` keyword arguments plus these keys:
+
+* ``arguments``: list of argument tables. ``flags`` is the option string
+  or list of option strings; every other key is an ``add_argument``
+  keyword.
+* ``groups``: list of argument groups. ``arguments`` and ``exclusive``
+  are nested; other keys go to ``add_argument_group``.
+* ``exclusive``: list of mutually exclusive groups, each with
+  ``arguments``; other keys go to ``add_mutually_exclusive_group``.
+* ``subcommands``: ``add_subparsers`` keywords plus ``commands``, a list
+  of spec levels that also carry the subcommand ``name``.
+* ``defaults``: table passed to ``set_defaults``.
+
+``type`` may be ``"str"``, ``"int"``, ``"float"``, ``"complex"``,
+``"file"`` or ``"file:<mode>"`` (an :class:`argparse.FileType`), or a
+dotted ``"module.attr"`` / ``"module:attr"`` name; ``action`` and
+``formatter_class`` may also be dotted names. Dict specs may use Python
+objects directly.
+
+Compiling a spec (validating it and resolving names) happens once per
+spec hash and is memoized, so rebuilding a parser only replays the
+recorded calls. With ``cache=True`` the built parser is also stored in
+the parser cache of :mod:`ezgooey.cache`, keyed by the spec hash; a file
+spec that has not changed is then loaded without even being parsed.
+TOML specs need Python 3.11+ or the ``tomli`` package.
+"""
+
+__all__ = ["CompiledSpec", "compile_spec", "load_spec", "parser_from_spec", "spec_hash"]
+
+import argparse
+import copy
+import hashlib
+import importlib
+import json
+import os
+import sys
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+SpecSource = Union[str, "os.PathLike[str]", Mapping[str, Any]]
+
+# Keys of a spec level that describe structure; every other key is a
+# keyword argument of the parser (or group) being created.
+ARGUMENTS = "arguments"
+GROUPS = "groups"
+EXCLUSIVE = "exclusive"
+SUBCOMMANDS = "subcommands"
+COMMANDS = "commands"
+DEFAULTS = "defaults"
+FLAGS = "flags"
+NAME = "name"
+_LEVEL_KEYS = frozenset((ARGUMENTS, GROUPS, EXCLUSIVE, SUBCOMMANDS, DEFAULTS))
+
+_TYPES = {"str": str, "int": int, "float": float, "complex": complex}
+
+# Compiled specs by spec hash. Specs are few and long-lived, so entries
+# are never evicted.
+_compiled: Dict[str, "CompiledSpec"] = {}
+
+# A compiled op is one recorded container call:
+#   ("argument", flags, kwargs)
+#   ("group", kwargs, ops)
+#   ("exclusive", kwargs, ops)
+#   ("subparsers", kwargs, ((name, kwargs, ops), ...))
+#   ("defaults", kwargs)
+_Op = Tuple[Any, ...]
+
+
+class _Unstable(Exception):
+    """A dict spec holds a value that has no identity stable across runs."""
+
+
+def _stable_repr(value: Any) -> str:
+    """Return a run-independent JSON stand-in for a non-JSON spec value.
+
+    Functions and classes are named by ``module.qualname``; other objects
+    by their ``repr`` unless it contains a memory address.
+    """
+    qualname = getattr(value, "__qualname__", None)
+    if (
+        isinstance(qualname, str)
+        and getattr(value, "__module__", None)
+        and getattr(value, "__self__", None) is None
+    ):
+        if "<" in qualname:  # lambdas and local functions
+            raise _Unstable(qualname)
+        return f"{value.__module__}.{qualname}"
+    text = repr(value)
+    if " at 0x" in text:
+        raise _Unstable(text)
+    return text
+
+
+def _canonical(spec: Mapping[str, Any]) -> bytes:
+    return json.dumps(
+        spec,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_stable_repr,
+    ).encode("utf-8", "surrogateescape")
+
+
+def _read(
+    spec: SpecSource,
+) -> Tuple[Optional[str], Optional[Mapping[str, Any]], str]:
+    """Return the hash, the spec dict (``None`` for files) and a cache name.
+
+    The hash is ``None`` for dict specs holding values without a stable
+    identity (lambdas, local functions, objects whose ``repr`` is an
+    address).
+    """
+    if isinstance(spec, Mapping):
+        name = str(spec.get("prog") or "spec")
+        try:
+            canonical = _canonical(spec)
+        except _Unstable:
+            return None, spec, name
+        return hashlib.sha256(b"dict\0" + canonical).hexdigest(), spec, name
+    path = os.fspath(spec)
+    with open(path, "rb") as f:
+        data = f.read()
+    suffix = os.path.splitext(path)[1].lower()
+    digest = hashlib.sha256(suffix.encode() + b"\0" + data).hexdigest()
+    return digest, None, os.path.abspath(path)
+
+
+def spec_hash(spec: SpecSource) -> str:
+    """Return the SHA-256 hex digest identifying ``spec``.
+
+    Dicts are hashed in a canonical JSON form, so key order does not
+    matter; functions and classes in them count by ``module.qualname``.
+    Files are hashed by their bytes, without being parsed.
+
+    Raises:
+        ValueError: If a dict spec holds a value with no identity that is
+            stable across runs, such as a lambda or a local function.
+    """
+    key = _read(spec)[0]
+    if key is None:
+        raise ValueError("spec holds values without a stable identity")
+    return key
+
+
+def _load_toml(data: bytes) -> Dict[str, Any]:
+    try:
+        import tomllib  # type: ignore[import-not-found]
+    except ImportError:
+        try:
+            import tomli as tomllib  # type: ignore[import-not-found,no-redef]
+        except ImportError:
+            raise ImportError(
+                "TOML specs need Python 3.11+ or 'pip install tomli'"
+            ) from None
+    return tomllib.loads(data.decode("utf-8"))
+
+
+def load_spec(path: Union[str, "os.PathLike[str]"]) -> Dict[str, Any]:
+    """Read a JSON (``.json``) or TOML (``.toml``) spec file.
+
+    Raises:
+        ValueError: If the extension is unknown or the file does not hold
+            a table at the top level.
+        ImportError: For TOML on Python < 3.11 without ``tomli``.
+    """
+    path = os.fspath(path)
+    suffix = os.path.splitext(path)[1].lower()
+    with open(path, "rb") as f:
+        data = f.read()
+    if suffix == ".json":
+        spec = json.loads(data.decode("utf-8"))
+    elif suffix == ".toml":
+        spec = _load_toml(data)
+    else:
+        raise ValueError(f"{path}: unknown spec format {suffix!r} (use .json or .toml)")
+    if not isinstance(spec, dict):
+        raise ValueError(f"{path}: a spec must be a table at the top level")
+    return spec
+
+
+def _resolve_name(name: str, where: str) -> Any:
+    """Import ``module.attr`` or ``module:attr``."""
+    if ":" in name:
+        module_name, _, attr_path = name.partition(":")
+        attrs = attr_path.split(".")
+    else:
+        module_name, _, attr = name.rpartition(".")
+        attrs = [attr]
+    if not module_name:
+        raise ValueError(f"{where}: {name!r} is not a dotted name")
+    try:
+        obj: Any = importlib.import_module(module_name)
+        for attr in attrs:
+            obj = getattr(obj, attr)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"{where}: cannot resolve {name!r}: {e}") from None
+    return obj
+
+
+def _resolve_type(value: Any, where: str) -> Any:
+    if not isinstance(value, str):
+        return value
+    if value in _TYPES:
+        return _TYPES[value]
+    if value == "file" or value.startswith("file:"):
+        return argparse.FileType(value[5:] or "r")
+    return _resolve_name(value, where)
+
+
+def _items(level: Mapping[str, Any], key: str, where: str) -> List[Mapping[str, Any]]:
+    items = level.get(key, ())
+    if not isinstance(items, (list, tuple)) or not all(
+        isinstance(item, Mapping) for item in items
+    ):
+        raise ValueError(f"{where}.{key}: expected a list of tables")
+    return list(items)
+
+
+def _kwargs(level: Mapping[str, Any], skip: frozenset, where: str) -> Dict[str, Any]:
+    kwargs = {k: v for k, v in level.items() if k not in skip}
+    for key in ("formatter_class", "action"):
+        if isinstance(kwargs.get(key), str) and (
+            "." in kwargs[key] or ":" in kwargs[key]
+        ):
+            kwargs[key] = _resolve_name(kwargs[key], f"{where}.{key}")
+    return kwargs
+
+
+def _compile_argument(item: Mapping[str, Any], where: str) -> _Op:
+    flags = item.get(FLAGS)
+    if isinstance(flags, str):
+        flags = (flags,)
+    if not flags or not isinstance(flags, (list, tuple)):
+        raise ValueError(f"{where}: missing {FLAGS!r}")
+    kwargs = _kwargs(item, frozenset((FLAGS,)), where)
+    if "type" in kwargs:
+        kwargs["type"] = _resolve_type(kwargs["type"], f"{where}.type")
+    return ("argument", tuple(flags), kwargs)
+
+
+def _compile_arguments(level: Mapping[str, Any], where: str) -> List[_Op]:
+    return [
+        _compile_argument(item, f"{where}.{ARGUMENTS}[{i}]")
+        for i, item in enumerate(_items(level, ARGUMENTS, where))
+    ]
+
+
+def _compile_exclusive(level: Mapping[str, Any], where: str) -> List[_Op]:
+    ops = []
+    for i, item in enumerate(_items(level, EXCLUSIVE, where)):
+        here = f"{where}.{EXCLUSIVE}[{i}]"
+        kwargs = _kwargs(item, frozenset((ARGUMENTS,)), here)
+        ops.append(("exclusive", kwargs, tuple(_compile_arguments(item, here))))
+    return ops
+
+
+def _compile_level(level: Mapping[str, Any], where: str) -> Tuple[_Op, ...]:
+    """Compile the structural keys of one parser level into ops."""
+    ops = _compile_arguments(level, where)
+    for i, item in enumerate(_items(level, GROUPS, where)):
+        here = f"{where}.{GROUPS}[{i}]"
+        kwargs = _kwargs(item, frozenset((ARGUMENTS, EXCLUSIVE)), here)
+        group_ops = _compile_arguments(item, here) + _compile_exclusive(item, here)
+        ops.append(("group", kwargs, tuple(group_ops)))
+    ops.extend(_compile_exclusive(level, where))
+    if SUBCOMMANDS in level:
+        sub = level[SUBCOMMANDS]
+        here = f"{where}.{SUBCOMMANDS}"
+        if not isinstance(sub, Mapping):
+            raise ValueError(f"{here}: expected a table")
+        commands = []
+        for i, command in enumerate(_items(sub, COMMANDS, here)):
+            cmd_where = f"{here}.{COMMANDS}[{i}]"
+            if not isinstance(command.get(NAME), str):
+                raise ValueError(f"{cmd_where}: missing {NAME!r}")
+            kwargs = _kwargs(command, _LEVEL_KEYS | {NAME}, cmd_where)
+            commands.append(
+                (command[NAME], kwargs, _compile_level(command, cmd_where))
+            )
+        kwargs = _kwargs(sub, frozenset((COMMANDS,)), here)
+        ops.append(("subparsers", kwargs, tuple(commands)))
+    if DEFAULTS in level:
+        if not isinstance(level[DEFAULTS], Mapping):
+            raise ValueError(f"{where}.{DEFAULTS}: expected a table")
+        ops.append(("defaults", dict(level[DEFAULTS])))
+    return tuple(ops)
+
+
+def _fresh(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy mutable defaults so parsers built from one spec share no state."""
+    default = kwargs.get("default")
+    if isinstance(default, (list, dict)):
+        return dict(kwargs, default=copy.deepcopy(default))
+    return kwargs
+
+
+def _apply(container: Any, ops: Sequence[_Op]) -> None:
+    for op in ops:
+        kind = op[0]
+        if kind == "argument":
+            container.add_argument(*op[1], **_fresh(op[2]))
+        elif kind == "group":
+            _apply(container.add_argument_group(**op[1]), op[2])
+        elif kind == "exclusive":
+            _apply(container.add_mutually_exclusive_group(**op[1]), op[2])
+        elif kind == "subparsers":
+            subparsers = container.add_subparsers(**op[1])
+            for name, kwargs, sub_ops in op[2]:
+                _apply(subparsers.add_parser(name, **kwargs), sub_ops)
+        else:
+            container.set_defaults(**copy.deepcopy(op[1]))
+
+
+class CompiledSpec:
+    """A validated spec with all names resolved, ready to build parsers.
+
+    Attributes:
+        key: The spec hash (see :func:`spec_hash`), or ``None`` for a dict
+            spec that cannot be hashed.
+        parser_kwargs: Keyword arguments for the top-level parser.
+        ops: The recorded container calls.
+    """
+
+    __slots__ = ("key", "parser_kwargs", "ops")
+
+    def __init__(
+        self,
+        key: Optional[str],
+        parser_kwargs: Dict[str, Any],
+        ops: Tuple[_Op, ...],
+    ) -> None:
+        self.key = key
+        self.parser_kwargs = parser_kwargs
+        self.ops = ops
+
+    def build(self, parser_class: Optional[type] = None) -> argparse.ArgumentParser:
+        """Build a new parser.
+
+        Args:
+            parser_class: Parser class to instantiate (default ezgooey's
+                ``ArgumentParser`` for the current mode).
+
+        Returns:
+            A parser that no other call shares.
+        """
+        if parser_class is None:
+            from ezgooey import ez
+
+            parser_class = ez.ArgumentParser
+        parser = parser_class(**self.parser_kwargs)
+        _apply(parser, self.ops)
+        return parser
+
+
+def compile_spec(spec: SpecSource) -> CompiledSpec:
+    """Validate ``spec`` and resolve its names, memoized per spec hash.
+
+    Args:
+        spec: A spec dict, or the path of a ``.json`` or ``.toml`` file.
+
+    Returns:
+        The :class:`CompiledSpec`; equal specs return the same object.
+
+    Raises:
+        ValueError: If the spec is malformed or names a type, action or
+            formatter that cannot be imported. The message gives the
+            location, e.g. ``spec.groups[0].arguments[2]: missing 'flags'``.
+    """
+    key, data, _name = _read(spec)
+    compiled = None if key is None else _compiled.get(key)
+    if compiled is None:
+        if data is None:
+            data = load_spec(spec)  # type: ignore[arg-type]
+        kwargs = _kwargs(data, _LEVEL_KEYS, "spec")
+        compiled = CompiledSpec(key, kwargs, _compile_level(data, "spec"))
+        if key is not None:
+            _compiled[key] = compiled
+    return compiled
+
+
+def _disk_cache_path(key: str, name: str, parser_class: type) -> Tuple[str, str]:
+    """Return the parser cache path for a spec and its stale-entry prefix."""
+    from ezgooey import cache
+
+    digest = hashlib.sha256()
+    for part in (
+        key,
+        f"{parser_class.__module__}.{parser_class.__qualname__}",
+        cache._ezgooey_version(),
+        sys.version,
+    ):
+        digest.update(part.encode("utf-8", "surrogateescape") + b"\0")
+    label = cache._safe_name(os.path.basename(name))
+    # Entries with the same name (a spec file's path, a dict spec's prog or
+    # the caller's cache_name) replace each other.
+    name_hash = hashlib.sha256(name.encode("utf-8", "surrogateescape"))
+    prefix = f"spec.{label}.{name_hash.hexdigest()[:8]}."
+    path = os.path.join(cache.cache_dir(), f"{prefix}{digest.hexdigest()[:32]}.pickle")
+    return path, prefix
+
+
+def parser_from_spec(
+    spec: SpecSource,
+    parser_class: Optional[type] = None,
+    cache: bool = False,
+    cache_name: Optional[str] = None,
+) -> argparse.ArgumentParser:
+    """Build a parser from a declarative spec.
+
+    Args:
+        spec: A spec dict, or the path of a ``.json`` or ``.toml`` file.
+            See the module docstring for the format.
+        parser_class: Parser class to instantiate (default ezgooey's
+            ``ArgumentParser``: ``GooeyParser`` in GUI mode,
+            ``FlexArgumentParser`` in CLI mode).
+        cache: Also keep the built parser in the on-disk parser cache
+            (see :mod:`ezgooey.cache`); ignored when
+            ``EZGOOEY_NO_CACHE=1`` is set, and for dict specs holding
+            lambdas, local functions or other values without a stable
+            identity.
+        cache_name: Name under which the entry is cached; a new entry
+            replaces older ones of the same name. Defaults to the path of a
+            spec file, or a dict spec's ``prog``; give dict specs that share
+            a ``prog`` distinct names.
+
+    Returns:
+        A new parser.
+
+    Raises:
+        ValueError: If the spec is malformed (see :func:`compile_spec`).
+    """
+    if parser_class is None:
+        from ezgooey import ez
+
+        parser_class = ez.ArgumentParser
+    if not cache:
+        return compile_spec(spec).build(parser_class)
+
+    from ezgooey import cache as ez_cache
+
+    if os.environ.get(ez_cache.NO_CACHE_ENV) == "1":
+        return compile_spec(spec).build(parser_class)
+    key, _data, name = _read(spec)
+    if key is None:
+        return compile_spec(spec).build(parser_class)
+    if cache_name is not None:
+        name = f"name:{cache_name}"
+    path, prefix = _disk_cache_path(key, name, parser_class)
+    return ez_cache._load_or_build(  # type: ignore[no-any-return]
+        path, lambda: compile_spec(spec).build(parser_class), prefix
+    )
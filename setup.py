@@ -67,7 +67,7 @@ setup(
     long_description_content_type="text/markdown",
     python_requires=">=3.8",
     install_requires=get_requirements("requirements.txt"),
-    extras_require={"dev": ["twine>=3.2.0"]},
+    extras_require={"dev": ["twine>=3.2.0"], "colors": ["colored>=1.4.2"]},
     packages=find_packages(),
     classifiers=[
         "Development Status :: 4 - Beta",
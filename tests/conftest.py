@@ -48,4 +48,23 @@ def clean_logging():
     
     # Cleanup after test
     for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
\ No newline at end of file
+        root_logger.removeHandler(handler)
+
+
+@pytest.fixture
+def app_dir(request, tmp_path, monkeypatch):
+    """Give a test case a private directory holding its app sources.
+
+    Sets ``tmp`` and ``cache`` on the test case, points
+    ``EZGOOEY_CACHE_DIR`` at ``cache``, puts ``tmp`` on ``sys.path`` and
+    writes the class's ``FILES`` (file name to source text) into ``tmp``.
+    Use it with ``@pytest.mark.usefixtures('app_dir')``.
+    """
+    case = request.instance
+    case.tmp = str(tmp_path)
+    case.cache = str(tmp_path / 'cache')
+    monkeypatch.setenv('EZGOOEY_CACHE_DIR', case.cache)
+    monkeypatch.delenv('EZGOOEY_NO_CACHE', raising=False)
+    monkeypatch.syspath_prepend(case.tmp)
+    for name, text in getattr(case, 'FILES', {}).items():
+        (tmp_path / name).write_text(text, encoding='utf-8')
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# this_file: tests/test_batch.py
+"""Tests for ezgooey.batch module."""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ezgooey.batch import read_items, run_batch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TOOL = '''
+import time
+from ezgooey.ez import ArgumentParser, ezgooey
+
+builds = []
+
+
+@ezgooey(program_name='tool')
+def get_parser():
+    builds.append(1)
+    parser = ArgumentParser(prog='tool')
+    parser.add_argument('name')
+    parser.add_argument('--lines', type=int, default=1)
+    parser.add_argument('--delay', type=float, default=0)
+    parser.add_argument('--status', type=int)
+    parser.add_argument('--fail', action='store_true')
+    return parser
+
+
+def main(args):
+    time.sleep(args.delay)
+    for i in range(args.lines):
+        print(f'{args.name} {i}')
+        time.sleep(0.001)
+    if args.fail:
+        raise RuntimeError('boom')
+    return args.status
+'''
+
+
+@pytest.mark.usefixtures('app_dir')
+class _ToolTestCase(unittest.TestCase):
+    FILES = {'batch_tool.py': TOOL}
+
+    def setUp(self):
+        self.addCleanup(sys.modules.pop, 'batch_tool', None)
+        import batch_tool
+        self.tool = batch_tool
+
+    def _run(self, items, **kwargs):
+        out, err = io.StringIO(), io.StringIO()
+        with patch('sys.stdout', out), patch('sys.stderr', err):
+            results = run_batch(
+                self.tool.main, items, builder=self.tool.get_parser, **kwargs
+            )
+        return results, out.getvalue(), err.getvalue()
+
+
+class TestReadItems(unittest.TestCase):
+    """Test the item file formats."""
+
+    def test_jsonl(self):
+        """Test lists, command lines and objects."""
+        stream = io.StringIO(
+            '["a", "--n", "1"]\n'
+            '\n'
+            '"b --n \'2 3\'"\n'
+            '{"args": "c d", "out_dir": "x", "verbose": true, "quiet": false,'
+            ' "tag": ["t1", "t2"], "-q": null}\n'
+        )
+        self.assertEqual(list(read_items(stream, 'jsonl')), [
+            ['a', '--n', '1'],
+            ['b', '--n', '2 3'],
+            ['--out-dir', 'x', '--verbose', '--tag', 't1', '--tag', 't2', 'c', 'd'],
+        ])
+        with self.assertRaises(ValueError):
+            list(read_items(io.StringIO('3\n'), 'jsonl'))
+
+    def test_csv_and_args(self):
+        """Test CSV rows and argfiles, picked by extension."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'items.csv')
+            with open(path, 'w') as f:
+                f.write('args,count,-v\nx y,1,\nz,,1\n')
+            self.assertEqual(list(read_items(path)), [
+                ['--count', '1', 'x', 'y'], ['-v', '1', 'z'],
+            ])
+            path = os.path.join(tmp, 'items.txt')
+            with open(path, 'w') as f:
+                f.write('# comment\na --n 1\n\n"b c"\n')
+            self.assertEqual(list(read_items(path)), [['a', '--n', '1'], ['b c']])
+        with self.assertRaises(ValueError):
+            read_items(io.StringIO(''), 'yaml')
+
+
+class TestRunBatch(_ToolTestCase):
+    """Test running items serially and in pools."""
+
+    ITEMS = [
+        ['a', '--lines', '3', '--delay', '0.05'],
+        ['b', '--lines', '2', '--status', '3'],
+        ['c', '--fail'],
+        ['x', '--bogus'],
+    ]
+
+    def assertStatuses(self, results):
+        self.assertEqual([r.index for r in results], [0, 1, 2, 3])
+        self.assertEqual([r.status for r in results], [0, 3, 1, 2])
+        self.assertIn('RuntimeError: boom', results[2].stderr or '')
+
+    def test_serial(self):
+        """Test that the parser is built once and output streams through."""
+        results, out, err = self._run(self.ITEMS)
+        self.assertEqual(len(self.tool.builds), 1)
+        self.assertEqual(out, 'a 0\na 1\na 2\nb 0\nb 1\nc 0\n')
+        self.assertIn('RuntimeError: boom', err)
+        self.assertIn('error: unrecognized arguments: --bogus', err)
+        self.assertEqual([r.status for r in results], [0, 3, 1, 2])
+        self.assertEqual(results[0].stdout, '')
+
+    def test_threads_ordered(self):
+        """Test that thread pools keep each item's output together and in order."""
+        results, out, err = self._run(self.ITEMS, jobs=4)
+        self.assertEqual(len(self.tool.builds), 1)
+        self.assertEqual(out, 'a 0\na 1\na 2\nb 0\nb 1\nc 0\n')
+        self.assertStatuses(results)
+        self.assertEqual(results[1].stdout, 'b 0\nb 1\n')
+        self.assertLess(err.index('RuntimeError'), err.index('--bogus'))
+
+    def test_threads_unordered(self):
+        """Test that unordered output follows completion order."""
+        seen = []
+        results, out, _err = self._run(
+            self.ITEMS[:2], jobs=2, ordered=False, on_result=seen.append
+        )
+        self.assertEqual(out, 'b 0\nb 1\na 0\na 1\na 2\n')
+        self.assertEqual([r.index for r in seen], [1, 0])
+        self.assertEqual([r.index for r in results], [0, 1])
+
+    def test_ordered_window(self):
+        """Test that a slow item holds back only a few submissions."""
+        events = []
+
+        def main(argv):
+            events.append(('start', int(argv[0])))
+            if argv[0] == '0':
+                time.sleep(0.3)
+            events.append(('end', int(argv[0])))
+
+        with patch('sys.stdout', io.StringIO()):
+            results = run_batch(main, [[str(i)] for i in range(40)], jobs=2)
+        self.assertEqual([r.index for r in results], list(range(40)))
+        before = events[:events.index(('end', 0))]
+        self.assertLessEqual(max(i for kind, i in before if kind == 'start'), 3)
+
+    def test_output_outside_items(self):
+        """Test that other threads still write to the real stdout."""
+        out = io.StringIO()
+        with patch('sys.stdout', out), patch('sys.stderr', io.StringIO()):
+            def main(argv):
+                thread = threading.Thread(target=print, args=('outside',))
+                thread.start()
+                thread.join()
+                print('inside', *argv)
+
+            results = run_batch(main, [['x']], jobs=2)
+        self.assertEqual(results[0].stdout, 'inside x\n')
+        self.assertEqual(out.getvalue(), 'outside\ninside x\n')
+
+    def test_processes(self):
+        """Test a process pool with per-worker parsers."""
+        results, out, _err = self._run(self.ITEMS, jobs=2, executor='process')
+        self.assertEqual(out, 'a 0\na 1\na 2\nb 0\nb 1\nc 0\n')
+        self.assertStatuses(results)
+        self.assertEqual(self.tool.builds, [])
+
+    def test_processes_spawn(self):
+        """Test that spawned workers load script targets themselves."""
+        items = os.path.join(self.tmp, 'items.jsonl')
+        with open(items, 'w') as f:
+            f.write('["a"]\n["b", "--status", "3"]\n')
+        code = (
+            'import multiprocessing, sys\n'
+            'from ezgooey import batch\n'
+            'multiprocessing.set_start_method("spawn")\n'
+            'batch.main(sys.argv[1:])\n'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code, 'batch_tool.py:main',
+             '--parser', 'batch_tool.py:get_parser', items, '-j', '2',
+             '--executor', 'process'],
+            capture_output=True, text=True, cwd=self.tmp,
+            env=dict(os.environ, PYTHONPATH=ROOT),
+        )
+        self.assertEqual(result.returncode, 1, result.stderr)
+        self.assertEqual(result.stdout, 'a 0\nb 0\n')
+        self.assertIn('1 of 2 items failed', result.stderr)
+
+    def test_bool_status(self):
+        """Test that True and False map to exit statuses 1 and 0."""
+        def main(argv):
+            if argv == ['exit']:
+                sys.exit(True)
+            return argv == ['true']
+
+        results = run_batch(main, [['true'], ['false'], ['exit']])
+        self.assertEqual([r.status for r in results], [1, 0, 1])
+        self.assertIs(type(results[0].status), int)
+
+    def test_invalid_executor(self):
+        """Test that unknown executors are rejected."""
+        with self.assertRaises(ValueError):
+            run_batch(print, [], executor='fiber')
+
+    def test_cli(self):
+        """Test the ezgooey-batch entry point, exit status and results file."""
+        items = os.path.join(self.tmp, 'items.jsonl')
+        with open(items, 'w') as f:
+            f.write('["a"]\n{"args": "b", "status": 4}\n')
+        status_file = os.path.join(self.tmp, 'status.jsonl')
+        result = subprocess.run(
+            [sys.executable, '-m', 'ezgooey.batch', 'batch_tool:main',
+             '--parser', 'batch_tool:get_parser', items, '-j', '2',
+             '--results', status_file],
+            capture_output=True, text=True, cwd=self.tmp,
+            env=dict(os.environ, PYTHONPATH=ROOT),
+        )
+        self.assertEqual(result.returncode, 1, result.stderr)
+        self.assertEqual(result.stdout, 'a 0\nb 0\n')
+        self.assertIn('1 of 2 items failed', result.stderr)
+        with open(status_file) as f:
+            statuses = [json.loads(line) for line in f]
+        self.assertEqual(
+            [(s['index'], s['status']) for s in statuses], [(0, 0), (1, 4)]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# this_file: tests/test_cache.py
+"""Tests for ezgooey.cache module."""
+
+import argparse
+import importlib
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ezgooey.cache as ez_cache
+from ezgooey.ez import FlexArgumentParser
+
+BUILDER_MODULE = '''
+import argparse
+from ezgooey.ez import FlexArgumentParser
+
+calls = []
+
+
+def handler(args):
+    return 'handled'
+
+
+def get_parser():
+    calls.append(1)
+    parser = FlexArgumentParser(prog='app', description='{description}')
+    parser._optionals.title = 'Options'
+    parser.add_argument('--count', type=int, default=3, widget='IntegerField')
+    parser.add_argument('--mode', choices=['fast', 'slow'], default='fast')
+    parser.add_argument('--flag', action=argparse.BooleanOptionalAction)
+    parser.add_argument('--tag', action='append', default=[])
+    parser.add_argument('-v', action='count', default=0)
+    parser.add_argument('--version', action='version', version='1.0')
+    group = parser.add_argument_group('Files', 'Input and output')
+    group.add_argument('--input', type=argparse.FileType('r'))
+    mutex = group.add_mutually_exclusive_group()
+    mutex.add_argument('--json', action='store_true')
+    mutex.add_argument('--csv', action='store_true')
+    sub = parser.add_subparsers(dest='cmd', title='commands')
+    run = sub.add_parser('run', aliases=['r'], help='run it')
+    run.add_argument('targets', nargs='+')
+    run.set_defaults(func=handler)
+    sub.add_parser('stop')
+    return parser
+'''
+
+
+@pytest.mark.usefixtures('app_dir')
+class _CacheDirTestCase(unittest.TestCase):
+    def _module(self, description='demo', name='cache_builder'):
+        path = os.path.join(self.tmp, name + '.py')
+        with open(path, 'w') as f:
+            f.write(BUILDER_MODULE.format(description=description))
+        # make sure an edit within the same second still changes the mtime
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + len(description)))
+        sys.modules.pop(name, None)
+        self.addCleanup(sys.modules.pop, name, None)
+        importlib.invalidate_caches()
+        return importlib.import_module(name)
+
+    def _entries(self):
+        return sorted(os.listdir(self.cache)) if os.path.isdir(self.cache) else []
+
+
+class TestRoundTrip(_CacheDirTestCase):
+    """Test that a loaded parser behaves like the one that was saved."""
+
+    def test_save_and_load(self):
+        """Test help output and parsing of a reloaded parser."""
+        module = self._module()
+        original = module.get_parser()
+        path = os.path.join(self.cache, 'p.pickle')
+        self.assertTrue(ez_cache.save_parser(original, path))
+        loaded = ez_cache.load_parser(path)
+        self.assertIsInstance(loaded, FlexArgumentParser)
+        self.assertEqual(loaded.format_help(), original.format_help())
+        for argv in (
+            [],
+            ['--count', '5', '--no-flag', '--tag', 'a', '--tag', 'b', '-vv', '--json'],
+            ['r', 'x', 'y'],
+        ):
+            with self.subTest(argv=argv):
+                self.assertEqual(
+                    vars(loaded.parse_args(argv)), vars(original.parse_args(argv))
+                )
+        self.assertEqual(loaded.parse_args(['run', 'x']).func(None), 'handled')
+        loaded.add_argument('--extra', widget='TextField')
+        with self.assertRaises(SystemExit), patch('sys.stderr'):
+            loaded.parse_args(['--json', '--csv'])
+
+    def test_unpicklable_parser(self):
+        """Test that parsers with lambdas are reported as not saved."""
+        parser = argparse.ArgumentParser()
+        parser.add_argument('--x', type=lambda s: s.upper())
+        path = os.path.join(self.cache, 'p.pickle')
+        self.assertFalse(ez_cache.save_parser(parser, path))
+        self.assertFalse(os.path.exists(path))
+
+
+class TestCachedParser(_CacheDirTestCase):
+    """Test cases for the cached_parser decorator."""
+
+    def test_second_call_skips_builder(self):
+        """Test that the builder runs once and the cache serves later calls."""
+        module = self._module()
+        cached = ez_cache.cached_parser(module.get_parser)
+        first = cached()
+        second = cached()
+        self.assertEqual(len(module.calls), 1)
+        self.assertIsNot(first, second)
+        self.assertEqual(first.format_help(), second.format_help())
+        self.assertEqual(len(self._entries()), 1)
+        self.assertEqual(cached.__name__, 'get_parser')
+
+    def test_edit_invalidates(self):
+        """Test that a changed builder gets a new entry and the old one goes."""
+        module = self._module('one')
+        ez_cache.cached_parser(module.get_parser)()
+        old = self._entries()
+        module = self._module('two, edited')
+        parser = ez_cache.cached_parser(module.get_parser)()
+        self.assertEqual(len(module.calls), 1)
+        self.assertIn('two, edited', parser.format_help())
+        self.assertEqual(len(self._entries()), 1)
+        self.assertNotEqual(self._entries(), old)
+
+    def test_nested_builder_kept(self):
+        """Test that saving a builder keeps the entry of a builder nested in it."""
+        with open(os.path.join(self.tmp, 'nested_builder.py'), 'w') as f:
+            f.write(
+                'import argparse\n'
+                'def get_parser():\n'
+                '    def sub():\n'
+                '        return argparse.ArgumentParser(prog="sub")\n'
+                '    get_parser.sub = sub\n'
+                '    return argparse.ArgumentParser(prog="top")\n'
+            )
+        self.addCleanup(sys.modules.pop, 'nested_builder', None)
+        module = importlib.import_module('nested_builder')
+        module.get_parser()
+        ez_cache.cached_parser(module.get_parser.sub)()
+        ez_cache.cached_parser(module.get_parser)()
+        self.assertEqual(len(self._entries()), 2)
+
+    def test_corrupt_entry_falls_back(self):
+        """Test that an unreadable entry is replaced by a fresh build."""
+        module = self._module()
+        cached = ez_cache.cached_parser(module.get_parser)
+        cached()
+        path = os.path.join(self.cache, self._entries()[0])
+        with open(path, 'wb') as f:
+            f.write(b'not a pickle')
+        parser = cached()
+        self.assertEqual(len(module.calls), 2)
+        self.assertIsInstance(parser, argparse.ArgumentParser)
+        cached()
+        self.assertEqual(len(module.calls), 2)
+
+    def test_bypass(self):
+        """Test that arguments, non-parsers and EZGOOEY_NO_CACHE bypass the cache."""
+        module = self._module()
+        cached = ez_cache.cached_parser(module.get_parser)
+        with patch.dict(os.environ, {'EZGOOEY_NO_CACHE': '1'}):
+            cached()
+            cached()
+        self.assertEqual(len(module.calls), 2)
+        self.assertEqual(self._entries(), [])
+
+        def main():
+            return 42
+
+        main_cached = ez_cache.cached_parser(main)
+        self.assertEqual(main_cached(), 42)
+        self.assertEqual(self._entries(), [])
+
+        def build(prog):
+            return argparse.ArgumentParser(prog=prog)
+
+        self.assertEqual(ez_cache.cached_parser(build)('x').prog, 'x')
+        self.assertEqual(self._entries(), [])
+
+    def test_ezgooey_cache_option(self):
+        """Test that @ezgooey(cache=True) caches in CLI mode."""
+        from ezgooey import ez
+        if ez.MODE != ez.CLI:
+            self.skipTest('GUI mode')
+        module = self._module()
+        cached = ez.ezgooey(program_name='app', cache=True)(module.get_parser)
+        cached()
+        cached()
+        self.assertEqual(len(module.calls), 1)
+        self.assertIs(ez.ezgooey(module.get_parser), module.get_parser)
+
+    def test_cache_dir(self):
+        """Test the platform default location."""
+        with patch.dict(os.environ, {'XDG_CACHE_HOME': '/xdg'}):
+            os.environ.pop('EZGOOEY_CACHE_DIR')
+            with patch('ezgooey.cache.os.name', 'posix'), \
+                    patch('ezgooey.cache.sys.platform', 'linux'):
+                self.assertEqual(ez_cache.cache_dir(), os.path.join('/xdg', 'ezgooey'))
+
+
+class TestHelpCache(_CacheDirTestCase):
+    """Test cached help and usage rendering of large FlexArgumentParsers."""
+
+    def _parser(self, n=30, prog='big'):
+        parser = FlexArgumentParser(prog=prog, description='many options')
+        parser.help_cache_min_actions = 10
+        for i in range(n):
+            parser.add_argument(f'--opt{i}', help=f'option number {i} ' * 5)
+        return parser
+
+    def _help_entries(self):
+        directory = os.path.join(self.cache, 'help')
+        return sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+
+    def _count_renders(self):
+        render = patch.object(
+            argparse.HelpFormatter, 'format_help',
+            autospec=True, side_effect=argparse.HelpFormatter.format_help,
+        )
+        mock = render.start()
+        self.addCleanup(render.stop)
+        return mock
+
+    def test_help_rendered_once(self):
+        """Test that help and usage match stock output and render once."""
+        expected_help = argparse.ArgumentParser.format_help(self._parser())
+        expected_usage = argparse.ArgumentParser.format_usage(self._parser())
+        renders = self._count_renders()
+        self.assertEqual(self._parser().format_help(), expected_help)
+        self.assertEqual(self._parser().format_help(), expected_help)
+        self.assertEqual(self._parser().format_usage(), expected_usage)
+        self.assertEqual(self._parser().format_usage(), expected_usage)
+        self.assertEqual(renders.call_count, 2)
+        self.assertEqual(len(self._help_entries()), 2)
+
+    def test_usage_error(self):
+        """Test that usage errors print the cached usage."""
+        self._parser().format_usage()
+        with self.assertRaises(SystemExit), patch('sys.stderr') as stderr:
+            self._parser().parse_args(['--nope'])
+        written = ''.join(call.args[0] for call in stderr.write.call_args_list)
+        self.assertTrue(written.startswith(self._parser().format_usage()))
+
+    def test_invalidation(self):
+        """Test that definition and width changes render afresh."""
+        self._parser().format_help()
+        old = self._help_entries()
+        changed = self._parser()
+        changed.add_argument('--new', help='new option')
+        self.assertIn('--new', changed.format_help())
+        self.assertEqual(len(self._help_entries()), 1)
+        self.assertNotEqual(self._help_entries(), old)
+        self.assertIn('new option', changed.format_help())
+        with patch.dict(os.environ, {'COLUMNS': '40'}):
+            narrow = changed.format_help()
+        self.assertNotEqual(narrow, changed.format_help())
+        self.assertEqual(len(self._help_entries()), 2)
+
+    def test_same_prog_builders(self):
+        """Test that different builders sharing a prog keep their entries."""
+        def other_builder():
+            parser = FlexArgumentParser(prog='big')
+            parser.help_cache_min_actions = 10
+            for i in range(20):
+                parser.add_argument(f'--other{i}')
+            return parser
+
+        renders = self._count_renders()
+        for _ in range(3):
+            self._parser().format_help()
+            other_builder().format_help()
+        self.assertEqual(renders.call_count, 2)
+        self.assertEqual(len(self._help_entries()), 2)
+
+    def test_bypass(self):
+        """Test small parsers, a disabled threshold and EZGOOEY_NO_CACHE."""
+        self._parser(n=5).format_help()
+        parser = self._parser()
+        parser.help_cache_min_actions = None
+        parser.format_help()
+        with patch.dict(os.environ, {'EZGOOEY_NO_CACHE': '1'}):
+            self._parser().format_help()
+        self.assertEqual(self._help_entries(), [])
+
+    def test_fingerprint(self):
+        """Test that the fingerprint tracks definitions, not identity."""
+        fingerprint = ez_cache.parser_fingerprint
+        self.assertEqual(fingerprint(self._parser()), fingerprint(self._parser()))
+        self.assertNotEqual(
+            fingerprint(self._parser()), fingerprint(self._parser(prog='other'))
+        )
+        parser = self._parser()
+        parser._actions[-1].help = 'edited'
+        self.assertNotEqual(fingerprint(parser), fingerprint(self._parser()))
+
+
+if __name__ == '__main__':
+    unittest.main()
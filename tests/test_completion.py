@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# this_file: tests/test_completion.py
+"""Tests for ezgooey.completion module."""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ezgooey.completion import completion_script, resolve_parser
+from ezgooey.ez import FlexArgumentParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APP = '''
+import argparse
+from ezgooey.ez import ArgumentParser, ezgooey
+
+
+@ezgooey(program_name='app')
+def get_parser():
+    parser = ArgumentParser(prog='app', description='demo')
+    parser.add_argument('-v', '--verbose', action='count', help='more output')
+    parser.add_argument('--mode', choices=['fast', 'slow'], help='speed')
+    parser.add_argument('--input', widget='FileChooser', help='input file')
+    parser.add_argument('--outdir', widget='DirChooser')
+    parser.add_argument('--log', type=argparse.FileType('w'))
+    parser.add_argument('--secret', help=argparse.SUPPRESS)
+    sub = parser.add_subparsers(dest='cmd')
+    run = sub.add_parser('run', aliases=['r'], help='run it')
+    run.add_argument('targets', nargs='+', widget='MultiFileChooser')
+    run.add_argument('--level', choices=['1', '2'])
+    stop = sub.add_parser('stop', help='stop it')
+    stop.add_argument('what', choices=['all', 'one'])
+    return parser
+
+
+if __name__ == '__main__':
+    raise SystemExit('the app must not run')
+'''
+
+
+@pytest.mark.usefixtures('app_dir')
+class _AppTestCase(unittest.TestCase):
+    FILES = {'app.py': APP}
+
+    def setUp(self):
+        self.app = os.path.join(self.tmp, 'app.py')
+
+    def _generate(self, shell):
+        result = subprocess.run(
+            [sys.executable, '-m', 'ezgooey.completion', f'{self.app}:get_parser',
+             '--shell', shell],
+            capture_output=True, text=True, cwd=ROOT,
+            env=dict(os.environ, PYTHONPATH=ROOT),
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout
+
+
+class TestCompletionScript(_AppTestCase):
+    """Test the generated scripts."""
+
+    def test_widget_recorded(self):
+        """Test that FlexArgumentParser keeps the widget on the action."""
+        parser = FlexArgumentParser()
+        action = parser.add_argument('--input', widget='FileChooser')
+        self.assertEqual(action.widget, 'FileChooser')
+        self.assertFalse(hasattr(parser.add_argument('--x'), 'widget'))
+
+    def test_bash(self):
+        """Test subcommands, choices and file hints in the bash script."""
+        script = self._generate('bash')
+        self.assertIn('0:run|0:r) node=1 ;;', script)
+        self.assertIn("0:--mode) COMPREPLY=($(compgen -W 'fast slow'", script)
+        self.assertIn('0:--input) COMPREPLY=($(compgen -f', script)
+        self.assertIn('0:--log) COMPREPLY=($(compgen -f', script)
+        self.assertIn('0:--outdir) COMPREPLY=($(compgen -d', script)
+        self.assertIn("2) COMPREPLY=($(compgen -W 'all one'", script)
+        self.assertIn('complete -o default -F _ezgooey_app app', script)
+        self.assertNotIn('--secret', script)
+
+    def test_zsh_and_fish(self):
+        """Test that zsh and fish scripts carry descriptions and hints."""
+        zsh = self._generate('zsh')
+        self.assertTrue(zsh.startswith('#compdef app\n'))
+        self.assertIn("'run:run it' 'r:run it' 'stop:stop it'", zsh)
+        self.assertIn('0:--outdir) _files -/; return ;;', zsh)
+        self.assertIn('compdef _ezgooey_app app', zsh)
+        fish = self._generate('fish')
+        self.assertIn(
+            "complete -c app -n '_ezgooey_app_node 0' -l mode -xa 'fast slow'", fish
+        )
+        self.assertIn("-l input -rF -d 'input file'", fish)
+        self.assertIn("complete -c app -n '_ezgooey_app_node 1' -F", fish)
+        self.assertIn("-a r -d 'run it'", fish)
+
+    def test_errors(self):
+        """Test unknown shells and bad targets."""
+        with self.assertRaises(ValueError):
+            completion_script(argparse.ArgumentParser(), 'tcsh')
+        with self.assertRaises(ValueError):
+            resolve_parser('no_colon')
+        with patch.dict(os.environ), patch('sys.path', list(sys.path)):
+            with self.assertRaises(ValueError):
+                resolve_parser('os.path:sep')
+
+    @unittest.skipUnless(shutil.which('bash'), 'bash not installed')
+    def test_bash_completes(self):
+        """Test the bash script in a real bash."""
+        path = os.path.join(self.tmp, 'app.bash')
+        with open(path, 'w') as f:
+            f.write(self._generate('bash'))
+        os.mkdir(os.path.join(self.tmp, 'adir'))
+
+        def complete(*words):
+            result = subprocess.run(
+                ['bash', '-c', 'source "$0"; COMP_WORDS=("$@"); '
+                 'COMP_CWORD=$((${#COMP_WORDS[@]} - 1)); _ezgooey_app; '
+                 'echo "${COMPREPLY[*]}"', path, *words],
+                capture_output=True, text=True, cwd=self.tmp,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            return result.stdout.split()
+
+        self.assertEqual(complete('app', ''), ['run', 'r', 'stop'])
+        self.assertEqual(complete('app', '--m'), ['--mode'])
+        self.assertEqual(complete('app', '--mode', ''), ['fast', 'slow'])
+        self.assertEqual(complete('app', '--mode', 'fast', 'r', '--le'), ['--level'])
+        self.assertEqual(complete('app', 'stop', ''), ['all', 'one'])
+        self.assertEqual(complete('app', '--outdir', ''), ['adir'])
+        self.assertEqual(sorted(complete('app', 'run', 'app.')), ['app.bash', 'app.py'])
+
+
+if __name__ == '__main__':
+    unittest.main()
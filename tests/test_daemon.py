@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# this_file: tests/test_daemon.py
+"""Tests for ezgooey.daemon module."""
+
+import os
+import subprocess
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ezgooey import daemon
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TOOL = '''
+import atexit
+import os
+import sys
+from ezgooey import logging as ez_logging
+from ezgooey.ez import ArgumentParser, ezgooey
+
+calls = []
+
+
+@ezgooey(program_name='tool')
+def get_parser():
+    parser = ArgumentParser(prog='tool')
+    parser.add_argument('name')
+    parser.add_argument('--status', type=int)
+    parser.add_argument('--echo', action='store_true')
+    parser.add_argument('--log')
+    return parser
+
+
+def main(args):
+    calls.append(args.name)
+    if args.log:
+        ez_logging.init(sinks=[ez_logging.FileSink(args.log, format='%(message)s')])
+        ez_logging.logger('tool').info('logged %s', args.name)
+        atexit.register(print, 'at exit', file=sys.stderr)
+    if args.echo:
+        sys.stdout.write(sys.stdin.read().upper())
+    print(VERSION, args.name, len(calls), os.getcwd(), os.environ.get('TOOL_VAR'))
+    print('to stderr', file=sys.stderr)
+    return args.status
+
+
+VERSION = 'v1'
+'''
+
+
+@unittest.skipUnless(hasattr(os, 'fork'), 'needs fork and Unix sockets')
+@pytest.mark.usefixtures('app_dir')
+class TestDaemon(unittest.TestCase):
+    """Test the server and client through real processes."""
+
+    FILES = {'daemon_tool.py': TOOL}
+
+    def setUp(self):
+        self.tool = os.path.join(self.tmp, 'daemon_tool.py')
+        self.socket = os.path.join(self.tmp, 's.sock')
+        self.env = dict(os.environ, PYTHONPATH=ROOT, TOOL_VAR='one')
+        self.addCleanup(self._stop)
+
+    def _stop(self):
+        daemon.stop(self.socket)
+        self._wait_for(lambda: not os.path.exists(self.socket))
+
+    def _wait_for(self, condition, timeout=10):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail('timed out')
+            time.sleep(0.02)
+
+    def _cli(self, *args, cwd=None, env=None, input=None):
+        return subprocess.run(
+            [sys.executable, '-m', 'ezgooey.daemon', *args],
+            capture_output=True, text=True, input=input,
+            cwd=cwd or self.tmp, env=env or self.env,
+        )
+
+    def _run(self, *args, **kwargs):
+        return self._cli(
+            'run', 'daemon_tool:main', '--parser', 'daemon_tool:get_parser',
+            '--socket', self.socket, '--', *args, **kwargs
+        )
+
+    def test_run(self):
+        """Test start-up, stdio, cwd, env, status and per-request isolation."""
+        first = self._run('a', '--status', '3')
+        self.assertEqual(first.returncode, 3, first.stderr)
+        self.assertEqual(first.stdout, f'v1 a 1 {self.tmp} one\n')
+        self.assertEqual(first.stderr, 'to stderr\n')
+        self.assertTrue(os.path.exists(self.socket))
+
+        subdir = os.path.join(self.tmp, 'sub')
+        os.mkdir(subdir)
+        second = self._run(
+            'b', '--echo', cwd=subdir, env=dict(self.env, TOOL_VAR='two'),
+            input='piped\n',
+        )
+        self.assertEqual(second.returncode, 0, second.stderr)
+        # A fresh fork per request: the first call did not leak into `calls`.
+        self.assertEqual(second.stdout, f'PIPED\nv1 b 1 {subdir} two\n')
+
+        bad = self._run('--bogus')
+        self.assertEqual(bad.returncode, 2)
+        self.assertIn('error:', bad.stderr)
+        status = self._cli('status', 'x:y', '--socket', self.socket)
+        self.assertEqual(status.returncode, 0)
+
+    def test_exit_work(self):
+        """Test that atexit handlers run and file sinks are flushed per request."""
+        log = os.path.join(self.tmp, 'tool.log')
+        result = self._run('a', '--log', log)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertTrue(result.stderr.endswith('at exit\n'), result.stderr)
+        with open(log) as f:
+            self.assertEqual(f.read(), 'logged a\n')
+
+    def test_reload(self):
+        """Test that a changed source file is picked up by the next request."""
+        self.assertEqual(self._run('a').stdout.split()[0], 'v1')
+        with open(self.tool, 'w') as f:
+            f.write(TOOL.replace("'v1'", "'v2'"))
+        stamp = time.time() + 5
+        os.utime(self.tool, (stamp, stamp))
+        result = self._run('a')
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split()[0], 'v2')
+
+    def test_no_server(self):
+        """Test --no-start without a server, and stop/status without one."""
+        result = self._cli(
+            'run', 'daemon_tool:main', '--socket', self.socket, '--no-start',
+            '--', 'a',
+        )
+        self.assertEqual(result.returncode, 1)
+        self.assertIn('no ezgooey server', result.stderr)
+        self.assertFalse(daemon.stop(self.socket))
+        status = self._cli('status', 'x:y', '--socket', self.socket)
+        self.assertEqual(status.returncode, 1)
+
+    def test_start_failures(self):
+        """Test that a bad target or interpreter is reported cleanly."""
+        result = self._cli(
+            'run', 'no_such_module:main', '--socket', self.socket, '--', 'a'
+        )
+        self.assertEqual(result.returncode, 1)
+        log = daemon.log_path_for(self.socket)
+        self.assertIn(f'exited with status 1; see {log}', result.stderr)
+        self.assertNotIn('Traceback', result.stderr)
+        with open(log) as f:
+            self.assertIn("No module named 'no_such_module'", f.read())
+        self.assertFalse(os.path.exists(self.socket))
+
+        with patch('sys.executable', os.path.join(self.tmp, 'missing-python')):
+            with self.assertRaisesRegex(ConnectionError, 'cannot start'):
+                daemon.run_client(['a'], self.socket, start=['daemon_tool:main'])
+
+    def test_script_per_directory(self):
+        """Test that same-named scripts in different directories get own servers."""
+        env = dict(self.env, XDG_RUNTIME_DIR=self.tmp)
+        for name in ('d1', 'd2'):
+            os.mkdir(os.path.join(self.tmp, name))
+            with open(os.path.join(self.tmp, name, 'app.py'), 'w') as f:
+                f.write(f'def main(argv):\n    print("I am {name}")\n')
+            script = os.path.join(self.tmp, name, 'app.py')
+            self.addCleanup(
+                subprocess.run,
+                [sys.executable, '-m', 'ezgooey.daemon', 'stop', f'{script}:main'],
+                env=env, capture_output=True,
+            )
+        for name in ('d1', 'd2'):
+            result = self._cli(
+                'run', 'app.py:main', '--', 'x',
+                cwd=os.path.join(self.tmp, name), env=env,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertEqual(result.stdout, f'I am {name}\n')
+
+    def test_idle_timeout(self):
+        """Test that an idle server exits and removes its socket."""
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'ezgooey.daemon', 'serve', 'daemon_tool:main',
+             '--socket', self.socket, '--idle-timeout', '0.5'],
+            cwd=self.tmp, env=self.env,
+        )
+        self.addCleanup(server.wait)
+        self._wait_for(lambda: os.path.exists(self.socket))
+        self.assertEqual(server.wait(timeout=10), 0)
+        self.assertFalse(os.path.exists(self.socket))
+
+    def test_socket_path(self):
+        """Test that default socket paths are private and per app."""
+        path = daemon.socket_path_for('pkg.cli:main')
+        self.assertTrue(path.endswith('.sock'))
+        self.assertIn('pkg.cli-', os.path.basename(path))
+        self.assertNotEqual(path, daemon.socket_path_for('pkg.cli:main', 'pkg.cli:p'))
+        self.assertEqual(os.stat(os.path.dirname(path)).st_mode & 0o077, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
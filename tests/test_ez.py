@@ -7,6 +7,8 @@ import sys
 import unittest
 from unittest.mock import patch, MagicMock
 import argparse
+import subprocess
+import tempfile
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,8 +18,13 @@ from ezgooey.ez import (
     flex_add_argument_group,
     flex_add_mutually_exclusive_group,
     ezgooey,
-    ArgumentParser
+    ArgumentParser,
+    detect_mode,
+    FlexArgumentParser,
+    patch_argparse,
+    unpatch_argparse,
 )
+import ezgooey.ez as ezgooey_ez
 
 
 class TestEzGooey(unittest.TestCase):
@@ -168,5 +175,164 @@ class TestEzGooey(unittest.TestCase):
                 pass
 
 
+class TestScopedPatching(unittest.TestCase):
+    """Test cases for FlexArgumentParser and the opt-in global patch."""
+
+    def setUp(self):
+        self.addCleanup(unpatch_argparse)
+
+    def test_flex_parser_accepts_gooey_kwargs(self):
+        """Test that the parser, its groups and subparsers drop Gooey kwargs."""
+        parser = FlexArgumentParser(prog='app')
+        parser.add_argument('--a', widget='FileChooser', gooey_options={'x': 1})
+        group = parser.add_argument_group('G', gooey_options={'columns': 2})
+        group.add_argument('--b', widget='DirChooser')
+        mutex = group.add_mutually_exclusive_group(gooey_options={})
+        mutex.add_argument('--c', action='store_true', widget='CheckBox')
+        top_mutex = parser.add_mutually_exclusive_group(
+            required=False, gooey_options={}
+        )
+        top_mutex.add_argument('--d', gooey_options={})
+        sub = parser.add_subparsers(dest='cmd').add_parser('run')
+        self.assertIsInstance(sub, FlexArgumentParser)
+        sub.add_argument('--e', widget='IntegerField', type=int)
+        args = parser.parse_args(['--a', '1', '--b', '2', '--c', 'run', '--e', '3'])
+        self.assertEqual(
+            (args.a, args.b, args.c, args.cmd, args.e), ('1', '2', True, 'run', 3)
+        )
+
+    def test_stock_argparse_untouched(self):
+        """Test that importing ezgooey leaves plain argparse stock."""
+        self.assertIs(
+            argparse._ActionsContainer.add_argument,
+            ezgooey_ez._STOCK_METHODS['add_argument'],
+        )
+        with self.assertRaises(TypeError):
+            argparse.ArgumentParser().add_argument('--a', widget='FileChooser')
+
+    def test_patch_argparse(self):
+        """Test that the opt-in patch applies to all parsers, once."""
+        patch_argparse()
+        patched = argparse._ActionsContainer.add_argument
+        patch_argparse()
+        self.assertIs(argparse._ActionsContainer.add_argument, patched)
+        parser = argparse.ArgumentParser()
+        parser.add_argument('--a', widget='FileChooser')
+        parser.add_argument_group('G', gooey_options={}).add_argument('--b', widget='x')
+        parser.add_mutually_exclusive_group(gooey_options={})
+        unpatch_argparse()
+        with self.assertRaises(TypeError):
+            argparse.ArgumentParser().add_argument('--a', widget='FileChooser')
+
+    def test_patch_env(self):
+        """Test that EZGOOEY_PATCH_ARGPARSE=1 patches on import."""
+        code = (
+            'import argparse, ezgooey.ez\n'
+            'argparse.ArgumentParser().add_argument("--a", widget="FileChooser")\n'
+            'print("ok")\n'
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, cwd=root,
+            env=dict(os.environ, EZGOOEY_PATCH_ARGPARSE='1', EZGOOEY_MODE='cli'),
+            timeout=30,
+        )
+        self.assertEqual(result.stdout.strip(), 'ok', result.stderr)
+
+
+class TestModeDetection(unittest.TestCase):
+    """Test cases for GUI/CLI mode detection and lazy Gooey import."""
+
+    DISPLAY_ENV = {'DISPLAY': ':0'}
+
+    @patch('ezgooey.ez.find_spec', return_value=object())
+    def test_args_select_cli(self, mock_find_spec):
+        """Test that command-line arguments select CLI mode."""
+        self.assertEqual(detect_mode(['app', '--x'], self.DISPLAY_ENV), 'cli')
+        self.assertEqual(detect_mode(['app'], self.DISPLAY_ENV), 'gui')
+
+    @patch('ezgooey.ez.find_spec', return_value=object())
+    def test_forced_mode(self, mock_find_spec):
+        """Test that EZGOOEY_MODE overrides argv and display checks."""
+        env = {'EZGOOEY_MODE': 'cli', 'DISPLAY': ':0'}
+        self.assertEqual(detect_mode(['app'], env), 'cli')
+        self.assertEqual(detect_mode(['app', '--x'], {'EZGOOEY_MODE': 'GUI'}), 'gui')
+
+    @patch('ezgooey.ez.sys.platform', 'linux')
+    @patch('ezgooey.ez.find_spec', return_value=object())
+    def test_headless_selects_cli(self, mock_find_spec):
+        """Test that a session without a display selects CLI mode."""
+        self.assertEqual(detect_mode(['app'], {}), 'cli')
+        self.assertEqual(detect_mode(['app'], {'WAYLAND_DISPLAY': 'wayland-0'}), 'gui')
+
+    @patch('ezgooey.ez.find_spec', return_value=None)
+    def test_missing_gooey_selects_cli(self, mock_find_spec):
+        """Test that GUI mode is never chosen when Gooey is not installed."""
+        self.assertEqual(detect_mode(['app'], {'EZGOOEY_MODE': 'gui'}), 'cli')
+
+    def _run_with_stub_gooey(self, code, *args):
+        with tempfile.TemporaryDirectory() as stub_dir:
+            with open(os.path.join(stub_dir, 'gooey.py'), 'w') as f:
+                f.write(
+                    'import argparse\n'
+                    'GooeyParser = type(\n'
+                    '    "GooeyParser", (argparse.ArgumentParser,), {}\n'
+                    ')\n'
+                    'calls = []\n'
+                    'def Gooey(*args, **kwargs):\n'
+                    '    calls.append(kwargs)\n'
+                    '    return args[0] if args else (lambda f: f)\n'
+                )
+            env = dict(os.environ, DISPLAY=':0', EZGOOEY_MODE='auto')
+            env['PYTHONPATH'] = os.pathsep.join(
+                [stub_dir, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]
+            )
+            result = subprocess.run(
+                [sys.executable, '-c', code, *args],
+                capture_output=True, text=True, env=env, timeout=30,
+            )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout.split()
+
+    def test_cli_path_never_imports_gooey(self):
+        """Test that CLI mode builds a parser without importing Gooey."""
+        code = (
+            'import sys\n'
+            'from ezgooey.ez import *\n'
+            '@ezgooey\n'
+            'def get_parser():\n'
+            '    p = ArgumentParser()\n'
+            '    p.add_argument("--x", widget="FileChooser")\n'
+            '    return p\n'
+            'get_parser()\n'
+            'print(MODE, "gooey" in sys.modules)\n'
+        )
+        self.assertEqual(self._run_with_stub_gooey(code, '--x'), ['cli', 'False'])
+
+    def test_gui_path_imports_gooey(self):
+        """Test that GUI mode resolves ArgumentParser to GooeyParser."""
+        code = (
+            'import sys\n'
+            'import ezgooey.ez as ez\n'
+            'loaded = "gooey" in sys.modules\n'
+            'print(ez.MODE, loaded, ez.ArgumentParser.__name__)\n'
+        )
+        self.assertEqual(
+            self._run_with_stub_gooey(code), ['gui', 'False', 'GooeyParser']
+        )
+
+    def test_gui_default_progress_regex(self):
+        """Test that GUI mode passes the logging progress regex to Gooey."""
+        code = (
+            'import gooey\n'
+            'from ezgooey.ez import ezgooey\n'
+            '@ezgooey(program_name="x")\n'
+            'def get_parser():\n'
+            '    pass\n'
+            'print(gooey.calls[0]["progress_regex"], gooey.calls[0]["program_name"])\n'
+        )
+        self.assertEqual(self._run_with_stub_gooey(code), ['progress:', '(\\d+)%', 'x'])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -2,8 +2,12 @@
 # this_file: tests/test_logging.py
 """Tests for ezgooey.logging module."""
 
+import io
 import os
+import queue
+import subprocess
 import sys
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 import logging as std_logging
@@ -169,5 +173,1252 @@ class TestEzGooeyLogging(unittest.TestCase):
         self.assertTrue(logger.isEnabledFor(ez_logging.SUCCESS))
 
 
+class TestBufferedStream(unittest.TestCase):
+    """Test cases for the policy-driven BufferedStream wrapper."""
+
+    def _stream(self):
+        raw = io.BytesIO()
+        return raw, io.TextIOWrapper(raw, encoding='utf-8')
+
+    def test_line_policy(self):
+        """Test that the line policy flushes only on newlines."""
+        raw, text = self._stream()
+        stream = ez_logging.BufferedStream(text, policy='line')
+        stream.write('partial ')
+        self.assertEqual(raw.getvalue(), b'')
+        stream.write('line ż\n')
+        self.assertEqual(raw.getvalue(), 'partial line ż\n'.encode())
+        stream.close()
+
+    def test_bytes_policy(self):
+        """Test that the bytes policy flushes once the threshold is reached."""
+        raw, text = self._stream()
+        stream = ez_logging.BufferedStream(text, policy='bytes', buffer_size=8)
+        stream.writelines(['abc\n', 'def'])
+        self.assertEqual(raw.getvalue(), b'')
+        stream.write('gh')
+        self.assertEqual(raw.getvalue(), b'abc\ndefgh')
+        stream.write('tail')
+        stream.close()
+        self.assertEqual(raw.getvalue(), b'abc\ndefghtail')
+
+    def test_interval_policy(self):
+        """Test that the interval policy flushes from a background thread."""
+        raw, text = self._stream()
+        stream = ez_logging.BufferedStream(text, policy='interval', flush_interval=0.01)
+        stream.write('tick\n')
+        deadline = time.monotonic() + 2
+        while not raw.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(raw.getvalue(), b'tick\n')
+        stream.close()
+
+    def test_stream_without_buffer(self):
+        """Test that text-only streams receive decoded text."""
+        text = io.StringIO()
+        stream = ez_logging.BufferedStream(text, policy='always')
+        stream.write('hello')
+        self.assertEqual(text.getvalue(), 'hello')
+        stream.close()
+
+    def test_invalid_policy(self):
+        """Test that unknown policies are rejected."""
+        with self.assertRaises(ValueError):
+            ez_logging.BufferedStream(io.StringIO(), policy='sometimes')
+
+    def test_init_does_not_nest(self):
+        """Test that repeated init() calls replace the stdout wrapper."""
+        original = io.StringIO()
+        with patch('sys.stdout', ez_logging.Unbuffered(original)):
+            ez_logging.init()
+            ez_logging.init(flush='bytes')
+            self.assertIsInstance(sys.stdout, ez_logging.BufferedStream)
+            self.assertIs(sys.stdout.stream, original)
+            self.assertEqual(sys.stdout.policy, 'bytes')
+            sys.stdout.close()
+
+
+class TestAsyncLogging(unittest.TestCase):
+    """Test cases for the queue-based asynchronous logging mode."""
+
+    def setUp(self):
+        root_logger = std_logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+        self.output = io.StringIO()
+        root_logger.addHandler(std_logging.StreamHandler(self.output))
+
+    def tearDown(self):
+        ez_logging._stop_async()
+        root_logger = std_logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+
+    def test_async_init_and_drain(self):
+        """Test that async mode queues records and drains them on stop."""
+        with patch('sys.stdout', io.StringIO()):
+            ez_logging.init(async_=True)
+            sys.stdout.close()
+        root_logger = std_logging.getLogger()
+        self.assertEqual(len(root_logger.handlers), 1)
+        self.assertIsInstance(root_logger.handlers[0], ez_logging.AsyncQueueHandler)
+        items = ['a']
+        for i in range(100):
+            ez_logging.logger('async_test').info('line %d %s', i, items)
+        items.append('b')
+        ez_logging._stop_async()
+        lines = self.output.getvalue().splitlines()
+        self.assertEqual(len(lines), 100)
+        self.assertEqual(lines[-1], "line 99 ['a']")
+        self.assertIsInstance(root_logger.handlers[0], std_logging.StreamHandler)
+
+    def _record(self, msg):
+        return std_logging.LogRecord(
+            'x', std_logging.INFO, __file__, 1, msg, None, None
+        )
+
+    def test_drop_newest(self):
+        """Test that drop-newest keeps the queued records."""
+        q = queue.Queue(2)
+        handler = ez_logging.AsyncQueueHandler(q, 'drop-newest')
+        for msg in 'abc':
+            handler.handle(self._record(msg))
+        self.assertEqual([q.get_nowait().msg for _ in range(2)], ['a', 'b'])
+        self.assertEqual(handler.dropped, 1)
+
+    def test_drop_oldest(self):
+        """Test that drop-oldest keeps the most recent records."""
+        q = queue.Queue(2)
+        handler = ez_logging.AsyncQueueHandler(q, 'drop-oldest')
+        for msg in 'abc':
+            handler.handle(self._record(msg))
+        self.assertEqual([q.get_nowait().msg for _ in range(2)], ['b', 'c'])
+        self.assertEqual(handler.dropped, 1)
+
+    def test_invalid_overflow(self):
+        """Test that unknown overflow policies are rejected."""
+        with self.assertRaises(ValueError):
+            ez_logging.AsyncQueueHandler(queue.Queue(), 'explode')
+
+
+class TestEzFormatter(unittest.TestCase):
+    """Test cases for the precompiled-prefix EzFormatter."""
+
+    def _record(self, level, msg, *args):
+        return std_logging.LogRecord('fmt', level, __file__, 1, msg, args, None)
+
+    def test_plain_prefixes(self):
+        """Test that the plain variant renders uncolored prefixes."""
+        formatter = ez_logging.EzFormatter(color=False)
+        self.assertEqual(
+            formatter.format(self._record(std_logging.INFO, 'hi %s', 'x')), 'hi x'
+        )
+        self.assertEqual(
+            formatter.format(self._record(std_logging.WARNING, 'careful')),
+            '# [WARNING] careful',
+        )
+        self.assertEqual(
+            formatter.format(self._record(std_logging.CRITICAL, 'boom')),
+            '# [FAILURE] boom',
+        )
+        self.assertEqual(
+            formatter.format(self._record(ez_logging.SUCCESS, 'done')),
+            '# [SUCCESS] done',
+        )
+
+    def test_colored_prefixes(self):
+        """Test that the colored variant wraps prefixes in ANSI codes."""
+        formatter = ez_logging.EzFormatter()
+        self.assertEqual(
+            formatter.format(self._record(std_logging.ERROR, 'bad')),
+            '\x1b[38;5;1m# [ERROR] \x1b[0mbad',
+        )
+        self.assertEqual(
+            formatter.format(self._record(ez_logging.SUCCESS, 'ok')),
+            '\x1b[38;5;2m\x1b[1m# [SUCCESS] \x1b[0mok',
+        )
+
+    def test_custom_format_and_levels(self):
+        """Test general formats, custom levels and literal percent signs."""
+        formatter = ez_logging.EzFormatter(
+            '%(name)s|%(levelname)s%(message)s', color=False
+        )
+        self.assertEqual(
+            formatter.format(self._record(std_logging.WARNING, 'w')),
+            'fmt|# [WARNING] w',
+        )
+        self.assertEqual(formatter.format(self._record(15, 'v')), 'fmt|# [Level 15] v')
+        formatter = ez_logging.EzFormatter(
+            '100%% %(levelname)s%(message)s', color=False
+        )
+        self.assertEqual(
+            formatter.format(self._record(std_logging.DEBUG, 'd')), '100% # [DEBUG] d'
+        )
+
+    def test_exception_text(self):
+        """Test that exception tracebacks are appended."""
+        formatter = ez_logging.EzFormatter(color=False)
+        try:
+            raise RuntimeError('oops')
+        except RuntimeError:
+            record = std_logging.LogRecord(
+                'fmt', std_logging.ERROR, __file__, 1, 'failed', None, sys.exc_info()
+            )
+        text = formatter.format(record)
+        self.assertTrue(text.startswith('# [ERROR] failed\nTraceback'))
+        self.assertIn('RuntimeError: oops', text)
+
+    def test_init_leaves_level_names_alone(self):
+        """Test that init() no longer bakes colors into global level names."""
+        root_logger = std_logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+        with patch('sys.stdout', io.StringIO()):
+            ez_logging.init()
+            sys.stdout.close()
+        self.assertEqual(std_logging.getLevelName(std_logging.WARNING), 'WARNING')
+        self.assertEqual(std_logging.getLevelName(ez_logging.SUCCESS), 'SUCCESS')
+        handler = std_logging.getLogger().handlers[0]
+        self.assertIsInstance(handler.formatter, ez_logging.EzFormatter)
+
+
+class TestAnsiTable(unittest.TestCase):
+    """Test cases for the built-in ANSI code table."""
+
+    def test_builtin_names(self):
+        """Test that the colors ezgooey uses come from the table."""
+        self.assertEqual(ez_logging.ansi('dark_orange'), '\x1b[38;5;208m')
+        self.assertEqual(ez_logging.ansi('bold'), '\x1b[1m')
+
+    def test_unknown_name_without_colored(self):
+        """Test that unknown names need the optional colored package."""
+        with patch.dict(sys.modules, {'colored': None}):
+            with self.assertRaises(ValueError):
+                ez_logging.ansi('no_such_color_name')
+
+    def test_import_does_not_load_colored(self):
+        """Test that importing and initializing never imports colored."""
+        code = (
+            'import sys\n'
+            'import ezgooey.logging as logging\n'
+            'logging.init()\n'
+            'logging.logger("x").warning("w")\n'
+            'print("colored" in sys.modules, "logging.handlers" in sys.modules)\n'
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True,
+            cwd=root, timeout=30, env=dict(os.environ, EZGOOEY_COLOR='always'),
+        )
+        self.assertEqual(result.stdout.split(), ['False', 'False'], result.stderr)
+        self.assertIn('# [WARNING] \x1b[0mw', result.stderr)
+
+
+class _Tty(io.StringIO):
+    def isatty(self):
+        return True
+
+
+class TestColorDetection(unittest.TestCase):
+    """Test cases for choosing colored or plain output in init()."""
+
+    def test_detect(self):
+        """Test the override, Gooey, TTY and pipe cases."""
+        detect = ez_logging.detect_color
+        cases = [
+            (_Tty(), ['app'], {}, True),
+            (io.StringIO(), ['app'], {}, False),
+            (io.StringIO(), ['app', '--ignore-gooey'], {}, True),
+            (_Tty(), ['app'], {'TERM': 'dumb'}, False),
+            (_Tty(), ['app'], {'NO_COLOR': '1'}, False),
+            (_Tty(), ['app', '--ignore-gooey'], {'EZGOOEY_COLOR': 'never'}, False),
+            (
+                io.StringIO(), ['app'], {'EZGOOEY_COLOR': 'always', 'NO_COLOR': '1'},
+                True,
+            ),
+            (io.StringIO(), ['app'], {'EZGOOEY_COLOR': 'auto'}, False),
+            (object(), ['app'], {}, False),
+        ]
+        for stream, argv, environ, expected in cases:
+            with self.subTest(argv=argv, environ=environ):
+                self.assertIs(detect(stream, argv, environ), expected)
+
+    def test_init_selects_formatter(self):
+        """Test that init() renders plain prefixes into a pipe."""
+        code = (
+            'import ezgooey.logging as logging\n'
+            'logging.init()\n'
+            'logging.warning("w")\n'
+            'logging.init(color=True)\n'
+            'logging.warning("c")\n'
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = {
+            k: v for k, v in os.environ.items()
+            if k not in ('EZGOOEY_COLOR', 'NO_COLOR')
+        }
+        result = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True,
+            cwd=root, timeout=30, env=env,
+        )
+        self.assertEqual(
+            result.stderr.splitlines(),
+            ['# [WARNING] w', '\x1b[38;5;208m# [WARNING] \x1b[0mc'],
+        )
+
+
+class TestJsonl(unittest.TestCase):
+    """Test cases for the JSONL output mode and reader."""
+
+    def test_format_record(self):
+        """Test that records become compact JSON with extra fields."""
+        import json
+        formatter = ez_logging.JsonFormatter()
+        record = std_logging.LogRecord(
+            'app', std_logging.WARNING, __file__, 1, 'n=%d', (3,), None
+        )
+        record.job = 'ż-1'
+        line = formatter.format(record)
+        self.assertNotIn(' ', line)
+        data = json.loads(line)
+        self.assertEqual(data['level'], 'WARNING')
+        self.assertEqual(data['name'], 'app')
+        self.assertEqual(data['msg'], 'n=3')
+        self.assertEqual(data['job'], 'ż-1')
+        self.assertIsInstance(data['t'], float)
+        self.assertNotIn('exc', data)
+
+    def test_stable_timestamp_and_extra_order(self):
+        """Test that a record formats the same each time, extras sorted."""
+        import json
+        formatter = ez_logging.JsonFormatter()
+        record = std_logging.LogRecord(
+            'app', std_logging.INFO, __file__, 1, 'm', None, None
+        )
+        for key in ('zeta', 'alpha', 'mid'):
+            setattr(record, key, key)
+        first = formatter.format(record)
+        with patch('ezgooey.logging.time.monotonic', return_value=1e9):
+            self.assertEqual(formatter.format(record), first)
+        self.assertEqual(list(json.loads(first))[4:], ['alpha', 'mid', 'zeta'])
+        self.assertAlmostEqual(json.loads(first)['t'], time.monotonic(), delta=5)
+
+    def test_monotonic_stamp(self):
+        """Test that EzLogger records keep their monotonic time across clock steps."""
+        import json
+        log = ez_logging.logger('jsonl_test')
+        handler = _ListHandler()
+        log.addHandler(handler)
+        self.addCleanup(log.removeHandler, handler)
+        with patch('ezgooey.logging.time.monotonic', return_value=123.0):
+            log.warning('m', extra={'monotonic': 'mine'})
+        record = handler.records[0]
+        record.created += 3600  # as if the wall clock were stepped
+        data = json.loads(ez_logging.JsonFormatter().format(record))
+        self.assertEqual(data['t'], 123.0)
+        self.assertEqual(data['monotonic'], 'mine')
+        self.assertNotIn('_monotonic', data)
+
+    def test_exception_and_unserializable_extra(self):
+        """Test exception text and repr() fallback for odd values."""
+        formatter = ez_logging.JsonFormatter()
+        try:
+            raise KeyError('k')
+        except KeyError:
+            record = std_logging.LogRecord(
+                'app', std_logging.ERROR, __file__, 1, 'failed', None, sys.exc_info()
+            )
+        record.path = object()
+        data = next(ez_logging.read_jsonl([formatter.format(record)]))
+        self.assertIn("KeyError: 'k'", data['exc'])
+        self.assertTrue(data['path'].startswith('<object object'))
+
+    def test_read_jsonl(self):
+        """Test that the reader is lazy and skips non-JSON lines."""
+        stream = io.StringIO('{"msg":"a"}\nplain print\n\n{"msg":"b"}\n')
+        records = ez_logging.read_jsonl(stream)
+        self.assertEqual(next(records), {'msg': 'a'})
+        self.assertEqual(stream.tell(), len('{"msg":"a"}\n'))
+        self.assertEqual([r['msg'] for r in records], ['b'])
+
+    def test_read_jsonl_path(self):
+        """Test reading records from a file path."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'log.jsonl')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('{"msg":"x"}\n')
+            self.assertEqual(list(ez_logging.read_jsonl(path)), [{'msg': 'x'}])
+
+    def test_init_jsonl(self):
+        """Test that init(format="jsonl") installs the JSON formatter."""
+        root_logger = std_logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+        with patch('sys.stdout', io.StringIO()):
+            ez_logging.init(format='jsonl')
+            sys.stdout.close()
+        self.assertIsInstance(
+            root_logger.handlers[0].formatter, ez_logging.JsonFormatter
+        )
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+
+
+class _StalledStream(io.StringIO):
+    """Text stream whose consumer is stalled until ``release`` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = __import__('threading').Event()
+
+    def write(self, data):
+        self.release.wait(10)
+        return super().write(data)
+
+
+class TestNonBlockingWriter(unittest.TestCase):
+    """Test cases for the background writer and its back-pressure policies."""
+
+    def _writer(self, policy, budget=20):
+        stream = _StalledStream()
+        writer = ez_logging.NonBlockingWriter(stream, budget=budget, policy=policy)
+        self.addCleanup(writer.close)
+        self.addCleanup(stream.release.set)
+        writer.write('first\n')  # taken by the thread, which then stalls
+        deadline = time.monotonic() + 5
+        while writer._chunks or not writer._busy:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+        return stream, writer
+
+    def test_unknown_policy(self):
+        """Test that an unknown policy is rejected."""
+        with self.assertRaises(ValueError):
+            ez_logging.NonBlockingWriter(io.StringIO(), policy='maybe')
+
+    def test_block(self):
+        """Test that the caller waits for room and nothing is lost."""
+        import threading
+        stream, writer = self._writer('block')
+        thread = threading.Thread(
+            target=lambda: [writer.write(f'line {i:02d}\n') for i in range(10)]
+        )
+        thread.start()
+        thread.join(0.2)
+        self.assertTrue(thread.is_alive())
+        stream.release.set()
+        thread.join(5)
+        writer.flush()
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(lines, ['first'] + [f'line {i:02d}' for i in range(10)])
+        stats = writer.stats()
+        self.assertEqual(stats['written'], 11)
+        self.assertGreater(stats['blocked'], 0)
+        self.assertEqual(stats['dropped'], 0)
+
+    def test_drop_debug(self):
+        """Test that debug lines are dropped before anything blocks."""
+        stream, writer = self._writer('drop-debug')
+        writer.write_record('d1\n', std_logging.DEBUG)
+        writer.write_record('i1\n', std_logging.INFO)
+        writer.write_record('d2\n', std_logging.DEBUG)
+        writer.write_record('w1-padding-xx\n', std_logging.WARNING)
+        writer.write_record('d3-longer\n', std_logging.DEBUG)
+        stream.release.set()
+        writer.flush()
+        self.assertEqual(stream.getvalue().split(), ['first', 'i1', 'w1-padding-xx'])
+        self.assertEqual(writer.stats()['dropped'], 3)
+        self.assertEqual(writer.stats()['blocked'], 0)
+
+    def test_spill(self):
+        """Test that overflow goes to a temp file and keeps its order."""
+        stream, writer = self._writer('spill')
+        start = time.monotonic()
+        for i in range(200):
+            writer.write(f'line {i:03d}\n')
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertGreater(writer.stats()['spilled'], 150)
+        stream.release.set()
+        writer.flush()
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(lines, ['first'] + [f'line {i:03d}' for i in range(200)])
+        self.assertEqual(writer.stats()['written'], 201)
+        writer.write('after\n')
+        writer.flush()
+        self.assertEqual(stream.getvalue().splitlines()[-1], 'after')
+
+    def test_init_backpressure(self):
+        """Test that init(backpressure=...) wraps stdout and the console handler."""
+        root_logger = std_logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with patch('sys.stdout', stdout), patch('sys.stderr', stderr):
+            ez_logging.init(backpressure='drop-debug')
+            self.assertIsInstance(sys.stdout, ez_logging.NonBlockingWriter)
+            handler = root_logger.handlers[0]
+            self.assertIsInstance(handler, ez_logging.NonBlockingHandler)
+            print('hello')
+            ez_logging.logger('bp_test').warning('w')
+            sys.stdout.flush()
+            handler.flush()
+            # print() writes twice: the text and the newline.
+            self.assertEqual(ez_logging.writer_stats()['written'], 3)
+            ez_logging.init()
+            self.assertIsInstance(sys.stdout, ez_logging.BufferedStream)
+            self.assertNotIsInstance(
+                root_logger.handlers[0], ez_logging.NonBlockingHandler
+            )
+            self.assertEqual(ez_logging.writer_stats()['written'], 0)
+            sys.stdout.close()
+        self.assertEqual(stdout.getvalue(), 'hello\n')
+        self.assertEqual(stderr.getvalue(), '# [WARNING] w\n')
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+
+
+class TestSinks(unittest.TestCase):
+    """Test cases for the format-once FanoutHandler and its sinks."""
+
+    def setUp(self):
+        import tempfile
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+    def _path(self, name):
+        return os.path.join(self.tmp, name)
+
+    def _record(self, msg, level=std_logging.WARNING):
+        return std_logging.LogRecord('sink', level, __file__, 1, msg, None, None)
+
+    def _read(self, name):
+        with open(self._path(name), encoding='utf-8') as f:
+            return f.read()
+
+    def test_format_once_per_format(self):
+        """Test that sinks sharing a format share one rendering."""
+        console = io.StringIO()
+        handler = ez_logging.FanoutHandler([
+            ez_logging.StreamSink(console, color=False),
+            ez_logging.FileSink(self._path('a.log')),
+            self._path('b.log'),
+            ez_logging.FileSink(self._path('c.jsonl'), format='jsonl'),
+        ])
+        self.assertEqual(len(handler._groups), 2)
+        with patch.object(
+            ez_logging.EzFormatter, 'format', autospec=True,
+            side_effect=std_logging.Formatter.format,
+        ) as text_format:
+            handler.handle(self._record('careful'))
+        self.assertEqual(text_format.call_count, 1)
+        handler.close()
+        self.assertEqual(console.getvalue(), '# [WARNING] careful\n')
+        self.assertEqual(self._read('a.log'), '# [WARNING] careful\n')
+        self.assertEqual(self._read('b.log'), '# [WARNING] careful\n')
+        records = list(ez_logging.read_jsonl(self._path('c.jsonl')))
+        self.assertEqual(records[0]['msg'], 'careful')
+
+    def test_file_sink_buffers(self):
+        """Test that file sinks do not flush per record."""
+        sink = ez_logging.FileSink(self._path('app.log'))
+        handler = ez_logging.FanoutHandler([sink])
+        handler.handle(self._record('one'))
+        self.assertEqual(self._read('app.log'), '')
+        handler.flush()
+        self.assertEqual(self._read('app.log'), '# [WARNING] one\n')
+        handler.close()
+
+    def test_stream_sink_writes_bytes(self):
+        """Test that a stream with a buffer receives encoded bytes."""
+        raw = io.BytesIO()
+        stream = io.TextIOWrapper(raw, encoding='utf-8')
+        handler = ez_logging.FanoutHandler([ez_logging.StreamSink(stream, color=True)])
+        handler.handle(self._record('zażółć', std_logging.INFO))
+        handler.handle(self._record('w'))
+        self.assertEqual(
+            raw.getvalue().decode('utf-8'),
+            'zażółć\n\x1b[38;5;208m# [WARNING] \x1b[0mw\n',
+        )
+
+    def test_rotating_file_sink(self):
+        """Test rollover and the number of kept backups."""
+        path = self._path('rot.log')
+        handler = ez_logging.FanoutHandler(
+            [ez_logging.RotatingFileSink(path, max_bytes=25, backup_count=2)]
+        )
+        for i in range(8):
+            handler.handle(self._record(f'line {i}', std_logging.INFO))
+        handler.close()
+        self.assertEqual(
+            sorted(os.listdir(self.tmp)), ['rot.log', 'rot.log.1', 'rot.log.2']
+        )
+        self.assertEqual(self._read('rot.log'), 'line 6\nline 7\n')
+        self.assertEqual(self._read('rot.log.1'), 'line 3\nline 4\nline 5\n')
+
+    def test_gzip_sink(self):
+        """Test that the gzip sink writes a readable, appendable stream."""
+        import gzip
+        path = self._path('app.jsonl.gz')
+        for run in range(2):
+            handler = ez_logging.FanoutHandler([path], format='jsonl')
+            self.assertIsInstance(handler.sinks[0], ez_logging.GzipFileSink)
+            for i in range(100):
+                handler.handle(self._record(f'run {run} line {i}'))
+            handler.close()
+        msgs = [r['msg'] for r in ez_logging.read_jsonl(path)]
+        self.assertEqual(len(msgs), 200)
+        self.assertEqual(msgs[-1], 'run 1 line 99')
+        with gzip.open(path, 'rt') as f:
+            self.assertEqual(len(f.readlines()), 200)
+
+    def test_init_sinks(self):
+        """Test that init(sinks=...) replaces the default handler."""
+        root_logger = std_logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+        self.addCleanup(ez_logging.init)
+        console = io.StringIO()
+        with patch('sys.stdout', io.StringIO()):
+            ez_logging.init(sinks=[ez_logging.StreamSink(console), self._path('x.log')])
+            ez_logging.logger('sinks_test').warning('w')
+            ez_logging.init(sinks=[self._path('y.log')])
+            sys.stdout.close()
+        self.assertEqual(len(root_logger.handlers), 1)
+        self.assertIsInstance(root_logger.handlers[0], ez_logging.FanoutHandler)
+        self.assertEqual(console.getvalue(), '# [WARNING] w\n')
+        self.assertEqual(self._read('x.log'), '# [WARNING] w\n')
+        ez_logging.logger('sinks_test').info('i')
+        root_logger.handlers[0].flush()
+        self.assertEqual(self._read('y.log'), 'i\n')
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+            handler.close()
+
+
+class _ListHandler(std_logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestThrottleFilter(unittest.TestCase):
+    """Test cases for duplicate suppression and rate limiting."""
+
+    def setUp(self):
+        self.now = 100.0
+        patcher = patch('ezgooey.logging.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.handler = _ListHandler()
+
+    def _log(self, msg, *args, name='loop'):
+        record = std_logging.LogRecord(
+            name, std_logging.WARNING, __file__, 1, msg, args, None
+        )
+        self.handler.handle(record)
+
+    def _messages(self):
+        return [r.getMessage() for r in self.handler.records]
+
+    def test_duplicates_collapse(self):
+        """Test that repeats inside the window become one summary."""
+        throttle = ez_logging.ThrottleFilter(self.handler, window=1.0)
+        self.handler.addFilter(throttle)
+        for _ in range(1000):
+            self._log('disk %s full', '/tmp')
+        self._log('disk %s full', '/var')
+        self.assertEqual(self._messages(), ['disk /tmp full', 'disk /var full'])
+        self.now += 2
+        self._log('disk %s full', '/tmp')
+        self.assertEqual(
+            self._messages()[2:],
+            ['disk /tmp full (repeated 999 more times)', 'disk /tmp full'],
+        )
+        self.assertEqual(self.handler.records[2].repeated, 999)
+        self.assertEqual(throttle.suppressed, 999)
+
+    def test_flush_and_unhashable_args(self):
+        """Test pending summaries on flush and unhashable arguments."""
+        throttle = ez_logging.ThrottleFilter(self.handler, window=5.0)
+        self.handler.addFilter(throttle)
+        for _ in range(3):
+            self._log('items %s', ['a'])
+        throttle.flush()
+        self.assertEqual(
+            self._messages(), ["items ['a']", "items ['a'] (repeated 2 more times)"]
+        )
+
+    def test_rate_limit(self):
+        """Test the per-logger token bucket."""
+        throttle = ez_logging.ThrottleFilter(self.handler, window=None, rate=2, burst=2)
+        self.handler.addFilter(throttle)
+        for i in range(5):
+            self._log('n%d', i)
+        self._log('other', name='other')
+        self.assertEqual(self._messages(), ['n0', 'n1', 'other'])
+        self.now += 1
+        self._log('n%d', 5)
+        self.assertEqual(
+            self._messages()[3:], ["3 records from 'loop' dropped by rate limit", 'n5']
+        )
+        self.assertEqual(self.handler.records[3].levelno, std_logging.WARNING)
+        self.assertEqual(throttle.rate_limited, 3)
+
+    def test_flush_reports_rate_limited(self):
+        """Test that flush() counts records dropped since the last one passed."""
+        throttle = ez_logging.ThrottleFilter(self.handler, window=None, rate=2, burst=2)
+        self.handler.addFilter(throttle)
+        for i in range(7):
+            self._log('n%d', i)
+        throttle.flush()
+        self.assertEqual(
+            self._messages(),
+            ['n0', 'n1', "5 records from 'loop' dropped by rate limit"],
+        )
+        self.assertEqual(self.handler.records[2].levelno, std_logging.WARNING)
+        throttle.flush()
+        self.assertEqual(len(self.handler.records), 3)
+
+    def test_init_installs_filter(self):
+        """Test that init() attaches and replaces throttle filters."""
+        root_logger = std_logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+        with patch('sys.stdout', io.StringIO()):
+            ez_logging.init(dedup_window=1.0)
+            handler = root_logger.handlers[0]
+            self.assertEqual(len(handler.filters), 1)
+            ez_logging.init()
+            self.assertEqual(handler.filters, [])
+            sys.stdout.close()
+        root_logger.removeHandler(handler)
+
+
+class TestProgress(unittest.TestCase):
+    """Test cases for the throttled progress method."""
+
+    def setUp(self):
+        self.log = ez_logging.logger('progress_test')
+        self.handler = _ListHandler()
+        self.log.addHandler(self.handler)
+        self.log.setLevel(std_logging.INFO)
+        self.log.propagate = False
+        self.now = 0.0
+        patcher = patch('ezgooey.logging.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.log.removeHandler(self.handler)
+        self.log.propagate = True
+        self.log.setLevel(std_logging.NOTSET)
+
+    def test_lines_match_regex(self):
+        """Test that progress lines match PROGRESS_REGEX."""
+        import re
+        self.log.progress(0, 10, 'starting')
+        self.log.progress(10, 10)
+        messages = [r.getMessage() for r in self.handler.records]
+        self.assertEqual(
+            messages, ['progress: 0% (0/10) starting', 'progress: 100% (10/10)']
+        )
+        match = re.search(ez_logging.PROGRESS_REGEX, messages[0])
+        self.assertEqual(match.group(1), '0')
+
+    def test_throttled_by_percent(self):
+        """Test that a long loop yields at most one line per percent."""
+        total = 200000
+        for i in range(1, total + 1):
+            self.now += 0.001
+            self.log.progress(i, total)
+        self.assertEqual(len(self.handler.records), 101)
+        self.assertEqual(
+            self.handler.records[-1].getMessage(), 'progress: 100% (200000/200000)'
+        )
+
+    def test_throttled_by_interval(self):
+        """Test that fast loops are also limited by the minimum interval."""
+        for i in range(1, 101):
+            self.log.progress(i, 100)
+        self.assertEqual(
+            [r.args[0] for r in self.handler.records], [1, 100]
+        )
+
+    def test_disabled_level(self):
+        """Test that nothing is logged when INFO is disabled."""
+        self.log.setLevel(std_logging.WARNING)
+        self.log.progress(1, 2)
+        self.assertEqual(self.handler.records, [])
+
+
+class TestEzLogger(unittest.TestCase):
+    """Test cases for the EzLogger class."""
+
+    def setUp(self):
+        self.handler = _ListHandler()
+
+    def _attach(self, log):
+        log.addHandler(self.handler)
+        log.propagate = False
+        self.addCleanup(log.removeHandler, self.handler)
+        self.addCleanup(setattr, log, 'propagate', True)
+
+    def test_init_sets_logger_class(self):
+        """Test that plain getLogger() returns EzLogger after init()."""
+        ez_logging.init()
+        log = std_logging.getLogger('ez_logger_class_test')
+        self.assertIsInstance(log, ez_logging.EzLogger)
+        self._attach(log)
+        log.success('done %d', 1)
+        self.assertEqual(self.handler.records[0].levelno, ez_logging.SUCCESS)
+        self.assertEqual(self.handler.records[0].getMessage(), 'done 1')
+
+    def test_logger_upgrades_existing(self):
+        """Test that logger() switches a pre-existing plain Logger in place."""
+        manager = std_logging.Logger.manager
+        with patch.object(manager, 'loggerClass', std_logging.Logger):
+            plain = std_logging.getLogger('ez_logger_plain_test')
+        self.assertIs(type(plain), std_logging.Logger)
+        log = ez_logging.logger('ez_logger_plain_test')
+        self.assertIs(log, plain)
+        self.assertIsInstance(log, ez_logging.EzLogger)
+
+    def test_success_checks_level_first(self):
+        """Test that disabled success() calls never build a record."""
+        log = ez_logging.logger('ez_logger_level_test')
+        log.setLevel(std_logging.ERROR)
+        self.addCleanup(log.setLevel, std_logging.NOTSET)
+        with patch.object(log, '_log') as mock_log:
+            log.success('nope')
+        mock_log.assert_not_called()
+
+    def test_timed(self):
+        """Test that timed() logs the duration of its block."""
+        log = ez_logging.logger('ez_logger_timed_test')
+        self._attach(log)
+        log.setLevel(std_logging.DEBUG)
+        self.addCleanup(log.setLevel, std_logging.NOTSET)
+        with log.timed('phase'):
+            pass
+        self.assertRegex(
+            self.handler.records[0].getMessage(), r'^phase took \d+\.\d{3}s$'
+        )
+        log.setLevel(std_logging.WARNING)
+        with log.timed('phase'):
+            pass
+        self.assertEqual(len(self.handler.records), 1)
+
+
+class TestLeanRecord(unittest.TestCase):
+    """Test cases for the lean record factory."""
+
+    def setUp(self):
+        root_logger = std_logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+        self.handler = _ListHandler()
+        self.log = ez_logging.logger('lean_test')
+        self.log.addHandler(self.handler)
+        self.addCleanup(self.log.removeHandler, self.handler)
+
+    def tearDown(self):
+        with patch('sys.stdout', io.StringIO()):
+            ez_logging.init()
+            sys.stdout.close()
+        root_logger = std_logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+
+    def _init(self, **kwargs):
+        with patch('sys.stdout', io.StringIO()):
+            ez_logging.init(**kwargs)
+            sys.stdout.close()
+
+    def test_lean_skips_unused_fields(self):
+        """Test that only the fields in the format are computed."""
+        self._init(lean=True)
+        self.log.warning('x %s', 1)
+        record = self.handler.records[0]
+        self.assertIsInstance(record, ez_logging.LeanRecord)
+        self.assertEqual(record.getMessage(), 'x 1')
+        self.assertEqual(record.lineno, 0)
+        self.assertIsNone(record.__dict__['threadName'])
+        self.assertIsNone(std_logging._srcfile)
+
+    def test_placeholders_format(self):
+        """Test that other formats using skipped fields render placeholders."""
+        self._init(lean=True)
+        self.log.warning('w')
+        formatter = std_logging.Formatter(
+            '%(filename)s:%(lineno)d %(funcName)s %(threadName)s '
+            '%(process)s %(msecs)d %(message)s'
+        )
+        self.assertEqual(
+            formatter.format(self.handler.records[0]),
+            '(unknown file):0 None None None 0 w',
+        )
+
+    def test_lean_json_fields(self):
+        """Test that lean records add no JSON fields that stock records lack."""
+        import json
+
+        self._init(lean=True)
+        self.log.warning('j')
+        line = ez_logging.JsonFormatter().format(self.handler.records[0])
+        self.assertEqual(list(json.loads(line)), ['t', 'level', 'name', 'msg'])
+
+    def test_lean_computes_referenced_fields(self):
+        """Test that referenced caller and thread fields are filled in."""
+        self._init(lean=True, format='%(threadName)s %(lineno)d %(message)s')
+        self.log.warning('y')
+        record = self.handler.records[0]
+        self.assertGreater(record.lineno, 0)
+        self.assertEqual(record.funcName, 'test_lean_computes_referenced_fields')
+        self.assertEqual(record.threadName, 'MainThread')
+        self.assertIsNone(record.__dict__.get('process'))
+
+    def test_init_restores_default_factory(self):
+        """Test that init() without lean restores stock records."""
+        self._init(lean=True)
+        self._init()
+        self.log.warning('z')
+        self.assertIs(type(self.handler.records[0]), std_logging.LogRecord)
+        self.assertIsNotNone(std_logging._srcfile)
+
+
+class TestRingBufferHandler(unittest.TestCase):
+    """Test cases for the in-memory ring buffer handler."""
+
+    def _record(self, msg, level=std_logging.INFO):
+        return std_logging.LogRecord('ring', level, __file__, 1, msg, None, None)
+
+    def test_keeps_last_records(self):
+        """Test that only the last capacity records are kept, in order."""
+        ring = ez_logging.RingBufferHandler(3)
+        for i in range(2):
+            ring.handle(self._record(f'r{i}'))
+        self.assertEqual(ring.lines(), ['r0', 'r1'])
+        for i in range(2, 7):
+            ring.handle(self._record(f'r{i}'))
+        self.assertEqual(ring.lines(), ['r4', 'r5', 'r6'])
+        self.assertEqual(len(ring._slots), 3)
+
+    def test_invalid_capacity(self):
+        """Test that a ring without slots is rejected up front."""
+        with self.assertRaises(ValueError):
+            ez_logging.RingBufferHandler(0)
+
+    def test_sampled_forwarding(self):
+        """Test that targets get a sample plus every warning."""
+        target = _ListHandler()
+        ring = ez_logging.RingBufferHandler(100, [target], sample=10)
+        for i in range(25):
+            ring.handle(self._record(f'r{i}'))
+        ring.handle(self._record('bad', std_logging.WARNING))
+        self.assertEqual(
+            [r.getMessage() for r in target.records], ['r0', 'r10', 'r20', 'bad']
+        )
+
+    def test_dump(self):
+        """Test dumping to a stream and to a file path."""
+        import tempfile
+        ring = ez_logging.RingBufferHandler(10)
+        ring.setFormatter(ez_logging.EzFormatter(color=False))
+        ring.handle(self._record('oops', std_logging.ERROR))
+        stream = io.StringIO()
+        ring.dump(stream)
+        self.assertEqual(
+            stream.getvalue(), '# --- last 1 log records ---\n# [ERROR] oops\n'
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'crash.log')
+            ring.dump_path = path
+            ring.dump()
+            with open(path, encoding='utf-8') as f:
+                self.assertIn('# [ERROR] oops', f.read())
+
+    def test_triggers(self):
+        """Test the excepthook and SIGUSR1 triggers."""
+        import signal
+        ring = ez_logging.RingBufferHandler(10)
+        ring.handle(self._record('tail'))
+        stream = io.StringIO()
+        ring.dump_path = None
+        def dump(target=None):
+            ring.__class__.dump(ring, stream)
+
+        with patch.object(ring, 'dump', dump):
+            previous = MagicMock()
+            with patch('sys.excepthook', previous):
+                ring.install_triggers()
+                try:
+                    sys.excepthook(ValueError, ValueError('x'), None)
+                    previous.assert_called_once()
+                    self.assertIn('tail', stream.getvalue())
+                    if hasattr(signal, 'SIGUSR1'):
+                        stream.truncate(0)
+                        os.kill(os.getpid(), signal.SIGUSR1)
+                        time.sleep(0.01)
+                        self.assertIn('tail', stream.getvalue())
+                finally:
+                    ring.remove_triggers()
+                self.assertIs(sys.excepthook, previous)
+
+    def test_init_installs_ring(self):
+        """Test that init(ring_size=...) wraps the root handlers."""
+        root_logger = std_logging.getLogger()
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+        with patch('sys.stdout', io.StringIO()):
+            ez_logging.init(ring_size=50, ring_sample=5)
+            ring = root_logger.handlers[0]
+            self.assertIsInstance(ring, ez_logging.RingBufferHandler)
+            self.assertEqual(ring.sample, 5)
+            live = ring.targets[0]
+            ez_logging.init()
+            self.assertEqual(root_logger.handlers, [live])
+            sys.stdout.close()
+        root_logger.removeHandler(live)
+
+
+def _process_worker(i):
+    log = ez_logging.logger('worker')
+    log.debug('hidden %d', i)
+    log.info('item %d', i)
+    if i == 0:
+        try:
+            raise ValueError('bad item')
+        except ValueError:
+            log.exception('failed %d', i)
+    return os.getpid()
+
+
+class TestProcessLogging(unittest.TestCase):
+    """Test cases for forwarding worker-process records to the parent."""
+
+    def setUp(self):
+        root_logger = std_logging.getLogger()
+        self.saved = root_logger.handlers[:], root_logger.level
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+        self.handler = _ListHandler()
+        root_logger.addHandler(self.handler)
+        root_logger.setLevel(std_logging.INFO)
+
+    def tearDown(self):
+        ez_logging.stop_process_logging()
+        root_logger = std_logging.getLogger()
+        root_logger.removeHandler(self.handler)
+        for handler in self.saved[0]:
+            root_logger.addHandler(handler)
+        root_logger.setLevel(self.saved[1])
+
+    def test_pool_records_reach_parent(self):
+        """Test that a spawned process pool logs through the parent."""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        ctx = multiprocessing.get_context('spawn')
+        q = ez_logging.start_process_logging(ctx)
+        with ProcessPoolExecutor(
+            2, mp_context=ctx, initializer=ez_logging.worker_init, initargs=(q,)
+        ) as executor:
+            pids = set(executor.map(_process_worker, range(4)))
+        ez_logging.stop_process_logging()
+        self.assertNotIn(os.getpid(), pids)
+        messages = sorted(r.getMessage() for r in self.handler.records)
+        self.assertEqual(messages, ['failed 0', 'item 0', 'item 1', 'item 2', 'item 3'])
+        failed = [r for r in self.handler.records if r.getMessage() == 'failed 0'][0]
+        self.assertIn('ValueError: bad item', failed.exc_text)
+        self.assertIsNone(failed.exc_info)
+
+    def test_prepare_makes_records_picklable(self):
+        """Test that records with tracebacks survive pickling."""
+        import pickle
+        handler = ez_logging.ProcessQueueHandler(queue.Queue())
+        try:
+            raise KeyError('k')
+        except KeyError:
+            record = std_logging.LogRecord(
+                'w', std_logging.ERROR, __file__, 1, 'x %s', (object(),), sys.exc_info()
+            )
+        handler.handle(record)
+        copy = pickle.loads(pickle.dumps(handler.queue.get_nowait()))
+        self.assertTrue(copy.getMessage().startswith('x <object object'))
+        self.assertIn("KeyError: 'k'", copy.exc_text)
+
+
+class TestContext(unittest.TestCase):
+    """Test cases for contextvars-based bind() and context()."""
+
+    def setUp(self):
+        self.handler = _ListHandler()
+        self.log = ez_logging.logger('context_test')
+        self.log.addHandler(self.handler)
+        self.log.propagate = False
+        self.log.setLevel(std_logging.DEBUG)
+        self.addCleanup(self.log.removeHandler, self.handler)
+        self.addCleanup(setattr, self.log, 'propagate', True)
+        self.addCleanup(self.log.setLevel, std_logging.NOTSET)
+
+    def test_context_block(self):
+        """Test that fields apply inside the block and nest."""
+        self.log.info('before')
+        with self.log.context(job=7):
+            self.log.info('outer')
+            with ez_logging.context(file='a.txt'):
+                self.log.success('inner')
+            self.log.info('after inner', extra={'job': 8})
+        self.log.info('after')
+        records = self.handler.records
+        self.assertFalse(hasattr(records[0], 'job'))
+        self.assertEqual(records[1].job, 7)
+        self.assertEqual((records[2].job, records[2].file), (7, 'a.txt'))
+        self.assertEqual(records[2].levelno, ez_logging.SUCCESS)
+        self.assertEqual(records[3].job, 8)
+        self.assertFalse(hasattr(records[3], 'file'))
+        self.assertFalse(hasattr(records[4], 'job'))
+
+    def test_bind_unbind(self):
+        """Test that bind() lasts until its token is reset."""
+        token = self.log.bind(job='x')
+        try:
+            self.assertEqual(ez_logging.current_context(), {'job': 'x'})
+            self.log.warning('w')
+        finally:
+            ez_logging.unbind(token)
+        self.assertEqual(ez_logging.current_context(), {})
+        self.assertEqual(self.handler.records[0].job, 'x')
+
+    def test_reserved_name(self):
+        """Test that standard record attributes cannot be bound."""
+        with self.assertRaises(KeyError):
+            ez_logging.bind(message='x')
+        with self.assertRaises(KeyError):
+            with self.log.context(lineno=1):
+                pass
+        self.assertEqual(ez_logging.current_context(), {})
+
+    def test_threads_are_isolated(self):
+        """Test that a thread neither sees nor leaks bound fields."""
+        import threading
+
+        def work():
+            self.log.info('thread start')
+            ez_logging.bind(job='thread')
+            self.log.info('thread bound')
+
+        with self.log.context(job='main'):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+            self.log.info('main')
+        jobs = {r.getMessage(): getattr(r, 'job', None) for r in self.handler.records}
+        self.assertEqual(
+            jobs, {'thread start': None, 'thread bound': 'thread', 'main': 'main'}
+        )
+
+    def test_asyncio_tasks_are_isolated(self):
+        """Test that concurrent tasks keep their own fields."""
+        import asyncio
+
+        async def job(n):
+            with self.log.context(job=n):
+                await asyncio.sleep(0)
+                self.log.info('step')
+                await asyncio.sleep(0)
+                self.log.info('step')
+
+        async def main():
+            await asyncio.gather(*(job(n) for n in range(3)))
+
+        asyncio.run(main())
+        jobs = sorted(r.job for r in self.handler.records)
+        self.assertEqual(jobs, [0, 0, 1, 1, 2, 2])
+
+    def test_jsonl_includes_fields(self):
+        """Test that bound fields appear in JSONL output."""
+        import json
+
+        formatter = ez_logging.JsonFormatter()
+        with self.log.context(file='b.txt'):
+            self.log.info('hi')
+        line = json.loads(formatter.format(self.handler.records[0]))
+        self.assertEqual(line['file'], 'b.txt')
+
+
+class TestTimings(unittest.TestCase):
+    """Test cases for timed() aggregation and the timing report."""
+
+    def setUp(self):
+        ez_logging.reset_timings()
+        self.addCleanup(ez_logging.reset_timings)
+        self.handler = _ListHandler()
+        self.log = ez_logging.logger('timings_test')
+        self.log.addHandler(self.handler)
+        self.log.propagate = False
+        self.log.setLevel(std_logging.INFO)
+        self.addCleanup(self.log.removeHandler, self.handler)
+        self.addCleanup(setattr, self.log, 'propagate', True)
+        self.addCleanup(self.log.setLevel, std_logging.NOTSET)
+
+    def test_decorator_aggregates(self):
+        """Test that a timed function records every call."""
+        @self.log.timed('work')
+        def work(x):
+            return x * 2
+
+        self.assertEqual([work(i) for i in range(5)], [0, 2, 4, 6, 8])
+        self.assertEqual(work.__name__, 'work')
+        stats = ez_logging.timing_stats()['work']
+        self.assertEqual(stats.count, 5)
+        self.assertLessEqual(stats.min, stats.percentile(50))
+        self.assertLessEqual(stats.percentile(95), stats.max)
+        self.assertEqual(len(self.handler.records), 5)
+
+    def test_disabled_level_records_nothing(self):
+        """Test that disabled timers neither log nor aggregate."""
+        self.log.setLevel(std_logging.WARNING)
+
+        @self.log.timed('quiet')
+        def quiet():
+            pass
+
+        quiet()
+        with self.log.timed('quiet'):
+            pass
+        self.assertEqual(ez_logging.timing_stats(), {})
+        self.assertEqual(self.handler.records, [])
+
+    def test_percentiles(self):
+        """Test histogram percentiles against known durations."""
+        stats = ez_logging.TimingStats('x')
+        for ms in range(1, 101):
+            stats.add(ms / 1000)
+        self.assertAlmostEqual(stats.percentile(50), 0.050, delta=0.006)
+        self.assertAlmostEqual(stats.percentile(95), 0.095, delta=0.010)
+        self.assertAlmostEqual(stats.percentile(100), 0.1, delta=0.010)
+        self.assertAlmostEqual(stats.total, 5.05)
+
+    def test_report(self):
+        """Test the summary table and its log record."""
+        with self.log.timed('load'):
+            pass
+        with self.log.timed('save'):
+            pass
+        lines = ez_logging.timing_report().splitlines()
+        self.assertEqual(
+            lines[0].split(), ['name', 'count', 'total', 'min', 'p50', 'p95', 'max']
+        )
+        self.assertEqual([line.split()[0] for line in lines[1:]], ['load', 'save'])
+        ez_logging.log_timing_report(self.log)
+        message = self.handler.records[-1].getMessage()
+        self.assertTrue(message.startswith('timing summary:\nname'))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
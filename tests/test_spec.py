@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# this_file: tests/test_spec.py
+"""Tests for ezgooey.spec module."""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ezgooey.spec as ez_spec
+from ezgooey.ez import FlexArgumentParser
+
+SPEC = {
+    'prog': 'app',
+    'description': 'demo app',
+    'arguments': [
+        {'flags': ['-v', '--verbose'], 'action': 'count', 'default': 0},
+        {'flags': '--count', 'type': 'int', 'default': 3, 'widget': 'IntegerField'},
+        {'flags': '--tag', 'action': 'append', 'default': []},
+    ],
+    'groups': [
+        {
+            'title': 'Files',
+            'description': 'Input and output',
+            'gooey_options': {'columns': 1},
+            'arguments': [
+                {'flags': '--input', 'type': 'file', 'widget': 'FileChooser'}
+            ],
+            'exclusive': [
+                {
+                    'arguments': [
+                        {'flags': '--json', 'action': 'store_true'},
+                        {'flags': '--csv', 'action': 'store_true'},
+                    ]
+                }
+            ],
+        }
+    ],
+    'subcommands': {
+        'dest': 'cmd',
+        'title': 'commands',
+        'commands': [
+            {
+                'name': 'run',
+                'aliases': ['r'],
+                'help': 'run it',
+                'arguments': [{'flags': 'targets', 'nargs': '+'}],
+                'defaults': {'func': 'run'},
+            },
+            {'name': 'stop'},
+        ],
+    },
+}
+
+SPEC_TOML = '''
+prog = "app"
+description = "demo app"
+
+[[arguments]]
+flags = ["-v", "--verbose"]
+action = "count"
+default = 0
+
+[[arguments]]
+flags = "--count"
+type = "int"
+default = 3
+widget = "IntegerField"
+
+[[arguments]]
+flags = "--tag"
+action = "append"
+default = []
+
+[[groups]]
+title = "Files"
+description = "Input and output"
+gooey_options = { columns = 1 }
+
+[[groups.arguments]]
+flags = "--input"
+type = "file"
+widget = "FileChooser"
+
+[[groups.exclusive]]
+arguments = [
+    { flags = "--json", action = "store_true" },
+    { flags = "--csv", action = "store_true" },
+]
+
+[subcommands]
+dest = "cmd"
+title = "commands"
+
+[[subcommands.commands]]
+name = "run"
+aliases = ["r"]
+help = "run it"
+arguments = [{ flags = "targets", nargs = "+" }]
+defaults = { func = "run" }
+
+[[subcommands.commands]]
+name = "stop"
+'''
+
+
+def hand_built():
+    parser = FlexArgumentParser(prog='app', description='demo app')
+    parser.add_argument('-v', '--verbose', action='count', default=0)
+    parser.add_argument('--count', type=int, default=3)
+    parser.add_argument('--tag', action='append', default=[])
+    group = parser.add_argument_group('Files', 'Input and output')
+    group.add_argument('--input', type=argparse.FileType('r'))
+    mutex = group.add_mutually_exclusive_group()
+    mutex.add_argument('--json', action='store_true')
+    mutex.add_argument('--csv', action='store_true')
+    sub = parser.add_subparsers(dest='cmd', title='commands')
+    run = sub.add_parser('run', aliases=['r'], help='run it')
+    run.add_argument('targets', nargs='+')
+    run.set_defaults(func='run')
+    sub.add_parser('stop')
+    return parser
+
+
+@pytest.mark.usefixtures('app_dir')
+class _SpecTestCase(unittest.TestCase):
+    def _write(self, name, text):
+        path = os.path.join(self.tmp, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+
+class TestParserFromSpec(_SpecTestCase):
+    """Test that specs build the same parser as add_argument code."""
+
+    def assertSameParser(self, parser):
+        expected = hand_built()
+        self.assertIsInstance(parser, FlexArgumentParser)
+        self.assertEqual(parser.format_help(), expected.format_help())
+        for argv in ([], ['-vv', '--count', '5', '--tag', 'a', '--json'], ['r', 'x']):
+            with self.subTest(argv=argv):
+                self.assertEqual(
+                    vars(parser.parse_args(argv)), vars(expected.parse_args(argv))
+                )
+        with self.assertRaises(SystemExit), patch('sys.stderr'):
+            parser.parse_args(['--json', '--csv'])
+
+    def test_dict(self):
+        """Test a dict spec, including Gooey-only options in CLI mode."""
+        self.assertSameParser(ez_spec.parser_from_spec(SPEC, FlexArgumentParser))
+
+    def test_json_and_toml(self):
+        """Test that JSON and TOML files describe the same parser."""
+        path = self._write('app.json', json.dumps(SPEC))
+        self.assertSameParser(ez_spec.parser_from_spec(path, FlexArgumentParser))
+        if sys.version_info < (3, 11):
+            try:
+                import tomli  # noqa: F401
+            except ImportError:
+                self.skipTest('tomli not installed')
+        path = self._write('app.toml', SPEC_TOML)
+        self.assertEqual(ez_spec.load_spec(path), SPEC)
+        self.assertSameParser(ez_spec.parser_from_spec(path, FlexArgumentParser))
+
+    def test_parsers_share_no_state(self):
+        """Test that mutable defaults are copied per parser."""
+        first = ez_spec.parser_from_spec(SPEC, FlexArgumentParser)
+        second = ez_spec.parser_from_spec(SPEC, FlexArgumentParser)
+        self.assertIsNot(first, second)
+        first.parse_args([]).tag.append('x')
+        self.assertEqual(second.parse_args([]).tag, [])
+
+    def test_names(self):
+        """Test type, action and formatter_class names."""
+        spec = {
+            'formatter_class': 'argparse.RawDescriptionHelpFormatter',
+            'arguments': [
+                {'flags': '--out', 'type': 'file:w'},
+                {'flags': '--path', 'type': 'os.path:abspath'},
+                {'flags': '--flag', 'action': 'argparse:_StoreFalseAction'},
+                {'flags': '--n', 'type': float},
+            ],
+        }
+        parser = ez_spec.parser_from_spec(spec, argparse.ArgumentParser)
+        self.assertIs(parser.formatter_class, argparse.RawDescriptionHelpFormatter)
+        args = parser.parse_args(['--path', 'x', '--flag', '--n', '2'])
+        self.assertEqual(args.path, os.path.abspath('x'))
+        self.assertIs(args.flag, False)
+        self.assertEqual(args.n, 2.0)
+        self.assertEqual(parser._option_string_actions['--out'].type._mode, 'w')
+
+    def test_errors(self):
+        """Test that malformed specs report the location."""
+        cases = [
+            ({'arguments': [{'help': 'x'}]}, "spec.arguments[0]: missing 'flags'"),
+            ({'groups': [{'arguments': {}}]}, 'spec.groups[0].arguments: expected'),
+            (
+                {'arguments': [{'flags': '--x', 'type': 'no_such_module.f'}]},
+                'spec.arguments[0].type: cannot resolve',
+            ),
+            ({'subcommands': {'commands': [{}]}}, "commands[0]: missing 'name'"),
+        ]
+        for spec, message in cases:
+            with self.subTest(spec=spec), self.assertRaises(ValueError) as cm:
+                ez_spec.compile_spec(spec)
+            self.assertIn(message, str(cm.exception))
+        with self.assertRaises(ValueError):
+            ez_spec.load_spec(self._write('app.yaml', ''))
+
+
+class TestMemoization(_SpecTestCase):
+    """Test compiled-spec memoization and the parser cache."""
+
+    def test_compiled_once_per_hash(self):
+        """Test that equal specs share one compiled form."""
+        reordered = dict(reversed(list(SPEC.items())))
+        self.assertEqual(ez_spec.spec_hash(SPEC), ez_spec.spec_hash(reordered))
+        self.assertIs(ez_spec.compile_spec(SPEC), ez_spec.compile_spec(reordered))
+        changed = dict(SPEC, description='other')
+        self.assertIsNot(ez_spec.compile_spec(changed), ez_spec.compile_spec(SPEC))
+
+    def test_file_parsed_once(self):
+        """Test that an unchanged file is not parsed again."""
+        path = self._write('memo.json', json.dumps(dict(SPEC, prog='memo')))
+        with patch.object(ez_spec, 'load_spec', wraps=ez_spec.load_spec) as load:
+            ez_spec.parser_from_spec(path, FlexArgumentParser)
+            ez_spec.parser_from_spec(path, FlexArgumentParser)
+            self.assertEqual(load.call_count, 1)
+            self._write('memo.json', json.dumps(dict(SPEC, prog='memo2')))
+            self.assertEqual(
+                ez_spec.parser_from_spec(path, FlexArgumentParser).prog, 'memo2'
+            )
+            self.assertEqual(load.call_count, 2)
+
+    def test_disk_cache(self):
+        """Test that cache=True loads an unchanged file without compiling it."""
+        path = self._write('cached.json', json.dumps(dict(SPEC, prog='cached')))
+        first = ez_spec.parser_from_spec(path, FlexArgumentParser, cache=True)
+        cache = os.environ['EZGOOEY_CACHE_DIR']
+        self.assertEqual(len(os.listdir(cache)), 1)
+        ez_spec._compiled.clear()
+        with patch.object(ez_spec, 'compile_spec') as compile_spec:
+            second = ez_spec.parser_from_spec(path, FlexArgumentParser, cache=True)
+            compile_spec.assert_not_called()
+        self.assertEqual(second.format_help(), first.format_help())
+        self._write('cached.json', json.dumps(dict(SPEC, prog='cached2')))
+        third = ez_spec.parser_from_spec(path, FlexArgumentParser, cache=True)
+        self.assertEqual(third.prog, 'cached2')
+        self.assertEqual(len(os.listdir(cache)), 1)
+        with patch.dict(os.environ, {'EZGOOEY_NO_CACHE': '1'}), \
+                patch.object(ez_spec, 'compile_spec', wraps=ez_spec.compile_spec) as cs:
+            ez_spec.parser_from_spec(path, FlexArgumentParser, cache=True)
+            cs.assert_called_once()
+
+    def test_object_values(self):
+        """Test that functions hash by name and unstable values skip caching."""
+        spec = {'prog': 'objs', 'arguments': [
+            {'flags': '--path', 'type': os.path.expanduser},
+            {'flags': '--mode', 'action': argparse._StoreAction},
+        ]}
+        code = (
+            'import os, argparse, ezgooey.spec as s; print(s.spec_hash({"prog": '
+            '"objs", "arguments": [{"flags": "--path", "type": os.path.expanduser},'
+            ' {"flags": "--mode", "action": argparse._StoreAction}]}))'
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        hashes = {
+            subprocess.run(
+                [sys.executable, '-c', code], capture_output=True, text=True,
+                cwd=root, check=True,
+            ).stdout.strip()
+            for _ in range(2)
+        }
+        self.assertEqual(hashes, {ez_spec.spec_hash(spec)})
+
+        local = {'prog': 'local', 'arguments': [{'flags': 'n', 'type': lambda s: s}]}
+        with self.assertRaises(ValueError):
+            ez_spec.spec_hash(local)
+        self.assertIsNot(ez_spec.compile_spec(local), ez_spec.compile_spec(local))
+        parser = ez_spec.parser_from_spec(local, FlexArgumentParser, cache=True)
+        self.assertEqual(parser.parse_args(['x']).n, 'x')
+        self.assertFalse(os.path.exists(os.environ['EZGOOEY_CACHE_DIR']))
+
+    def test_dict_disk_cache_pruned(self):
+        """Test that dict specs replace their entries per prog or cache_name."""
+        cache = os.environ['EZGOOEY_CACHE_DIR']
+        for description in ('one', 'two', 'three'):
+            ez_spec.parser_from_spec(
+                dict(SPEC, prog='dict', description=description),
+                FlexArgumentParser, cache=True,
+            )
+        self.assertEqual(len(os.listdir(cache)), 1)
+        for name in ('a', 'b'):
+            parser = ez_spec.parser_from_spec(
+                dict(SPEC, prog='dict', description=name),
+                FlexArgumentParser, cache=True, cache_name=name,
+            )
+            self.assertEqual(parser.description, name)
+        self.assertEqual(len(os.listdir(cache)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()